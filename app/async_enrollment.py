@@ -0,0 +1,39 @@
+# app/async_enrollment.py
+from .async_repository import AsyncRepository
+from .models import Enrollment
+from .grading import compute_grade_with_bonus
+
+
+async def async_enroll(
+    repo: AsyncRepository,
+    student_id: str,
+    course_code: str,
+) -> Enrollment:
+    """
+    Async counterpart of enroll_student_in_course.
+    The capacity check and the insert are one repository call, made while
+    holding the course's lock, so coroutines for the same course queue up
+    and other courses are not blocked.
+    """
+    enrollment = Enrollment(student_id=student_id, course_code=course_code)
+    async with repo.course_lock(course_code):
+        await repo.add_enrollment_within_capacity(enrollment)
+    return enrollment
+
+
+async def async_record_score(
+    repo: AsyncRepository,
+    student_id: str,
+    course_code: str,
+    raw_score: float,
+    bonus: float = 0.0,
+) -> Enrollment:
+    """
+    Async counterpart of record_score_for_enrollment, serialized per course
+    so the score and grade of an enrollment are never interleaved with
+    another update.
+    """
+    async with repo.course_lock(course_code):
+        await repo.update_score(student_id, course_code, raw_score)
+        grade, passed = compute_grade_with_bonus(raw_score, bonus)
+        return await repo.update_grade(student_id, course_code, grade, passed)
@@ -0,0 +1,173 @@
+# app/async_repository.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Protocol
+from .models import Student, Course, Enrollment
+from .repository import InMemoryRepository
+from .sqlite_repository import SQLiteRepository
+
+
+class CourseLocks:
+    """
+    One asyncio.Lock per course code, created on first use.
+    """
+
+    def __init__(self) -> None:
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def __call__(self, course_code: str) -> asyncio.Lock:
+        lock = self._locks.get(course_code)
+        if lock is None:
+            lock = self._locks[course_code] = asyncio.Lock()
+        return lock
+
+
+class AsyncRepository(Protocol):
+    """
+    What the async front-end (app/async_enrollment.py) needs from a
+    repository. Methods mirror InMemoryRepository and raise the same
+    exceptions; `course_lock` hands out the lock serializing work on a course.
+    """
+
+    def course_lock(self, course_code: str) -> asyncio.Lock: ...
+
+    async def get_student(self, student_id: str) -> Student: ...
+
+    async def get_course(self, course_code: str) -> Course: ...
+
+    async def add_enrollment(self, enrollment: Enrollment) -> None: ...
+
+    async def add_enrollment_within_capacity(self, enrollment: Enrollment) -> None: ...
+
+    async def count_enrollments_for_course(self, course_code: str) -> int: ...
+
+    async def update_score(
+        self, student_id: str, course_code: str, score: float
+    ) -> Enrollment: ...
+
+    async def update_grade(
+        self, student_id: str, course_code: str, grade: str, passed: bool
+    ) -> Enrollment: ...
+
+
+class AsyncInMemoryRepository:
+    """
+    AsyncRepository over an InMemoryRepository. Every call completes without
+    yielding to the event loop, so it needs no thread.
+    """
+
+    def __init__(self, repo: Optional[InMemoryRepository] = None) -> None:
+        self.repo = repo if repo is not None else InMemoryRepository()
+        self.course_lock = CourseLocks()
+
+    async def add_student(self, student: Student) -> None:
+        self.repo.add_student(student)
+
+    async def add_course(self, course: Course) -> None:
+        self.repo.add_course(course)
+
+    async def get_student(self, student_id: str) -> Student:
+        return self.repo.get_student(student_id)
+
+    async def get_course(self, course_code: str) -> Course:
+        return self.repo.get_course(course_code)
+
+    async def add_enrollment(self, enrollment: Enrollment) -> None:
+        self.repo.add_enrollment(enrollment)
+
+    async def add_enrollment_within_capacity(self, enrollment: Enrollment) -> None:
+        self.repo.add_enrollment_within_capacity(enrollment)
+
+    async def get_enrollment(self, student_id: str, course_code: str) -> Enrollment:
+        return self.repo.get_enrollment(student_id, course_code)
+
+    async def count_enrollments_for_course(self, course_code: str) -> int:
+        return self.repo.count_enrollments_for_course(course_code)
+
+    async def update_score(self, student_id: str, course_code: str, score: float) -> Enrollment:
+        return self.repo.update_score(student_id, course_code, score)
+
+    async def update_grade(
+        self,
+        student_id: str,
+        course_code: str,
+        grade: str,
+        passed: bool,
+    ) -> Enrollment:
+        return self.repo.update_grade(student_id, course_code, grade, passed)
+
+
+class AsyncSQLiteRepository:
+    """
+    AsyncRepository over a SQLiteRepository, so both share one schema and
+    one set of checks.
+
+    sqlite3 calls block, so they all run on one dedicated worker thread,
+    which also owns the connection. The event loop stays free while a query
+    runs. add_enrollment_within_capacity is one SQLiteRepository transaction,
+    so capacity holds across processes sharing the database file too.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+        self.course_lock = CourseLocks()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._repo: Optional[SQLiteRepository] = None
+
+    def _repository(self) -> SQLiteRepository:
+        # first used on the worker thread, so the connection is created there
+        if self._repo is None:
+            self._repo = SQLiteRepository(self.path)
+        return self._repo
+
+    async def _call(self, method: str, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, lambda: getattr(self._repository(), method)(*args)
+        )
+
+    def _close(self) -> None:
+        if self._repo is not None:
+            self._repo.close()
+            self._repo = None
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close)
+        self._executor.shutdown()
+
+    async def add_student(self, student: Student) -> None:
+        await self._call("add_student", student)
+
+    async def add_course(self, course: Course) -> None:
+        await self._call("add_course", course)
+
+    async def get_student(self, student_id: str) -> Student:
+        return await self._call("get_student", student_id)
+
+    async def get_course(self, course_code: str) -> Course:
+        return await self._call("get_course", course_code)
+
+    async def add_enrollment(self, enrollment: Enrollment) -> None:
+        await self._call("add_enrollment", enrollment)
+
+    async def add_enrollment_within_capacity(self, enrollment: Enrollment) -> None:
+        await self._call("add_enrollment_within_capacity", enrollment)
+
+    async def get_enrollment(self, student_id: str, course_code: str) -> Enrollment:
+        return await self._call("get_enrollment", student_id, course_code)
+
+    async def count_enrollments_for_course(self, course_code: str) -> int:
+        return await self._call("count_enrollments_for_course", course_code)
+
+    async def update_score(self, student_id: str, course_code: str, score: float) -> Enrollment:
+        return await self._call("update_score", student_id, course_code, score)
+
+    async def update_grade(
+        self,
+        student_id: str,
+        course_code: str,
+        grade: str,
+        passed: bool,
+    ) -> Enrollment:
+        return await self._call("update_grade", student_id, course_code, grade, passed)
@@ -0,0 +1,432 @@
+# app/compact_repository.py
+import math
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .models import Student, Course, Enrollment
+from .grading import GRADE_LETTERS, GRADE_POINTS
+from .repository import ChangeNotifier, score_update_error
+from .utils import BusinessRuleViolationError, EntityNotFoundError, DuplicateEntityError
+
+_NONE = -1  # "no grade" / "not decided" / end of a row chain
+_GRADE_CODES = {letter: code for code, letter in enumerate(GRADE_LETTERS)}
+_CODE_POINTS = [GRADE_POINTS[letter] for letter in GRADE_LETTERS]
+
+
+class EnrollmentView:
+    """
+    Live view of one enrollment row of a CompactRepository. Reads go to the
+    repository's columns; equal to an Enrollment with the same values.
+    """
+
+    __slots__ = ("_repo", "_row")
+
+    def __init__(self, repo: "CompactRepository", row: int) -> None:
+        self._repo = repo
+        self._row = row
+
+    @property
+    def student_id(self) -> str:
+        return self._repo._student_ids[self._repo._row_student[self._row]]
+
+    @property
+    def course_code(self) -> str:
+        return self._repo._courses[self._repo._row_course[self._row]].course_code
+
+    @property
+    def score(self) -> Optional[float]:
+        score = self._repo._scores[self._row]
+        return None if math.isnan(score) else score
+
+    @property
+    def grade(self) -> Optional[str]:
+        code = self._repo._grades[self._row]
+        return None if code == _NONE else GRADE_LETTERS[code]
+
+    @property
+    def passed(self) -> Optional[bool]:
+        passed = self._repo._passed[self._row]
+        return None if passed == _NONE else bool(passed)
+
+    def _values(self) -> tuple:
+        return (self.student_id, self.course_code, self.score, self.grade, self.passed)
+
+    def to_enrollment(self) -> Enrollment:
+        return Enrollment(*self._values())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Enrollment, EnrollmentView)):
+            return self._values() == (
+                other.student_id, other.course_code, other.score, other.grade, other.passed
+            )
+        return NotImplemented
+
+    __hash__ = None  # mutable, like Enrollment
+
+    def __repr__(self) -> str:
+        return "EnrollmentView(student_id={!r}, course_code={!r}, score={!r}, " \
+               "grade={!r}, passed={!r})".format(*self._values())
+
+
+class CompactRepository(ChangeNotifier):
+    """
+    Memory-lean repository with the InMemoryRepository interface.
+
+    Student and course IDs are interned to integer handles. Students are
+    stored as columns and built into Student objects on request, and
+    enrollments are rows in parallel typed arrays (handles, score, grade
+    code, passed flag) of roughly 26 bytes each instead of an Enrollment
+    object, its __dict__ and a tuple key. A student's or course's rows are chained
+    through `next` arrays, so no per-key containers exist; looking up one
+    enrollment walks the student's chain. Enrollments are handed out as
+    EnrollmentView objects created on demand.
+
+    A score of NaN cannot be stored: NaN marks "no score".
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._student_handles: Dict[str, int] = {}
+        self._student_ids: List[str] = []
+        self._student_names: List[str] = []
+        self._student_years = array("h")
+        self._course_handles: Dict[str, int] = {}
+        self._courses: List[Course] = []
+        # enrollment rows
+        self._row_student = array("i")
+        self._row_course = array("i")
+        self._scores = array("d")
+        self._grades = array("b")
+        self._passed = array("b")
+        self._next_by_student = array("i")
+        self._next_by_course = array("i")
+        # per student handle
+        self._student_first = array("i")
+        self._student_last = array("i")
+        self._grade_points = array("q")
+        self._graded_credits = array("q")
+        # per course handle
+        self._course_first = array("i")
+        self._course_last = array("i")
+        self._course_counts = array("i")
+
+    # ---- students ----
+    def add_student(self, student: Student) -> None:
+        if student.student_id in self._student_handles:
+            raise DuplicateEntityError(f"Student {student.student_id} already exists.")
+        self._student_handles[student.student_id] = len(self._student_ids)
+        self._student_ids.append(student.student_id)
+        self._student_names.append(student.name)
+        self._student_years.append(student.year)
+        self._student_first.append(_NONE)
+        self._student_last.append(_NONE)
+        self._grade_points.append(0)
+        self._graded_credits.append(0)
+
+    def add_students(self, students: Iterable[Student]) -> None:
+        """
+        Insert many students; if any of them already exists (or appears
+        twice in the batch), none is inserted.
+        """
+        students = list(students)
+        batch = set()
+        for student in students:
+            if student.student_id in self._student_handles or student.student_id in batch:
+                raise DuplicateEntityError(f"Student {student.student_id} already exists.")
+            batch.add(student.student_id)
+        for student in students:
+            self.add_student(student)
+
+    def _student_handle(self, student_id: str) -> int:
+        try:
+            return self._student_handles[student_id]
+        except KeyError:
+            raise EntityNotFoundError(f"Student {student_id} not found.")
+
+    def _student(self, handle: int) -> Student:
+        return Student(
+            student_id=self._student_ids[handle],
+            name=self._student_names[handle],
+            year=self._student_years[handle],
+        )
+
+    def get_student(self, student_id: str) -> Student:
+        return self._student(self._student_handle(student_id))
+
+    def list_students(self) -> List[Student]:
+        return list(self.iter_students())
+
+    def iter_students(self) -> Iterator[Student]:
+        """
+        Students in insertion order, built one at a time.
+        Students must not be added while iterating.
+        """
+        return map(self._student, range(len(self._student_ids)))
+
+    # ---- courses ----
+    def add_course(self, course: Course) -> None:
+        if course.course_code in self._course_handles:
+            raise DuplicateEntityError(f"Course {course.course_code} already exists.")
+        self._course_handles[course.course_code] = len(self._courses)
+        self._courses.append(course)
+        self._course_first.append(_NONE)
+        self._course_last.append(_NONE)
+        self._course_counts.append(0)
+
+    def add_courses(self, courses: Iterable[Course]) -> None:
+        """
+        Insert many courses; all or nothing.
+        """
+        courses = list(courses)
+        batch = set()
+        for course in courses:
+            if course.course_code in self._course_handles or course.course_code in batch:
+                raise DuplicateEntityError(f"Course {course.course_code} already exists.")
+            batch.add(course.course_code)
+        for course in courses:
+            self.add_course(course)
+
+    def _course_handle(self, course_code: str) -> int:
+        try:
+            return self._course_handles[course_code]
+        except KeyError:
+            raise EntityNotFoundError(f"Course {course_code} not found.")
+
+    def get_course(self, course_code: str) -> Course:
+        return self._courses[self._course_handle(course_code)]
+
+    def list_courses(self) -> List[Course]:
+        return list(self._courses)
+
+    # ---- enrollments ----
+    def _find_row(self, student: int, course: int) -> int:
+        row = self._student_first[student]
+        row_course = self._row_course
+        next_row = self._next_by_student
+        while row != _NONE and row_course[row] != course:
+            row = next_row[row]
+        return row
+
+    def _row(self, student_id: str, course_code: str) -> int:
+        student = self._student_handles.get(student_id)
+        course = self._course_handles.get(course_code)
+        if student is not None and course is not None:
+            row = self._find_row(student, course)
+            if row != _NONE:
+                return row
+        raise EntityNotFoundError(f"Enrollment {(student_id, course_code)} not found.")
+
+    def _check_enrollment(self, enrollment: Enrollment) -> Tuple[int, int]:
+        # the checks of add_enrollment; returns the (student, course) handles
+        key = (enrollment.student_id, enrollment.course_code)
+        student = self._student_handles.get(enrollment.student_id)
+        course = self._course_handles.get(enrollment.course_code)
+        if student is not None and course is not None and self._find_row(student, course) != _NONE:
+            raise DuplicateEntityError(f"Enrollment {key} already exists.")
+        # ensure foreign keys exist
+        student = self._student_handle(enrollment.student_id)
+        course = self._course_handle(enrollment.course_code)
+        if enrollment.grade is not None and enrollment.grade not in GRADE_POINTS:
+            raise ValueError(f"Unknown grade {enrollment.grade}")
+        return student, course
+
+    def _insert_row(self, student: int, course: int, enrollment: Enrollment) -> None:
+        row = len(self._row_student)
+        self._row_student.append(student)
+        self._row_course.append(course)
+        self._scores.append(math.nan if enrollment.score is None else enrollment.score)
+        self._grades.append(_NONE)
+        self._passed.append(_NONE if enrollment.passed is None else int(enrollment.passed))
+        self._next_by_student.append(_NONE)
+        self._next_by_course.append(_NONE)
+
+        if self._student_last[student] == _NONE:
+            self._student_first[student] = row
+        else:
+            self._next_by_student[self._student_last[student]] = row
+        self._student_last[student] = row
+        if self._course_last[course] == _NONE:
+            self._course_first[course] = row
+        else:
+            self._next_by_course[self._course_last[course]] = row
+        self._course_last[course] = row
+        self._course_counts[course] += 1
+        if enrollment.grade is not None:
+            self._set_grade(row, enrollment.grade)
+
+    def add_enrollment(self, enrollment: Enrollment) -> None:
+        student, course = self._check_enrollment(enrollment)
+        self._insert_row(student, course, enrollment)
+        self._notify_change(enrollment.student_id)
+
+    def add_enrollments(self, enrollments: Iterable[Enrollment]) -> None:
+        """
+        Insert many enrollments; all or nothing. The whole batch is checked
+        first, with the errors add_enrollment would raise.
+        """
+        rows = []
+        keys = set()
+        for enrollment in enrollments:
+            key = (enrollment.student_id, enrollment.course_code)
+            if key in keys:
+                raise DuplicateEntityError(f"Enrollment {key} already exists.")
+            keys.add(key)
+            rows.append((*self._check_enrollment(enrollment), enrollment))
+        for student, course, enrollment in rows:
+            self._insert_row(student, course, enrollment)
+        for student_id in dict.fromkeys(e.student_id for _, _, e in rows):
+            self._notify_change(student_id)
+
+    def add_enrollment_within_capacity(self, enrollment: Enrollment) -> None:
+        """
+        Insert the enrollment unless its course is already full. Checks run in
+        order course, capacity, student, duplicate.
+        """
+        course = self.get_course(enrollment.course_code)
+        if course.is_full(self.count_enrollments_for_course(enrollment.course_code)):
+            raise BusinessRuleViolationError("Course is full.")
+        self.get_student(enrollment.student_id)
+        self.add_enrollment(enrollment)
+
+    def add_enrollments_within_capacity(
+        self,
+        enrollments: Iterable[Enrollment],
+    ) -> List[Tuple[int, Exception]]:
+        """
+        Insert many enrollments in order, each as add_enrollment_within_capacity
+        would. An enrollment that would fail is skipped; returns (position,
+        error) for each of those.
+        """
+        errors: List[Tuple[int, Exception]] = []
+        changed: Dict[str, None] = {}
+        student_handles, course_handles = self._student_handles, self._course_handles
+        courses, counts = self._courses, self._course_counts
+        for index, enrollment in enumerate(enrollments):
+            student_id, course_code = enrollment.student_id, enrollment.course_code
+            course = course_handles.get(course_code)
+            student = student_handles.get(student_id)
+            if course is None:
+                error: Exception = EntityNotFoundError(f"Course {course_code} not found.")
+            elif courses[course].is_full(counts[course]):
+                error = BusinessRuleViolationError("Course is full.")
+            elif student is None:
+                error = EntityNotFoundError(f"Student {student_id} not found.")
+            elif self._find_row(student, course) != _NONE:
+                key = (student_id, course_code)
+                error = DuplicateEntityError(f"Enrollment {key} already exists.")
+            elif enrollment.grade is not None and enrollment.grade not in GRADE_POINTS:
+                error = ValueError(f"Unknown grade {enrollment.grade}")
+            else:
+                self._insert_row(student, course, enrollment)
+                changed[student_id] = None
+                continue
+            errors.append((index, error))
+        for student_id in changed:
+            self._notify_change(student_id)
+        return errors
+
+    def get_enrollment(self, student_id: str, course_code: str) -> EnrollmentView:
+        return EnrollmentView(self, self._row(student_id, course_code))
+
+    def list_enrollments_for_student(self, student_id: str) -> List[EnrollmentView]:
+        views = []
+        student = self._student_handles.get(student_id)
+        row = _NONE if student is None else self._student_first[student]
+        while row != _NONE:
+            views.append(EnrollmentView(self, row))
+            row = self._next_by_student[row]
+        return views
+
+    def list_enrollments_for_course(self, course_code: str) -> List[EnrollmentView]:
+        views = []
+        course = self._course_handles.get(course_code)
+        row = _NONE if course is None else self._course_first[course]
+        while row != _NONE:
+            views.append(EnrollmentView(self, row))
+            row = self._next_by_course[row]
+        return views
+
+    def count_enrollments_for_course(self, course_code: str) -> int:
+        course = self._course_handles.get(course_code)
+        return 0 if course is None else self._course_counts[course]
+
+    def update_score(self, student_id: str, course_code: str, score: float) -> EnrollmentView:
+        row = self._row(student_id, course_code)
+        if score < 0 or score > 100:
+            raise ValueError("Score must be between 0 and 100.")
+        self._scores[row] = score
+        self._notify_change(student_id)
+        return EnrollmentView(self, row)
+
+    def _set_grade(self, row: int, grade: str) -> None:
+        # keeps the student's GPA totals in step with the grade column
+        student = self._row_student[row]
+        credits = self._courses[self._row_course[row]].credits
+        old = self._grades[row]
+        if old != _NONE:
+            self._grade_points[student] -= _CODE_POINTS[old] * credits
+            self._graded_credits[student] -= credits
+        code = _GRADE_CODES[grade]
+        self._grades[row] = code
+        self._grade_points[student] += _CODE_POINTS[code] * credits
+        self._graded_credits[student] += credits
+
+    def update_grade(
+        self,
+        student_id: str,
+        course_code: str,
+        grade: str,
+        passed: bool,
+    ) -> EnrollmentView:
+        if grade not in GRADE_POINTS:
+            raise ValueError(f"Unknown grade {grade}")
+        row = self._row(student_id, course_code)
+        self._set_grade(row, grade)
+        self._passed[row] = int(passed)
+        self._notify_change(student_id)
+        return EnrollmentView(self, row)
+
+    def update_scores_and_grades(
+        self,
+        updates: Iterable[Tuple[str, str, float, str, bool]],
+    ) -> List[Tuple[int, Exception]]:
+        """
+        Apply many (student_id, course_code, score, grade, passed) updates in
+        order, each as update_score followed by update_grade. An update that
+        would fail is skipped; returns (position, error) for each of those.
+        Every update is checked before the first one is applied.
+        """
+        errors: List[Tuple[int, Exception]] = []
+        valid: List[Tuple[int, str, float, str, bool]] = []
+        for index, (student_id, course_code, score, grade, passed) in enumerate(updates):
+            try:
+                row = self._row(student_id, course_code)
+            except EntityNotFoundError as exc:
+                errors.append((index, exc))
+                continue
+            error = score_update_error(score, grade, passed)
+            if error is None:
+                valid.append((row, student_id, score, grade, passed))
+            else:
+                errors.append((index, error))
+
+        changed: Dict[str, None] = {}
+        try:
+            for row, student_id, score, grade, passed in valid:
+                self._scores[row] = score
+                self._set_grade(row, grade)
+                self._passed[row] = int(passed)
+                changed[student_id] = None
+        finally:
+            for student_id in changed:
+                self._notify_change(student_id)
+        return errors
+
+    # ---- aggregates ----
+    def get_gpa(self, student_id: str) -> float:
+        """
+        GPA over the student's graded enrollments, in O(1); 0.0 if none.
+        """
+        student = self._student_handles.get(student_id)
+        if student is None or not self._graded_credits[student]:
+            return 0.0
+        return self._grade_points[student] / self._graded_credits[student]
@@ -0,0 +1,116 @@
+# app/concurrent_repository.py
+import contextlib
+import threading
+from typing import Iterable, List, Tuple
+from .models import Student, Course, Enrollment
+from .repository import InMemoryRepository
+
+
+class ConcurrentRepository(InMemoryRepository):
+    """
+    InMemoryRepository that can be shared between threads.
+
+    Writes are serialized per course and per student through two sets of
+    striped locks, so registrations for different courses proceed in
+    parallel while the capacity check and insert of
+    add_enrollment_within_capacity happen atomically for each course.
+    Single dict/list operations are relied on to be atomic, as they are
+    in CPython.
+
+    Lock order is always course stripe, then student stripe.
+    """
+
+    def __init__(self, stripes: int = 64) -> None:
+        if stripes <= 0:
+            raise ValueError("stripes must be positive")
+        super().__init__()
+        self._course_locks = [threading.RLock() for _ in range(stripes)]
+        self._student_locks = [threading.RLock() for _ in range(stripes)]
+        self._catalog_lock = threading.Lock()
+
+    def _course_lock(self, course_code: str) -> threading.RLock:
+        return self._course_locks[hash(course_code) % len(self._course_locks)]
+
+    def _student_lock(self, student_id: str) -> threading.RLock:
+        return self._student_locks[hash(student_id) % len(self._student_locks)]
+
+    # ---- students / courses ----
+    def add_student(self, student: Student) -> None:
+        with self._catalog_lock:
+            super().add_student(student)
+
+    def add_course(self, course: Course) -> None:
+        with self._catalog_lock:
+            super().add_course(course)
+
+    def add_students(self, students: Iterable[Student]) -> None:
+        with self._catalog_lock:
+            super().add_students(students)
+
+    def add_courses(self, courses: Iterable[Course]) -> None:
+        with self._catalog_lock:
+            super().add_courses(courses)
+
+    # ---- enrollments ----
+    def add_enrollment(self, enrollment: Enrollment) -> None:
+        with self._course_lock(enrollment.course_code):
+            with self._student_lock(enrollment.student_id):
+                super().add_enrollment(enrollment)
+
+    def add_enrollments(self, enrollments: Iterable[Enrollment]) -> None:
+        # a batch may touch any course and student: take every stripe, in
+        # the usual order
+        with contextlib.ExitStack() as stack:
+            for lock in self._course_locks + self._student_locks:
+                stack.enter_context(lock)
+            super().add_enrollments(enrollments)
+
+    def add_enrollment_within_capacity(self, enrollment: Enrollment) -> None:
+        # the stripe lock is reentrant, so the nested add_enrollment is fine
+        with self._course_lock(enrollment.course_code):
+            super().add_enrollment_within_capacity(enrollment)
+
+    def add_enrollments_within_capacity(
+        self,
+        enrollments: Iterable[Enrollment],
+    ) -> List[Tuple[int, Exception]]:
+        with contextlib.ExitStack() as stack:
+            for lock in self._course_locks + self._student_locks:
+                stack.enter_context(lock)
+            return super().add_enrollments_within_capacity(enrollments)
+
+    def list_enrollments_for_course(self, course_code: str) -> List[Enrollment]:
+        with self._course_lock(course_code):
+            return super().list_enrollments_for_course(course_code)
+
+    def list_enrollments_for_student(self, student_id: str) -> List[Enrollment]:
+        with self._student_lock(student_id):
+            return super().list_enrollments_for_student(student_id)
+
+    def update_score(self, student_id: str, course_code: str, score: float) -> Enrollment:
+        with self._student_lock(student_id):
+            return super().update_score(student_id, course_code, score)
+
+    def update_grade(
+        self,
+        student_id: str,
+        course_code: str,
+        grade: str,
+        passed: bool,
+    ) -> Enrollment:
+        with self._student_lock(student_id):
+            return super().update_grade(student_id, course_code, grade, passed)
+
+    def update_scores_and_grades(
+        self,
+        updates: Iterable[Tuple[str, str, float, str, bool]],
+    ) -> List[Tuple[int, Exception]]:
+        with contextlib.ExitStack() as stack:
+            for lock in self._student_locks:
+                stack.enter_context(lock)
+            return super().update_scores_and_grades(updates)
+
+    # ---- aggregates ----
+    def get_gpa(self, student_id: str) -> float:
+        with self._student_lock(student_id):
+            return super().get_gpa(student_id)
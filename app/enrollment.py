@@ -1,8 +1,38 @@
 # app/enrollment.py
+import numbers
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
 from .repository import InMemoryRepository
 from .models import Enrollment
-from .grading import compute_grade_with_bonus
-from .utils import BusinessRuleViolationError
+from .grading import compute_grade_with_bonus, compute_grades_with_bonus
+
+
+@dataclass
+class EnrollmentResult:
+    """
+    Outcome of one (student_id, course_code) request of a bulk_enroll batch:
+    either the new enrollment or the error the single-item API would raise.
+    """
+    student_id: str
+    course_code: str
+    enrollment: Optional[Enrollment] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class ScoreError:
+    """
+    A row of a record_scores batch that was not applied: its position in
+    the input and the error record_score_for_enrollment would raise.
+    """
+    index: int
+    student_id: str
+    course_code: str
+    error: Exception
 
 
 def enroll_student_in_course(
@@ -14,19 +44,38 @@ def enroll_student_in_course(
     Enroll a student in a course if capacity allows.
     Integration point: uses repository + course logic together.
     """
-    course = repo.get_course(course_code)
-    current = repo.count_enrollments_for_course(course_code)
-    if course.is_full(current):
-        raise BusinessRuleViolationError("Course is full.")
-
-    # will raise if student not found
-    repo.get_student(student_id)
-
     enrollment = Enrollment(student_id=student_id, course_code=course_code)
-    repo.add_enrollment(enrollment)
+    # capacity check and insert in one repository call, so a concurrent
+    # repository can make them atomic
+    repo.add_enrollment_within_capacity(enrollment)
     return enrollment
 
 
+def bulk_enroll(
+    repo: InMemoryRepository,
+    requests: Iterable[Tuple[str, str]],
+) -> List[EnrollmentResult]:
+    """
+    Enroll a batch of (student_id, course_code) pairs, returning one result
+    per request in input order. A failing request does not abort the batch.
+
+    The whole batch goes to the repository in one
+    add_enrollments_within_capacity call, which checks each request as
+    enroll_student_in_course would (course, capacity, student, duplicate)
+    against running per-course counts, so requests are served first come,
+    first served, and capacity is re-checked under the repository's own
+    locking or transaction.
+    """
+    enrollments = [Enrollment(student_id, course_code) for student_id, course_code in requests]
+    errors = dict(repo.add_enrollments_within_capacity(enrollments))
+    return [
+        EnrollmentResult(e.student_id, e.course_code, None, errors[index])
+        if index in errors
+        else EnrollmentResult(e.student_id, e.course_code, e)
+        for index, e in enumerate(enrollments)
+    ]
+
+
 def record_score_for_enrollment(
     repo: InMemoryRepository,
     student_id: str,
@@ -38,8 +87,61 @@ def record_score_for_enrollment(
     Record a student's score in a course and compute grade.
     Integration point: calls grading.compute_grade_with_bonus.
     """
-    enrollment = repo.get_enrollment(student_id, course_code)
-    enrollment.update_score(raw_score)
+    repo.update_score(student_id, course_code, raw_score)
     grade, passed = compute_grade_with_bonus(raw_score, bonus)
-    enrollment.update_grade(grade, passed)
-    return enrollment
+    return repo.update_grade(student_id, course_code, grade, passed)
+
+
+def _numeric(row: Tuple[str, str, float, float]) -> bool:
+    return isinstance(row[2], numbers.Real) and isinstance(row[3], numbers.Real)
+
+
+def record_scores(
+    repo: InMemoryRepository,
+    rows: Iterable[Tuple[str, str, float, float]],
+) -> List[ScoreError]:
+    """
+    Batch version of record_score_for_enrollment for (student_id,
+    course_code, raw_score, bonus) rows. Returns the rows that failed, in
+    input order, with the error the single-row call would raise; every
+    other row is applied, in input order.
+
+    All rows are graded with one compute_grades_with_bonus pass, then
+    resolved and applied with one update_scores_and_grades call. A row
+    whose score or bonus is not a number is reported with a TypeError and
+    never reaches the repository.
+    """
+    rows = list(rows)
+    errors: List[ScoreError] = []
+    numeric = rows
+    positions: Optional[List[int]] = None
+    if not all(_numeric(row) for row in rows):
+        numeric, positions = [], []
+        for index, row in enumerate(rows):
+            if _numeric(row):
+                numeric.append(row)
+                positions.append(index)
+            else:
+                error = TypeError("Score and bonus must be numbers.")
+                errors.append(ScoreError(index, row[0], row[1], error))
+    grades, passed = compute_grades_with_bonus(
+        [row[2] for row in numeric], [row[3] for row in numeric]
+    )
+
+    # out-of-range raw scores are graded too (the bonus path clamps); the
+    # repository rejects them after checking the enrollment exists, in the
+    # same order as record_score_for_enrollment
+    skipped = repo.update_scores_and_grades(
+        (student_id, course_code, raw_score, grade, ok)
+        for (student_id, course_code, raw_score, _), grade, ok in zip(numeric, grades, passed)
+    )
+    if positions is None:
+        return [
+            ScoreError(index, rows[index][0], rows[index][1], error)
+            for index, error in skipped
+        ]
+    errors.extend(
+        ScoreError(positions[local], numeric[local][0], numeric[local][1], error)
+        for local, error in skipped
+    )
+    return sorted(errors, key=lambda error: error.index)
@@ -1,5 +1,20 @@
 # app/grading.py
-from typing import List, Tuple
+import itertools
+import numbers
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # the batch functions fall back to plain Python
+    np = None
+
+# Lower bounds of D, C, B, A; bisect_right maps a score to its letter.
+GRADE_THRESHOLDS = (60, 70, 80, 90)
+GRADE_LETTERS = ("F", "D", "C", "B", "A")
+
+# Grade points on the 10-point scale used by compute_gpa.
+GRADE_POINTS = {"A": 10, "B": 8, "C": 6, "D": 4, "F": 0}
 
 
 def compute_grade(score: float) -> Tuple[str, bool]:
@@ -35,6 +50,94 @@ def compute_grade_with_bonus(score: float, bonus: float) -> Tuple[str, bool]:
     return compute_grade(effective_score)
 
 
+def _score_array(values: Iterable[float]):
+    if not hasattr(values, "__len__"):
+        values = list(values)
+    return np.asarray(values, dtype=float)
+
+
+def _invalid_score_error(invalid: List[int]) -> ValueError:
+    return ValueError(
+        f"Score must be between 0 and 100 (offending indices: {invalid})."
+    )
+
+
+def compute_grades(scores: Iterable[float]) -> Tuple[List[str], List[bool]]:
+    """
+    Batch version of compute_grade: letter grades and pass flags for many
+    scores at once. Accepts any iterable of numbers (lists, array.array,
+    memoryviews, NumPy arrays). All scores are validated before grading,
+    and a ValueError lists every offending index.
+
+    With NumPy installed the scores are validated and graded in one
+    vectorized pass (searchsorted over GRADE_THRESHOLDS).
+    """
+    if np is not None:
+        return _compute_grades_numpy(_score_array(scores))
+
+    scores = list(scores)
+    # min/max/sum run at C speed and clear the common all-valid case; NaN
+    # (which makes min and max unreliable) or out-of-range scores take the
+    # slow path listing every offending index
+    total = sum(scores)
+    if total != total or min(scores, default=0) < 0 or max(scores, default=0) > 100:
+        invalid = [i for i, score in enumerate(scores) if score < 0 or score > 100]
+        if invalid:
+            raise _invalid_score_error(invalid)
+
+    # NaN slips through every comparison in compute_grade and ends as F;
+    # `score == score` is False only for NaN
+    grades = [
+        GRADE_LETTERS[bisect_right(GRADE_THRESHOLDS, score)] if score == score else "F"
+        for score in scores
+    ]
+    return grades, [grade != "F" for grade in grades]
+
+
+def _compute_grades_numpy(scores) -> Tuple[List[str], List[bool]]:
+    invalid = np.flatnonzero((scores < 0) | (scores > 100))
+    if invalid.size:
+        raise _invalid_score_error(invalid.tolist())
+    codes = np.searchsorted(GRADE_THRESHOLDS, scores, side="right")
+    # searchsorted sorts NaN above every threshold; compute_grade fails it
+    codes[np.isnan(scores)] = 0
+    letters = np.array(GRADE_LETTERS, dtype=object)
+    return letters[codes].tolist(), (codes > 0).tolist()
+
+
+def compute_grades_with_bonus(
+    scores: Iterable[float],
+    bonuses: Union[float, Sequence[float]],
+) -> Tuple[List[str], List[bool]]:
+    """
+    Batch version of compute_grade_with_bonus. `bonuses` is either one bonus
+    (any real number, NumPy scalars included) for every score or a sequence
+    with one bonus per score.
+    """
+    scalar = isinstance(bonuses, numbers.Real)
+    if np is not None:
+        scores = _score_array(scores)
+        if not scalar:
+            bonuses = _score_array(bonuses)
+            if len(bonuses) != len(scores):
+                raise ValueError("scores and bonuses must have same length")
+        # clamp to [0, 100]
+        return _compute_grades_numpy(np.clip(scores + bonuses, 0, 100))
+
+    scores = list(scores)
+    if scalar:
+        bonuses = [bonuses] * len(scores)
+    else:
+        bonuses = list(bonuses)
+        if len(bonuses) != len(scores):
+            raise ValueError("scores and bonuses must have same length")
+
+    # clamp to [0, 100]
+    effective = [s + b for s, b in zip(scores, bonuses)]
+    effective = [0 if e < 0 else 100 if e > 100 else e for e in effective]
+    return compute_grades(effective)
+
+
 def compute_gpa(grades: List[str], credits: List[int]) -> float:
     """
     Compute GPA on a 10-point scale from a list of letter grades and credits.
@@ -44,15 +147,93 @@ def compute_gpa(grades: List[str], credits: List[int]) -> float:
     if not grades:
         return 0.0
 
-    grade_points = {"A": 10, "B": 8, "C": 6, "D": 4, "F": 0}
     total_points = 0
     total_credits = 0
     for g, c in zip(grades, credits):
-        if g not in grade_points:
+        if g not in GRADE_POINTS:
             raise ValueError(f"Unknown grade {g}")
         if c <= 0:
             raise ValueError("credits must be positive")
-        total_points += grade_points[g] * c
+        total_points += GRADE_POINTS[g] * c
         total_credits += c
 
     return total_points / total_credits
+
+
+def compute_cohort_gpa(
+    student_indices: Sequence[int],
+    grades: Sequence[str],
+    credits: Sequence[int],
+    num_students: Optional[int] = None,
+) -> List[float]:
+    """
+    Compute the GPA of every student in a cohort in one grouped pass.
+
+    Input is columnar: row i says student `student_indices[i]` got
+    `grades[i]` in a course worth `credits[i]`. Returns one GPA per student
+    index in range(num_students) (default: highest index + 1); students
+    without rows get 0.0, like compute_gpa([], []). Rows are validated with
+    the same rules and messages as compute_gpa, in row order.
+
+    With NumPy installed the per-student sums are np.bincount reductions
+    weighted by grade points and credits.
+    """
+    if not (len(student_indices) == len(grades) == len(credits)):
+        raise ValueError("student_indices, grades and credits must have same length")
+    if np is not None:
+        return _cohort_gpa_numpy(student_indices, grades, credits, num_students)
+    if num_students is None:
+        num_students = max(student_indices, default=-1) + 1
+
+    total_points = [0] * num_students
+    total_credits = [0] * num_students
+    for s, g, c in zip(student_indices, grades, credits):
+        if not 0 <= s < num_students:
+            raise ValueError(f"Unknown student index {s}")
+        if g not in GRADE_POINTS:
+            raise ValueError(f"Unknown grade {g}")
+        if c <= 0:
+            raise ValueError("credits must be positive")
+        total_points[s] += GRADE_POINTS[g] * c
+        total_credits[s] += c
+
+    return [
+        points / creds if creds else 0.0
+        for points, creds in zip(total_points, total_credits)
+    ]
+
+
+def _cohort_gpa_numpy(
+    student_indices: Sequence[int],
+    grades: Sequence[str],
+    credits: Sequence[int],
+    num_students: Optional[int],
+) -> List[float]:
+    rows = len(grades)
+    students = np.asarray(student_indices, dtype=np.int64)
+    creds = np.asarray(credits, dtype=float)
+    # -1 marks an unknown grade
+    points = np.fromiter(
+        map(GRADE_POINTS.get, grades, itertools.repeat(-1, rows)), dtype=float, count=rows
+    )
+    if num_students is None:
+        num_students = int(students.max()) + 1 if rows else 0
+
+    bad_student = (students < 0) | (students >= num_students)
+    bad_grade = points < 0
+    bad = bad_student | bad_grade | (creds <= 0)
+    if bad.any():
+        # report the first bad row the way the row-by-row check would
+        row = int(np.argmax(bad))
+        if bad_student[row]:
+            raise ValueError(f"Unknown student index {student_indices[row]}")
+        if bad_grade[row]:
+            raise ValueError(f"Unknown grade {grades[row]}")
+        raise ValueError("credits must be positive")
+
+    total_points = np.bincount(students, weights=points * creds, minlength=num_students)
+    total_credits = np.bincount(students, weights=creds, minlength=num_students)
+    gpas = np.divide(
+        total_points, total_credits, out=np.zeros(num_students), where=total_credits > 0
+    )
+    return gpas.tolist()
@@ -0,0 +1,233 @@
+# app/loaders.py
+"""
+Streaming bulk loaders: populate a repository from CSV or JSON Lines files.
+
+Columns (CSV header / JSON keys):
+    students      student_id, name, year
+    courses       course_code, title, credits, max_capacity (optional, 60)
+    enrollments   student_id, course_code, score, grade, passed (last three optional)
+
+Rows are read and parsed in chunks and each chunk goes to the repository's
+add_students / add_courses / add_enrollments, which check the whole chunk
+and insert it in one step. A chunk that fails its check is retried row by
+row with add_student / add_course / add_enrollment to find the bad rows,
+which are then handled by the error policy:
+
+    "reject"    skip bad rows and count them
+    "collect"   skip bad rows and keep a RowError for each
+    "abort"     raise the first bad row's error; rows before it stay loaded
+"""
+import csv
+import itertools
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .models import Student, Course, Enrollment
+from .grading import GRADE_POINTS
+from .utils import DuplicateEntityError, EntityNotFoundError, gc_paused
+
+ERROR_POLICIES = ("reject", "collect", "abort")
+FORMATS = ("csv", "jsonl")
+
+# errors that mark a row as bad; anything else aborts the load
+_ROW_ERRORS = (ValueError, TypeError, KeyError, DuplicateEntityError, EntityNotFoundError)
+
+
+@dataclass
+class RowError:
+    """A row that was not loaded: its line number, raw fields and error."""
+    line: int
+    row: Any
+    error: Exception
+
+
+@dataclass
+class LoadReport:
+    rows: int = 0
+    loaded: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    errors: List[RowError] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _optional(value: Any) -> Any:
+    return None if value is None or value == "" else value
+
+
+def _parse_bool(value: Any) -> Optional[bool]:
+    value = _optional(value)
+    if value is None or isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes"):
+        return True
+    if text in ("0", "false", "no"):
+        return False
+    raise ValueError(f"Not a boolean: {value!r}")
+
+
+def parse_student(row: Dict[str, Any]) -> Student:
+    return Student(student_id=row["student_id"], name=row["name"], year=int(row["year"]))
+
+
+def parse_course(row: Dict[str, Any]) -> Course:
+    max_capacity = _optional(row.get("max_capacity"))
+    return Course(
+        course_code=row["course_code"],
+        title=row["title"],
+        credits=int(row["credits"]),
+        max_capacity=60 if max_capacity is None else int(max_capacity),
+    )
+
+
+def parse_enrollment(row: Dict[str, Any]) -> Enrollment:
+    enrollment = Enrollment(student_id=row["student_id"], course_code=row["course_code"])
+    score = _optional(row.get("score"))
+    if score is not None:
+        enrollment.update_score(float(score))
+    grade = _optional(row.get("grade"))
+    if grade is not None and grade not in GRADE_POINTS:
+        raise ValueError(f"Unknown grade {grade}")
+    enrollment.grade = grade
+    enrollment.passed = _parse_bool(row.get("passed"))
+    return enrollment
+
+
+def read_rows(path: str, fmt: Optional[str] = None) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (line number, row dict) from a CSV file with a header or a JSON
+    Lines file. The format defaults to the file extension. A JSON line that
+    is not an object is yielded as its text, to be rejected by the loader.
+    """
+    if fmt is None:
+        fmt = "csv" if path.endswith(".csv") else "jsonl"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt}")
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.reader(f)
+            header = next(reader, [])
+            for fields in reader:
+                yield reader.line_num, dict(zip(header, fields))
+        else:
+            for line, text in enumerate(f, 1):
+                if not text.strip():
+                    continue
+                try:
+                    row = json.loads(text)
+                except ValueError:
+                    row = None
+                yield line, row if isinstance(row, dict) else text.rstrip("\n")
+
+
+def _load(
+    rows: Iterator[Tuple[int, Any]],
+    parse: Callable[[Dict[str, Any]], Any],
+    add_many: Callable[[List[Any]], None],
+    add_one: Callable[[Any], None],
+    chunk_size: int,
+    on_error: str,
+) -> LoadReport:
+    if on_error not in ERROR_POLICIES:
+        raise ValueError(f"Unknown error policy {on_error}")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    report = LoadReport()
+    began = time.perf_counter()
+    with gc_paused():
+        _load_chunks(rows, parse, add_many, add_one, chunk_size, on_error, report)
+    report.seconds = time.perf_counter() - began
+    return report
+
+
+def _load_chunks(
+    rows: Iterator[Tuple[int, Any]],
+    parse: Callable[[Dict[str, Any]], Any],
+    add_many: Callable[[List[Any]], None],
+    add_one: Callable[[Any], None],
+    chunk_size: int,
+    on_error: str,
+    report: LoadReport,
+) -> None:
+
+    def reject(line: int, row: Any, exc: Exception) -> None:
+        report.rejected += 1
+        if on_error == "collect":
+            report.errors.append(RowError(line, row, exc))
+
+    def insert(parsed: List[Tuple[int, Dict[str, Any], Any]]) -> None:
+        try:
+            add_many([entity for _, _, entity in parsed])
+            report.loaded += len(parsed)
+            return
+        except _ROW_ERRORS:
+            pass
+        # nothing of the batch was inserted; find the bad rows
+        for line, row, entity in parsed:
+            try:
+                add_one(entity)
+                report.loaded += 1
+            except _ROW_ERRORS as exc:
+                if on_error == "abort":
+                    raise
+                reject(line, row, exc)
+
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            break
+        report.rows += len(chunk)
+        parsed = []
+        for line, row in chunk:
+            try:
+                if not isinstance(row, dict):
+                    raise ValueError(f"Line {line} is not a JSON object")
+                parsed.append((line, row, parse(row)))
+            except _ROW_ERRORS as exc:
+                if on_error == "abort":
+                    insert(parsed)
+                    raise
+                reject(line, row, exc)
+        insert(parsed)
+
+
+def load_students(
+    repo: Any,
+    path: str,
+    fmt: Optional[str] = None,
+    chunk_size: int = 10_000,
+    on_error: str = "reject",
+) -> LoadReport:
+    return _load(read_rows(path, fmt), parse_student, repo.add_students, repo.add_student,
+                 chunk_size, on_error)
+
+
+def load_courses(
+    repo: Any,
+    path: str,
+    fmt: Optional[str] = None,
+    chunk_size: int = 10_000,
+    on_error: str = "reject",
+) -> LoadReport:
+    return _load(read_rows(path, fmt), parse_course, repo.add_courses, repo.add_course,
+                 chunk_size, on_error)
+
+
+def load_enrollments(
+    repo: Any,
+    path: str,
+    fmt: Optional[str] = None,
+    chunk_size: int = 10_000,
+    on_error: str = "reject",
+) -> LoadReport:
+    """
+    Load enrollments without capacity checks, like add_enrollment. The
+    students and courses they refer to must be loaded first.
+    """
+    return _load(read_rows(path, fmt), parse_enrollment, repo.add_enrollments,
+                 repo.add_enrollment, chunk_size, on_error)
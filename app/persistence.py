@@ -0,0 +1,595 @@
+# app/persistence.py
+"""
+Durability for the in-memory repository: an append-only operation log
+(write-ahead log) plus periodic binary snapshots.
+
+Directory layout:
+    snapshot.bin             latest snapshot, replaced atomically
+    wal-<first seq>.log      log segments; a new one starts at each snapshot
+
+Snapshot:    <magic "CMSSNAP"> <format version u16> <seq u64> <crc32 u32> <payload>
+Segment:     <magic "CMSWAL"> <format version u16> <record>*
+Log record:  <payload length u32> <crc32 u32> <seq u64> <payload>
+Payloads are UTF-8 JSON, so files stay readable across Python versions.
+The crc covers seq and payload, so a torn or corrupted tail is detected and
+dropped on recovery. Files of another format version are refused.
+"""
+import json
+import os
+import struct
+import threading
+import zlib
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple
+from .models import Student, Course, Enrollment
+from .repository import InMemoryRepository
+from .grading import GRADE_POINTS
+from .utils import BusinessRuleViolationError, gc_paused
+
+SNAPSHOT_FILE = "snapshot.bin"
+SNAPSHOT_MAGIC = b"CMSSNAP"
+SEGMENT_MAGIC = b"CMSWAL"
+SEGMENT_PREFIX = "wal-"
+SEGMENT_SUFFIX = ".log"
+# bump when the layout or the payload encoding changes
+FORMAT_VERSION = 1
+
+_VERSION = struct.Struct("<H")
+_RECORD_HEADER = struct.Struct("<IIQ")
+_SNAPSHOT_HEADER = struct.Struct("<QI")
+_SEQ = struct.Struct("<Q")
+_SEGMENT_HEADER = SEGMENT_MAGIC + _VERSION.pack(FORMAT_VERSION)
+
+# operation codes stored in the log
+OP_ADD_STUDENT = 1
+OP_ADD_COURSE = 2
+OP_ADD_ENROLLMENT = 3
+OP_UPDATE_SCORE = 4
+OP_UPDATE_GRADE = 5
+
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+def _encode(value: Any) -> bytes:
+    return _ENCODER.encode(value).encode()
+
+
+def _check_version(path: str, data: bytes, magic: bytes, kind: str) -> None:
+    if data[:len(magic)] != magic or len(data) < len(magic) + _VERSION.size:
+        raise ValueError(f"{path} is not a repository {kind}")
+    (version,) = _VERSION.unpack_from(data, len(magic))
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path} has unsupported format version {version}")
+
+
+def encode_record(seq: int, op: tuple) -> bytes:
+    return _frame(seq, _encode(op))
+
+
+def _frame(seq: int, payload: bytes) -> bytes:
+    crc = zlib.crc32(payload, zlib.crc32(_SEQ.pack(seq)))
+    return _RECORD_HEADER.pack(len(payload), crc, seq) + payload
+
+
+def segment_path(directory: str, first_seq: int) -> str:
+    return os.path.join(directory, f"{SEGMENT_PREFIX}{first_seq:020d}{SEGMENT_SUFFIX}")
+
+
+def list_segments(directory: str) -> List[Tuple[int, str]]:
+    """(first seq, path) of every log segment, oldest first."""
+    segments = []
+    for name in os.listdir(directory):
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+            first_seq = int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            segments.append((first_seq, os.path.join(directory, name)))
+    return sorted(segments)
+
+
+def read_segment(path: str) -> Iterator[Tuple[int, tuple]]:
+    """
+    Yield (seq, op) for every intact record. Reading stops at the first
+    torn or corrupted record, and the file is truncated there so later
+    appends never follow garbage. A segment whose header was never fully
+    written holds no records and is truncated to empty.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < len(_SEGMENT_HEADER) and _SEGMENT_HEADER.startswith(data):
+        if data:
+            os.truncate(path, 0)
+        return
+    _check_version(path, data, SEGMENT_MAGIC, "log segment")
+    offset = len(_SEGMENT_HEADER)
+    while offset + _RECORD_HEADER.size <= len(data):
+        length, crc, seq = _RECORD_HEADER.unpack_from(data, offset)
+        start = offset + _RECORD_HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload, zlib.crc32(_SEQ.pack(seq))) != crc:
+            break
+        yield seq, tuple(json.loads(payload))
+        offset = start + length
+    if offset < len(data):
+        os.truncate(path, offset)
+
+
+def _fsync_directory(directory: str) -> None:
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class OperationLog:
+    """
+    Append-only log with group commit.
+
+    append() only queues the encoded record; a flusher thread writes
+    everything queued so far and fsyncs once, so concurrent writers share
+    the cost of one fsync. wait_durable(seq) blocks until a record is on disk.
+    """
+
+    def __init__(self, directory: str, next_seq: int) -> None:
+        self.directory = directory
+        self._cond = threading.Condition()
+        self._next_seq = next_seq
+        self._durable_seq = next_seq - 1
+        self._buffer: List[bytes] = []
+        self._file = self._open_segment(next_seq)
+        self._closed = False
+        self._error: Optional[OSError] = None
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="operation-log-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def _open_segment(self, first_seq: int) -> BinaryIO:
+        # the header reaches disk with the first flushed batch
+        f = open(segment_path(self.directory, first_seq), "ab")
+        if f.tell() == 0:
+            f.write(_SEGMENT_HEADER)
+        return f
+
+    @property
+    def last_seq(self) -> int:
+        return self._next_seq - 1
+
+    def append(self, op: tuple) -> int:
+        """Queue `op` and return its sequence number."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Operation log is closed.")
+            seq = self._next_seq
+            self._next_seq += 1
+            self._buffer.append(encode_record(seq, op))
+            if len(self._buffer) == 1:
+                # the flusher only sleeps on an empty buffer
+                self._cond.notify_all()
+        return seq
+
+    def append_all(self, ops: List[tuple]) -> Optional[int]:
+        """
+        Queue `ops` as consecutive records and return the last sequence
+        number (None for no ops). All are encoded first, so either every
+        op is queued or, if one cannot be encoded, none is.
+        """
+        payloads = [_encode(op) for op in ops]
+        if not payloads:
+            return None
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Operation log is closed.")
+            first = self._next_seq
+            self._next_seq += len(payloads)
+            was_empty = not self._buffer
+            self._buffer.extend(_frame(first + i, p) for i, p in enumerate(payloads))
+            if was_empty:
+                self._cond.notify_all()
+        return first + len(payloads) - 1
+
+    def wait_durable(self, seq: int) -> None:
+        with self._cond:
+            while self._durable_seq < seq and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise self._error
+
+    def rotate(self) -> int:
+        """
+        Flush, then continue in a new segment. Returns the last sequence
+        number of the old segments. Callers must stop appends meanwhile.
+        """
+        with self._cond:
+            last = self._next_seq - 1
+        self.wait_durable(last)
+        with self._cond:
+            self._file.close()
+            self._file = self._open_segment(self._next_seq)
+        return last
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._buffer and not self._closed:
+                    self._cond.wait()
+                if not self._buffer:
+                    return
+                batch, self._buffer = self._buffer, []
+                last = self._next_seq - 1
+                f = self._file
+            try:
+                f.write(b"".join(batch))
+                f.flush()
+                os.fsync(f.fileno())
+            except OSError as exc:
+                with self._cond:
+                    self._error = exc
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._durable_seq = last
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join()
+        self._file.close()
+
+
+def write_snapshot(directory: str, seq: int, state: tuple) -> None:
+    """
+    Write (students, courses, enrollments) as of `seq` to a temporary file
+    and atomically replace the previous snapshot.
+    """
+    payload = _encode(state)
+    path = os.path.join(directory, SNAPSHOT_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(_VERSION.pack(FORMAT_VERSION))
+        f.write(_SNAPSHOT_HEADER.pack(seq, zlib.crc32(payload)))
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_directory(directory)
+
+
+def read_snapshot(directory: str) -> Optional[Tuple[int, tuple]]:
+    """(seq, state) of the latest snapshot, or None if there is none."""
+    path = os.path.join(directory, SNAPSHOT_FILE)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    _check_version(path, data, SNAPSHOT_MAGIC, "snapshot")
+    header_end = len(SNAPSHOT_MAGIC) + _VERSION.size + _SNAPSHOT_HEADER.size
+    if len(data) < header_end:
+        raise ValueError(f"{path} is corrupted")
+    seq, crc = _SNAPSHOT_HEADER.unpack_from(data, len(SNAPSHOT_MAGIC) + _VERSION.size)
+    payload = data[header_end:]
+    if zlib.crc32(payload) != crc:
+        raise ValueError(f"{path} is corrupted")
+    return seq, tuple(json.loads(payload))
+
+
+class DurableRepository(InMemoryRepository):
+    """
+    InMemoryRepository whose writes are logged, so its state survives
+    restarts while reads stay plain dict lookups.
+
+    Every successful add_* / update_* appends one record to the operation
+    log; with wait_for_sync (the default) the call returns once its record
+    is fsynced, sharing fsyncs with concurrent writers. After
+    `snapshot_every` logged operations a snapshot is taken: the state is
+    copied under the write lock and written by a background thread, after
+    which the log segments it covers are deleted. Opening a directory
+    replays the latest snapshot and then the log tail.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        snapshot_every: Optional[int] = 100_000,
+        wait_for_sync: bool = True,
+    ) -> None:
+        super().__init__()
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.wait_for_sync = wait_for_sync
+        self._write_lock = threading.RLock()
+        self._ops_since_snapshot = 0
+        self._snapshot_thread: Optional[threading.Thread] = None
+        self._snapshot_error: Optional[BaseException] = None
+        last_seq = self._recover()
+        self._log = OperationLog(directory, last_seq + 1)
+
+    # ---- recovery ----
+    def _recover(self) -> int:
+        with gc_paused():
+            return self._replay_directory()
+
+    def _replay_directory(self) -> int:
+        seq = 0
+        snapshot = read_snapshot(self.directory)
+        if snapshot is not None:
+            seq, state = snapshot
+            self._restore(*state)
+        for _, path in list_segments(self.directory):
+            for record_seq, op in read_segment(path):
+                if record_seq <= seq:
+                    continue
+                self._replay(op)
+                seq = record_seq
+        return seq
+
+    def _restore(self, students: list, courses: list, enrollments: list) -> None:
+        # bulk load straight into the indexes; a snapshot is consistent, so
+        # none of the per-insert checks are needed
+        self._students = {row[0]: Student(*row) for row in students}
+        self._courses = {row[0]: Course(*row) for row in courses}
+        by_key = self._enrollments
+        by_student = self._enrollments_by_student
+        by_course = self._enrollments_by_course
+        grade_points = self._grade_points
+        graded_credits = self._graded_credits
+        courses = self._courses
+        for row in enrollments:
+            enrollment = Enrollment(*row)
+            student_id, course_code, _, grade, _ = row
+            by_key[(student_id, course_code)] = enrollment
+            by_student.setdefault(student_id, []).append(enrollment)
+            by_course.setdefault(course_code, []).append(enrollment)
+            if grade in GRADE_POINTS:
+                credits = courses[course_code].credits
+                grade_points[student_id] = (
+                    grade_points.get(student_id, 0) + GRADE_POINTS[grade] * credits
+                )
+                graded_credits[student_id] = graded_credits.get(student_id, 0) + credits
+        self._course_counts = {code: len(rows) for code, rows in by_course.items()}
+
+    def _replay(self, op: tuple) -> None:
+        code, args = op[0], op[1:]
+        if code == OP_ADD_STUDENT:
+            InMemoryRepository.add_student(self, Student(*args))
+        elif code == OP_ADD_COURSE:
+            InMemoryRepository.add_course(self, Course(*args))
+        elif code == OP_ADD_ENROLLMENT:
+            InMemoryRepository.add_enrollment(self, Enrollment(*args))
+        elif code == OP_UPDATE_SCORE:
+            InMemoryRepository.update_score(self, *args)
+        elif code == OP_UPDATE_GRADE:
+            InMemoryRepository.update_grade(self, *args)
+        else:
+            raise ValueError(f"Unknown operation code {code} in log")
+
+    # ---- logging ----
+    def _apply_and_log(self, apply: Callable[..., Any], args: tuple, op: tuple) -> Tuple[Any, int]:
+        # caller holds _write_lock, so log order is apply order
+        result = apply(self, *args)
+        seq = self._log.append(op)
+        self._ops_since_snapshot += 1
+        self._snapshot_if_due()
+        return result, seq
+
+    def _snapshot_if_due(self) -> None:
+        # caller holds _write_lock and has applied everything it logged
+        if self.snapshot_every and self._ops_since_snapshot >= self.snapshot_every:
+            self._start_snapshot()
+
+    def _append_all(self, ops: List[tuple]) -> Optional[int]:
+        # caller holds _write_lock; seq of the last record, if any
+        seq = self._log.append_all(ops)
+        self._ops_since_snapshot += len(ops)
+        return seq
+
+    def _wait(self, seq: int) -> None:
+        if self.wait_for_sync:
+            self._log.wait_durable(seq)
+
+    def _logged(self, apply: Callable[..., Any], args: tuple, op: tuple) -> Any:
+        with self._write_lock:
+            result, seq = self._apply_and_log(apply, args, op)
+        self._wait(seq)
+        return result
+
+    def _logged_batch(self, apply: Callable[..., Any], items: list, ops: List[tuple]) -> None:
+        # one record per item, so replay needs no batch operation codes
+        with self._write_lock:
+            apply(self, items)
+            seq = self._append_all(ops)
+            self._snapshot_if_due()
+        if seq is not None:
+            self._wait(seq)
+
+    def add_student(self, student: Student) -> None:
+        self._logged(
+            InMemoryRepository.add_student,
+            (student,),
+            (OP_ADD_STUDENT, student.student_id, student.name, student.year),
+        )
+
+    def add_course(self, course: Course) -> None:
+        self._logged(
+            InMemoryRepository.add_course,
+            (course,),
+            (OP_ADD_COURSE, course.course_code, course.title, course.credits,
+             course.max_capacity),
+        )
+
+    def add_enrollment(self, enrollment: Enrollment) -> None:
+        self._logged(
+            InMemoryRepository.add_enrollment,
+            (enrollment,),
+            (OP_ADD_ENROLLMENT, enrollment.student_id, enrollment.course_code,
+             enrollment.score, enrollment.grade, enrollment.passed),
+        )
+
+    def add_students(self, students: Iterable[Student]) -> None:
+        students = list(students)
+        self._logged_batch(
+            InMemoryRepository.add_students,
+            students,
+            [(OP_ADD_STUDENT, s.student_id, s.name, s.year) for s in students],
+        )
+
+    def add_courses(self, courses: Iterable[Course]) -> None:
+        courses = list(courses)
+        self._logged_batch(
+            InMemoryRepository.add_courses,
+            courses,
+            [(OP_ADD_COURSE, c.course_code, c.title, c.credits, c.max_capacity)
+             for c in courses],
+        )
+
+    def add_enrollments(self, enrollments: Iterable[Enrollment]) -> None:
+        enrollments = list(enrollments)
+        self._logged_batch(
+            InMemoryRepository.add_enrollments,
+            enrollments,
+            [(OP_ADD_ENROLLMENT, e.student_id, e.course_code, e.score, e.grade, e.passed)
+             for e in enrollments],
+        )
+
+    def add_enrollment_within_capacity(self, enrollment: Enrollment) -> None:
+        with self._write_lock:
+            course = self.get_course(enrollment.course_code)
+            if course.is_full(self.count_enrollments_for_course(enrollment.course_code)):
+                raise BusinessRuleViolationError("Course is full.")
+            self.get_student(enrollment.student_id)
+            _, seq = self._apply_and_log(
+                InMemoryRepository.add_enrollment,
+                (enrollment,),
+                (OP_ADD_ENROLLMENT, enrollment.student_id, enrollment.course_code,
+                 enrollment.score, enrollment.grade, enrollment.passed),
+            )
+        self._wait(seq)
+
+    def add_enrollments_within_capacity(
+        self,
+        enrollments: Iterable[Enrollment],
+    ) -> List[Tuple[int, Exception]]:
+        # the batch is checked in full and logged before any of it is
+        # applied, so nothing applied can be missing from the log
+        with self._write_lock:
+            accepted, errors = self._check_enrollments_within_capacity(enrollments)
+            seq = self._append_all([
+                (OP_ADD_ENROLLMENT, e.student_id, e.course_code, e.score, e.grade, e.passed)
+                for e in accepted
+            ])
+            try:
+                self._insert_enrollments(accepted)
+            finally:
+                self._snapshot_if_due()
+        if seq is not None:
+            self._wait(seq)
+        return errors
+
+    def update_score(self, student_id: str, course_code: str, score: float) -> Enrollment:
+        return self._logged(
+            InMemoryRepository.update_score,
+            (student_id, course_code, score),
+            (OP_UPDATE_SCORE, student_id, course_code, score),
+        )
+
+    def update_grade(
+        self,
+        student_id: str,
+        course_code: str,
+        grade: str,
+        passed: bool,
+    ) -> Enrollment:
+        return self._logged(
+            InMemoryRepository.update_grade,
+            (student_id, course_code, grade, passed),
+            (OP_UPDATE_GRADE, student_id, course_code, grade, passed),
+        )
+
+    def update_scores_and_grades(
+        self,
+        updates: Iterable[Tuple[str, str, float, str, bool]],
+    ) -> List[Tuple[int, Exception]]:
+        # checked in full and logged before any row is applied, as in
+        # add_enrollments_within_capacity
+        with self._write_lock:
+            valid, errors = self._check_score_updates(updates)
+            ops = []
+            for enrollment, score, grade, passed in valid:
+                key = (enrollment.student_id, enrollment.course_code)
+                ops.append((OP_UPDATE_SCORE, *key, score))
+                ops.append((OP_UPDATE_GRADE, *key, grade, passed))
+            seq = self._append_all(ops)
+            try:
+                self._apply_score_updates(valid)
+            finally:
+                self._snapshot_if_due()
+        if seq is not None:
+            self._wait(seq)
+        return errors
+
+    # ---- snapshots ----
+    def _capture(self) -> Tuple[int, tuple]:
+        # caller holds _write_lock; enrollments are mutable, so copy values
+        state = (
+            [(s.student_id, s.name, s.year) for s in self._students.values()],
+            [(c.course_code, c.title, c.credits, c.max_capacity)
+             for c in self._courses.values()],
+            [(e.student_id, e.course_code, e.score, e.grade, e.passed)
+             for e in self._enrollments.values()],
+        )
+        seq = self._log.rotate()
+        self._ops_since_snapshot = 0
+        return seq, state
+
+    def _write_snapshot(self, seq: int, state: tuple) -> None:
+        write_snapshot(self.directory, seq, state)
+        current = segment_path(self.directory, seq + 1)
+        for _, path in list_segments(self.directory):
+            if path < current:
+                os.remove(path)
+
+    def _background_snapshot(self, seq: int, state: tuple) -> None:
+        try:
+            self._write_snapshot(seq, state)
+        except BaseException as exc:  # reported by the next snapshot() / close()
+            self._snapshot_error = exc
+
+    def _start_snapshot(self) -> None:
+        if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+            return
+        seq, state = self._capture()
+        self._snapshot_thread = threading.Thread(
+            target=self._background_snapshot, args=(seq, state),
+            name="repository-snapshot", daemon=True,
+        )
+        self._snapshot_thread.start()
+
+    def _join_snapshot(self) -> None:
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+        if self._snapshot_error is not None:
+            error, self._snapshot_error = self._snapshot_error, None
+            raise error
+
+    def snapshot(self) -> None:
+        """Take a snapshot now and wait until it is on disk."""
+        # one snapshot at a time: an older one finishing after a newer one
+        # would leave a snapshot behind the deleted log segments
+        with self._write_lock:
+            self._join_snapshot()
+            self._start_snapshot()
+        self._join_snapshot()
+
+    def close(self) -> None:
+        """Wait for pending log writes and snapshots, then release files."""
+        try:
+            self._join_snapshot()
+        finally:
+            self._log.close()
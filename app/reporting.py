@@ -1,9 +1,33 @@
 # app/reporting.py
-from typing import Dict, Any
+import csv
+import json
+import sys
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, Optional, TextIO, Tuple
 from .repository import InMemoryRepository
-from .grading import compute_gpa
 from .utils import EntityNotFoundError
 
+# What iter_student_reports does with students whose report cannot be
+# generated (no enrollments, missing grades):
+#   "skip"     - leave them out
+#   "annotate" - yield a partial report with "gpa": None and an "error"
+INCOMPLETE_SKIP = "skip"
+INCOMPLETE_ANNOTATE = "annotate"
+
+CSV_FIELDS = [
+    "student_id",
+    "student_name",
+    "year",
+    "gpa",
+    "course_code",
+    "title",
+    "credits",
+    "score",
+    "grade",
+    "passed",
+    "error",
+]
+
 
 def generate_student_report(
     repo: InMemoryRepository,
@@ -11,7 +35,8 @@ def generate_student_report(
 ) -> Dict[str, Any]:
     """
     Generate a report for a student with enrolled courses, scores, grades, GPA.
-    Integration point: repository + grading.
+    Integration point: repository + grading. The GPA is the repository's
+    get_gpa, kept in step as grades change through the repository.
     """
     student = repo.get_student(student_id)
     enrollments = repo.list_enrollments_for_student(student_id)
@@ -19,8 +44,6 @@ def generate_student_report(
         raise EntityNotFoundError("Student has no enrollments.")
 
     courses = []
-    grades = []
-    credits = []
     for enrollment in enrollments:
         course = repo.get_course(enrollment.course_code)
         courses.append(
@@ -35,10 +58,8 @@ def generate_student_report(
         )
         if enrollment.grade is None:
             raise ValueError("Cannot generate report: missing grade.")
-        grades.append(enrollment.grade)
-        credits.append(course.credits)
 
-    gpa = compute_gpa(grades, credits)
+    gpa = repo.get_gpa(student_id)
 
     return {
         "student_id": student.student_id,
@@ -47,3 +68,205 @@ def generate_student_report(
         "courses": courses,
         "gpa": gpa,
     }
+
+
+def _approx_size(obj: Any) -> int:
+    """
+    Rough deep size in bytes of a report (dicts, lists and scalars).
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_approx_size(k) + _approx_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_approx_size(item) for item in obj)
+    return size
+
+
+class ReportCache:
+    """
+    LRU cache of student reports for one repository, bounded both by number
+    of entries and by approximate memory. The repository tells the cache
+    whenever a student's enrollments change, and exactly that student's
+    report is dropped.
+
+    Cached reports are shared between callers and must not be modified.
+    """
+
+    def __init__(
+        self,
+        repo: InMemoryRepository,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.repo = repo
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._reports: "OrderedDict[str, Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        repo.add_change_listener(self.invalidate)
+
+    def get_report(self, student_id: str) -> Dict[str, Any]:
+        """
+        Same result (and errors) as generate_student_report, served from the
+        cache when the student has not changed since it was generated.
+        """
+        entry = self._reports.get(student_id)
+        if entry is not None:
+            self._reports.move_to_end(student_id)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        report = generate_student_report(self.repo, student_id)
+        self._store(student_id, report)
+        return report
+
+    def _store(self, student_id: str, report: Dict[str, Any]) -> None:
+        size = _approx_size(report)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return  # would evict everything else and still not fit
+        self._reports[student_id] = (report, size)
+        self.current_bytes += size
+        while (
+            len(self._reports) > self.max_entries
+            or self.current_bytes > self.max_bytes
+        ):
+            _, (_, evicted_size) = self._reports.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+    def invalidate(self, student_id: str) -> None:
+        entry = self._reports.pop(student_id, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def clear(self) -> None:
+        self._reports.clear()
+        self.current_bytes = 0
+
+    def close(self) -> None:
+        """Stop listening to the repository and drop all entries."""
+        self.repo.remove_change_listener(self.invalidate)
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._reports)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._reports),
+            "bytes": self.current_bytes,
+        }
+
+
+def _partial_report(
+    repo: InMemoryRepository,
+    student_id: str,
+    error: str,
+) -> Dict[str, Any]:
+    student = repo.get_student(student_id)
+    courses = []
+    for enrollment in repo.list_enrollments_for_student(student_id):
+        course = repo.get_course(enrollment.course_code)
+        courses.append(
+            {
+                "course_code": course.course_code,
+                "title": course.title,
+                "credits": course.credits,
+                "score": enrollment.score,
+                "grade": enrollment.grade,
+                "passed": enrollment.passed,
+            }
+        )
+    return {
+        "student_id": student.student_id,
+        "student_name": student.name,
+        "year": student.year,
+        "courses": courses,
+        "gpa": None,
+        "error": error,
+    }
+
+
+def iter_student_reports(
+    repo: InMemoryRepository,
+    resume_after: Optional[str] = None,
+    on_incomplete: str = INCOMPLETE_SKIP,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield the report of every student, in repository order, so a
+    whole institution can be exported with one report in memory at a time.
+
+    `resume_after` continues an interrupted export: students up to and
+    including that ID are skipped. Students whose report cannot be
+    generated are skipped or annotated according to `on_incomplete`.
+    """
+    if on_incomplete not in (INCOMPLETE_SKIP, INCOMPLETE_ANNOTATE):
+        raise ValueError(f"Unknown on_incomplete policy {on_incomplete!r}")
+    if resume_after is not None:
+        repo.get_student(resume_after)  # raises if unknown
+
+    skipping = resume_after is not None
+    for student in repo.iter_students():
+        if skipping:
+            skipping = student.student_id != resume_after
+            continue
+        try:
+            yield generate_student_report(repo, student.student_id)
+        except (EntityNotFoundError, ValueError) as exc:
+            if on_incomplete == INCOMPLETE_ANNOTATE:
+                yield _partial_report(repo, student.student_id, str(exc))
+
+
+def export_reports_jsonl(
+    repo: InMemoryRepository,
+    out: TextIO,
+    resume_after: Optional[str] = None,
+    on_incomplete: str = INCOMPLETE_SKIP,
+) -> int:
+    """
+    Write one JSON report per line to `out`; returns the number written.
+    """
+    count = 0
+    for report in iter_student_reports(repo, resume_after, on_incomplete):
+        out.write(json.dumps(report))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def export_reports_csv(
+    repo: InMemoryRepository,
+    out: TextIO,
+    resume_after: Optional[str] = None,
+    on_incomplete: str = INCOMPLETE_SKIP,
+    write_header: bool = True,
+) -> int:
+    """
+    Write reports to `out` as CSV, one row per (student, course); a student
+    without courses gets a single row with empty course columns. Pass
+    write_header=False when appending to a resumed export. Returns the
+    number of reports written.
+    """
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+    if write_header:
+        writer.writeheader()
+    count = 0
+    for report in iter_student_reports(repo, resume_after, on_incomplete):
+        student_columns = {
+            "student_id": report["student_id"],
+            "student_name": report["student_name"],
+            "year": report["year"],
+            "gpa": report["gpa"],
+            "error": report.get("error", ""),
+        }
+        for course in report["courses"] or [{}]:
+            writer.writerow({**student_columns, **course})
+        count += 1
+    return count
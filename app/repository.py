@@ -1,19 +1,84 @@
 # app/repository.py
-from typing import Dict, List
+import numbers
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from .models import Student, Course, Enrollment
-from .utils import EntityNotFoundError, DuplicateEntityError
+from .grading import GRADE_POINTS
+from .utils import BusinessRuleViolationError, EntityNotFoundError, DuplicateEntityError
 
 
-class InMemoryRepository:
+def score_update_error(score: Any, grade: Any, passed: Any) -> Optional[Exception]:
+    """
+    The error a (score, grade, passed) update of an existing enrollment
+    would fail with, or None. Types are checked too, so a batch can be
+    validated in full before any of it is applied.
+    """
+    if not isinstance(score, numbers.Real):
+        return TypeError(f"Score must be a number, not {type(score).__name__}.")
+    if score < 0 or score > 100:
+        return ValueError("Score must be between 0 and 100.")
+    if not isinstance(grade, str) or grade not in GRADE_POINTS:
+        return ValueError(f"Unknown grade {grade}")
+    if passed not in (True, False):
+        return TypeError(f"passed must be a bool, not {type(passed).__name__}.")
+    return None
+
+
+def _snapshot(enrollment: Enrollment) -> Enrollment:
+    return Enrollment(
+        enrollment.student_id,
+        enrollment.course_code,
+        enrollment.score,
+        enrollment.grade,
+        enrollment.passed,
+    )
+
+
+class ChangeNotifier:
+    """
+    Change listeners shared by the repositories, so caches such as
+    ReportCache can drop what a change makes stale.
+    """
+
+    def __init__(self) -> None:
+        # called with a student_id whenever that student's enrollments change
+        self._change_listeners: List[Callable[[str], None]] = []
+
+    def add_change_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Register `listener(student_id)`, called after a change made through
+        the repository to one of the student's enrollments.
+        """
+        self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: Callable[[str], None]) -> None:
+        self._change_listeners.remove(listener)
+
+    def _notify_change(self, student_id: str) -> None:
+        for listener in self._change_listeners:
+            listener(student_id)
+
+
+class InMemoryRepository(ChangeNotifier):
     """
     Simple in-memory 'database' for the course management system.
+    Enrollments are copied in and handed out as snapshots, so they only
+    change through the repository and the GPA totals stay in step.
     """
 
     def __init__(self) -> None:
+        super().__init__()
         self._students: Dict[str, Student] = {}
         self._courses: Dict[str, Course] = {}
         # key is (student_id, course_code)
         self._enrollments: Dict[tuple[str, str], Enrollment] = {}
+        # secondary indexes, maintained on insert
+        self._enrollments_by_student: Dict[str, List[Enrollment]] = {}
+        self._enrollments_by_course: Dict[str, List[Enrollment]] = {}
+        self._course_counts: Dict[str, int] = {}
+        # running GPA totals over each student's graded enrollments,
+        # maintained by update_grade
+        self._grade_points: Dict[str, int] = {}
+        self._graded_credits: Dict[str, int] = {}
 
     # ---- students ----
     def add_student(self, student: Student) -> None:
@@ -21,6 +86,18 @@ class InMemoryRepository:
             raise DuplicateEntityError(f"Student {student.student_id} already exists.")
         self._students[student.student_id] = student
 
+    def add_students(self, students: Iterable[Student]) -> None:
+        """
+        Insert many students; if any of them already exists (or appears
+        twice in the batch), none is inserted.
+        """
+        batch: Dict[str, Student] = {}
+        for student in students:
+            if student.student_id in self._students or student.student_id in batch:
+                raise DuplicateEntityError(f"Student {student.student_id} already exists.")
+            batch[student.student_id] = student
+        self._students.update(batch)
+
     def get_student(self, student_id: str) -> Student:
         try:
             return self._students[student_id]
@@ -30,12 +107,30 @@ class InMemoryRepository:
     def list_students(self) -> List[Student]:
         return list(self._students.values())
 
+    def iter_students(self) -> Iterator[Student]:
+        """
+        Students in insertion order, without copying them into a list.
+        Students must not be added while iterating.
+        """
+        return iter(self._students.values())
+
     # ---- courses ----
     def add_course(self, course: Course) -> None:
         if course.course_code in self._courses:
             raise DuplicateEntityError(f"Course {course.course_code} already exists.")
         self._courses[course.course_code] = course
 
+    def add_courses(self, courses: Iterable[Course]) -> None:
+        """
+        Insert many courses; all or nothing.
+        """
+        batch: Dict[str, Course] = {}
+        for course in courses:
+            if course.course_code in self._courses or course.course_code in batch:
+                raise DuplicateEntityError(f"Course {course.course_code} already exists.")
+            batch[course.course_code] = course
+        self._courses.update(batch)
+
     def get_course(self, course_code: str) -> Course:
         try:
             return self._courses[course_code]
@@ -53,9 +148,142 @@ class InMemoryRepository:
         # ensure foreign keys exist
         self.get_student(enrollment.student_id)
         self.get_course(enrollment.course_code)
+        if enrollment.grade is not None and enrollment.grade not in GRADE_POINTS:
+            raise ValueError(f"Unknown grade {enrollment.grade}")
+        enrollment = _snapshot(enrollment)
         self._enrollments[key] = enrollment
+        self._enrollments_by_student.setdefault(enrollment.student_id, []).append(
+            enrollment
+        )
+        self._enrollments_by_course.setdefault(enrollment.course_code, []).append(
+            enrollment
+        )
+        self._course_counts[enrollment.course_code] = (
+            self._course_counts.get(enrollment.course_code, 0) + 1
+        )
+        if enrollment.grade is not None:
+            self._count_grade(enrollment)
+        self._notify_change(enrollment.student_id)
+
+    def _count_grade(self, enrollment: Enrollment) -> None:
+        # a new enrollment arriving with a grade already set
+        credits = self._courses[enrollment.course_code].credits
+        student_id = enrollment.student_id
+        self._grade_points[student_id] = (
+            self._grade_points.get(student_id, 0) + GRADE_POINTS[enrollment.grade] * credits
+        )
+        self._graded_credits[student_id] = self._graded_credits.get(student_id, 0) + credits
+
+    def add_enrollments(self, enrollments: Iterable[Enrollment]) -> None:
+        """
+        Insert many enrollments; all or nothing. The whole batch is checked
+        first, with the errors add_enrollment would raise, then inserted
+        straight into the indexes. Capacity is not checked, as for
+        add_enrollment.
+        """
+        enrollments = list(enrollments)
+        existing, students, courses = self._enrollments, self._students, self._courses
+        batch: Dict[tuple[str, str], Enrollment] = {}
+        for enrollment in enrollments:
+            key = (enrollment.student_id, enrollment.course_code)
+            if key in existing or key in batch:
+                raise DuplicateEntityError(f"Enrollment {key} already exists.")
+            batch[key] = enrollment
+            if key[0] not in students:
+                raise EntityNotFoundError(f"Student {key[0]} not found.")
+            if key[1] not in courses:
+                raise EntityNotFoundError(f"Course {key[1]} not found.")
+            if enrollment.grade is not None and enrollment.grade not in GRADE_POINTS:
+                raise ValueError(f"Unknown grade {enrollment.grade}")
+        self._insert_enrollments(enrollments)
+
+    def add_enrollment_within_capacity(self, enrollment: Enrollment) -> None:
+        """
+        Insert the enrollment unless its course is already full. Checks run in
+        order course, capacity, student, duplicate. ConcurrentRepository makes
+        the check and the insert one atomic step.
+        """
+        course = self.get_course(enrollment.course_code)
+        if course.is_full(self.count_enrollments_for_course(enrollment.course_code)):
+            raise BusinessRuleViolationError("Course is full.")
+        self.get_student(enrollment.student_id)
+        self.add_enrollment(enrollment)
+
+    def add_enrollments_within_capacity(
+        self,
+        enrollments: Iterable[Enrollment],
+    ) -> List[Tuple[int, Exception]]:
+        """
+        Insert many enrollments in order, each as add_enrollment_within_capacity
+        would, so capacity is first come, first served. An enrollment that
+        would fail is skipped; returns (position, error) for each of those.
+        """
+        accepted, errors = self._check_enrollments_within_capacity(enrollments)
+        self._insert_enrollments(accepted)
+        return errors
+
+    def _check_enrollments_within_capacity(
+        self,
+        enrollments: Iterable[Enrollment],
+    ) -> Tuple[List[Enrollment], List[Tuple[int, Exception]]]:
+        # the enrollments add_enrollments_within_capacity would insert, and
+        # (position, error) of the others; changes nothing
+        accepted: List[Enrollment] = []
+        errors: List[Tuple[int, Exception]] = []
+        existing, students, courses = self._enrollments, self._students, self._courses
+        counts = self._course_counts
+        # seats taken by the accepted enrollments, on top of counts
+        taken: Dict[str, int] = {}
+        batch: Set[tuple[str, str]] = set()
+        for index, enrollment in enumerate(enrollments):
+            student_id, course_code = enrollment.student_id, enrollment.course_code
+            key = (student_id, course_code)
+            course = courses.get(course_code)
+            if course is None:
+                error: Exception = EntityNotFoundError(f"Course {course_code} not found.")
+            elif course.is_full(taken.get(course_code, counts.get(course_code, 0))):
+                error = BusinessRuleViolationError("Course is full.")
+            elif student_id not in students:
+                error = EntityNotFoundError(f"Student {student_id} not found.")
+            elif key in existing or key in batch:
+                error = DuplicateEntityError(f"Enrollment {key} already exists.")
+            elif enrollment.grade is not None and enrollment.grade not in GRADE_POINTS:
+                error = ValueError(f"Unknown grade {enrollment.grade}")
+            else:
+                batch.add(key)
+                taken[course_code] = taken.get(course_code, counts.get(course_code, 0)) + 1
+                accepted.append(enrollment)
+                continue
+            errors.append((index, error))
+        return accepted, errors
+
+    def _insert_enrollments(self, enrollments: List[Enrollment]) -> None:
+        # straight into the indexes; the caller has checked every enrollment
+        existing = self._enrollments
+        by_student = self._enrollments_by_student
+        by_course = self._enrollments_by_course
+        counts = self._course_counts
+        changed: Dict[str, None] = {}
+        try:
+            for enrollment in enrollments:
+                enrollment = _snapshot(enrollment)
+                student_id, course_code = enrollment.student_id, enrollment.course_code
+                existing[(student_id, course_code)] = enrollment
+                by_student.setdefault(student_id, []).append(enrollment)
+                by_course.setdefault(course_code, []).append(enrollment)
+                counts[course_code] = counts.get(course_code, 0) + 1
+                if enrollment.grade is not None:
+                    self._count_grade(enrollment)
+                changed[student_id] = None
+        finally:
+            for student_id in changed:
+                self._notify_change(student_id)
 
     def get_enrollment(self, student_id: str, course_code: str) -> Enrollment:
+        return _snapshot(self._get_enrollment(student_id, course_code))
+
+    def _get_enrollment(self, student_id: str, course_code: str) -> Enrollment:
+        # the stored enrollment itself, for the repository's own updates
         key = (student_id, course_code)
         try:
             return self._enrollments[key]
@@ -63,14 +291,117 @@ class InMemoryRepository:
             raise EntityNotFoundError(f"Enrollment {key} not found.")
 
     def list_enrollments_for_student(self, student_id: str) -> List[Enrollment]:
-        return [
-            e for (sid, _), e in self._enrollments.items() if sid == student_id
-        ]
+        return [_snapshot(e) for e in self._enrollments_by_student.get(student_id, ())]
 
     def list_enrollments_for_course(self, course_code: str) -> List[Enrollment]:
-        return [
-            e for (_, cid), e in self._enrollments.items() if cid == course_code
-        ]
+        return [_snapshot(e) for e in self._enrollments_by_course.get(course_code, ())]
 
     def count_enrollments_for_course(self, course_code: str) -> int:
-        return len(self.list_enrollments_for_course(course_code))
+        return self._course_counts.get(course_code, 0)
+
+    def update_score(self, student_id: str, course_code: str, score: float) -> Enrollment:
+        enrollment = self._get_enrollment(student_id, course_code)
+        enrollment.update_score(score)
+        self._notify_change(student_id)
+        return _snapshot(enrollment)
+
+    def update_grade(
+        self,
+        student_id: str,
+        course_code: str,
+        grade: str,
+        passed: bool,
+    ) -> Enrollment:
+        """
+        Set an enrollment's grade and keep the student's GPA totals in step.
+        """
+        if grade not in GRADE_POINTS:
+            raise ValueError(f"Unknown grade {grade}")
+        enrollment = self._get_enrollment(student_id, course_code)
+        self._regrade(enrollment, grade, passed)
+        self._notify_change(student_id)
+        return _snapshot(enrollment)
+
+    def _regrade(self, enrollment: Enrollment, grade: str, passed: bool) -> None:
+        student_id = enrollment.student_id
+        credits = self._courses[enrollment.course_code].credits
+        points = self._grade_points.get(student_id, 0)
+        graded = self._graded_credits.get(student_id, 0)
+        if enrollment.grade in GRADE_POINTS:
+            # re-grade: take the old grade out of the totals first
+            points -= GRADE_POINTS[enrollment.grade] * credits
+            graded -= credits
+        enrollment.update_grade(grade, passed)
+        self._grade_points[student_id] = points + GRADE_POINTS[grade] * credits
+        self._graded_credits[student_id] = graded + credits
+
+    def update_scores_and_grades(
+        self,
+        updates: Iterable[Tuple[str, str, float, str, bool]],
+    ) -> List[Tuple[int, Exception]]:
+        """
+        Apply many (student_id, course_code, score, grade, passed) updates in
+        order, each as update_score followed by update_grade. An update that
+        would fail is skipped; returns (position, error) for each of those.
+        Every update is checked before the first one is applied.
+        """
+        valid, errors = self._check_score_updates(updates)
+        self._apply_score_updates(valid)
+        return errors
+
+    def _check_score_updates(
+        self,
+        updates: Iterable[Tuple[str, str, float, str, bool]],
+    ) -> Tuple[List[Tuple[Enrollment, float, str, bool]], List[Tuple[int, Exception]]]:
+        # (enrollment, score, grade, passed) of the updates that would
+        # succeed, and (position, error) of the others; changes nothing
+        valid: List[Tuple[Enrollment, float, str, bool]] = []
+        errors: List[Tuple[int, Exception]] = []
+        enrollments = self._enrollments
+        for index, (student_id, course_code, score, grade, passed) in enumerate(updates):
+            enrollment = enrollments.get((student_id, course_code))
+            if enrollment is None:
+                error: Optional[Exception] = EntityNotFoundError(
+                    f"Enrollment {(student_id, course_code)} not found."
+                )
+            else:
+                error = score_update_error(score, grade, passed)
+            if error is None:
+                valid.append((enrollment, score, grade, passed))
+            else:
+                errors.append((index, error))
+        return valid, errors
+
+    def _apply_score_updates(self, valid: List[Tuple[Enrollment, float, str, bool]]) -> None:
+        changed: Dict[str, None] = {}
+        courses = self._courses
+        grade_points, graded_credits = self._grade_points, self._graded_credits
+        try:
+            for enrollment, score, grade, passed in valid:
+                # _regrade, inlined for the batch
+                student_id = enrollment.student_id
+                credits = courses[enrollment.course_code].credits
+                points = grade_points.get(student_id, 0) + GRADE_POINTS[grade] * credits
+                graded = graded_credits.get(student_id, 0) + credits
+                if enrollment.grade in GRADE_POINTS:
+                    points -= GRADE_POINTS[enrollment.grade] * credits
+                    graded -= credits
+                grade_points[student_id] = points
+                graded_credits[student_id] = graded
+                enrollment.score = score
+                enrollment.grade = grade
+                enrollment.passed = passed
+                changed[student_id] = None
+        finally:
+            for student_id in changed:
+                self._notify_change(student_id)
+
+    # ---- aggregates ----
+    def get_gpa(self, student_id: str) -> float:
+        """
+        GPA over the student's graded enrollments, in O(1); 0.0 if none.
+        """
+        graded = self._graded_credits.get(student_id, 0)
+        if not graded:
+            return 0.0
+        return self._grade_points[student_id] / graded
@@ -0,0 +1,298 @@
+# app/repository_image.py
+"""
+Binary repository image: a CompactRepository written out as fixed-width
+columns, so it can be opened through mmap instead of rebuilt with millions
+of add_* calls.
+
+Layout (native byte order, recorded in the header):
+    header       magic, byte-order marker, entity counts, section table
+    sections     one per column, each 8-byte aligned
+
+Strings live in one interned table (offsets + UTF-8 data) ordered student
+ids, student names, course codes, course titles, so a handle doubles as a
+string index. Student ids also get a prebuilt open-addressing hash index
+(crc32, linear probing), so looking up a student never builds a dict.
+"""
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from typing import Dict, List, Optional
+from .compact_repository import CompactRepository
+from .models import Course
+
+IMAGE_MAGIC = b"CMSIMG01"
+_BYTE_ORDER_MARK = 0x01020304
+_EMPTY_SLOT = -1
+
+# columns copied verbatim between a CompactRepository and the image
+_COLUMNS = (
+    ("_student_years", "h"),
+    ("_student_first", "i"),
+    ("_student_last", "i"),
+    ("_grade_points", "q"),
+    ("_graded_credits", "q"),
+    ("_course_first", "i"),
+    ("_course_last", "i"),
+    ("_course_counts", "i"),
+    ("_row_student", "i"),
+    ("_row_course", "i"),
+    ("_scores", "d"),
+    ("_grades", "b"),
+    ("_passed", "b"),
+    ("_next_by_student", "i"),
+    ("_next_by_course", "i"),
+)
+_SECTIONS = _COLUMNS + (
+    ("string_offsets", "q"),
+    ("string_data", "B"),
+    ("student_index", "i"),
+    ("course_credits", "i"),
+    ("course_capacity", "i"),
+)
+# magic, byte-order mark, students, courses, enrollments, index slots
+_HEADER = struct.Struct("=8sIqqqq")
+_SECTION_ENTRY = struct.Struct("=qq")
+_HEADER_SIZE = _HEADER.size + _SECTION_ENTRY.size * len(_SECTIONS)
+
+
+def _index_slots(count: int) -> int:
+    # power of two, at most half full
+    slots = 8
+    while slots < 2 * count:
+        slots *= 2
+    return slots
+
+
+def _build_index(keys: List[bytes]) -> array:
+    mask = _index_slots(len(keys)) - 1
+    slots = array("i", [_EMPTY_SLOT]) * (mask + 1)
+    for handle, key in enumerate(keys):
+        slot = zlib.crc32(key) & mask
+        while slots[slot] != _EMPTY_SLOT:
+            slot = (slot + 1) & mask
+        slots[slot] = handle
+    return slots
+
+
+def write_image(repo: CompactRepository, path: str) -> None:
+    """
+    Write `repo` (a CompactRepository, MappedRepository included) as an
+    image to a temporary file and atomically replace `path`.
+    """
+    students = len(repo._student_ids)
+    courses = repo._courses
+    strings = [s.encode() for s in repo._student_ids]
+    student_keys = list(strings)
+    strings += [s.encode() for s in repo._student_names]
+    strings += [c.course_code.encode() for c in courses]
+    strings += [c.title.encode() for c in courses]
+    offsets = array("q", [0])
+    total = 0
+    for s in strings:
+        total += len(s)
+        offsets.append(total)
+
+    payloads = [array(typecode, getattr(repo, name)).tobytes() for name, typecode in _COLUMNS]
+    payloads += [
+        offsets.tobytes(),
+        b"".join(strings),
+        _build_index(student_keys).tobytes(),
+        array("i", [c.credits for c in courses]).tobytes(),
+        array("i", [c.max_capacity for c in courses]).tobytes(),
+    ]
+
+    table = []
+    offset = _HEADER_SIZE
+    for payload in payloads:
+        offset += -offset % 8
+        table.append((offset, len(payload)))
+        offset += len(payload)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(IMAGE_MAGIC, _BYTE_ORDER_MARK, students, len(courses),
+                             len(repo._row_student), _index_slots(students)))
+        for entry in table:
+            f.write(_SECTION_ENTRY.pack(*entry))
+        for (start, _), payload in zip(table, payloads):
+            f.write(b"\0" * (start - f.tell()))
+            f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class _Column:
+    """
+    A column of the image followed by an in-memory delta for rows added
+    after opening. Writes to image rows land in copy-on-write pages.
+    """
+
+    __slots__ = ("_base", "_base_len", "_delta")
+
+    def __init__(self, base: memoryview, typecode: str) -> None:
+        self._base = base
+        self._base_len = len(base)
+        self._delta = array(typecode)
+
+    def __len__(self) -> int:
+        return self._base_len + len(self._delta)
+
+    def __getitem__(self, i: int):
+        if i < self._base_len:
+            return self._base[i]
+        return self._delta[i - self._base_len]
+
+    def __setitem__(self, i: int, value) -> None:
+        if i < self._base_len:
+            self._base[i] = value
+        else:
+            self._delta[i - self._base_len] = value
+
+    def __iter__(self):
+        yield from self._base
+        yield from self._delta
+
+    def append(self, value) -> None:
+        self._delta.append(value)
+
+
+class _StringColumn:
+    """Strings [first, first + count) of the image's table, plus a delta."""
+
+    def __init__(self, image: "MappedRepository", first: int, count: int) -> None:
+        self._image = image
+        self._first = first
+        self._count = count
+        self._delta: List[str] = []
+
+    def __len__(self) -> int:
+        return self._count + len(self._delta)
+
+    def __getitem__(self, i: int) -> str:
+        if i < self._count:
+            return self._image._string(self._first + i)
+        return self._delta[i - self._count]
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def append(self, value: str) -> None:
+        self._delta.append(value)
+
+
+class _StudentIndex:
+    """student_id -> handle: the image's hash index, plus a delta dict."""
+
+    def __init__(self, image: "MappedRepository", slots: memoryview) -> None:
+        self._image = image
+        self._slots = slots
+        self._mask = len(slots) - 1
+        self._delta: Dict[str, int] = {}
+
+    def get(self, student_id: str, default: Optional[int] = None) -> Optional[int]:
+        handle = self._delta.get(student_id)
+        if handle is not None:
+            return handle
+        key = student_id.encode()
+        slots = self._slots
+        slot = zlib.crc32(key) & self._mask
+        while slots[slot] != _EMPTY_SLOT:
+            if self._image._string_bytes(slots[slot]) == key:
+                return slots[slot]
+            slot = (slot + 1) & self._mask
+        return default
+
+    def __getitem__(self, student_id: str) -> int:
+        handle = self.get(student_id)
+        if handle is None:
+            raise KeyError(student_id)
+        return handle
+
+    def __contains__(self, student_id: str) -> bool:
+        return self.get(student_id) is not None
+
+    def __setitem__(self, student_id: str, handle: int) -> None:
+        self._delta[student_id] = handle
+
+
+class MappedRepository(CompactRepository):
+    """
+    CompactRepository opened from an image through mmap.
+
+    Opening maps the file and builds only the (small) course table, so
+    startup time does not grow with the number of students or enrollments,
+    and processes opening the same image share its page-cache pages. The
+    mapping is copy-on-write: updates to existing rows change private
+    copies of the touched pages, and new students, courses and enrollments
+    go to an in-memory delta. Nothing is written back to the image; call
+    write_image to save the current state.
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        with open(path, "rb") as f:
+            # an empty file cannot be mapped, and a shorter one has no header
+            if os.fstat(f.fileno()).st_size < _HEADER_SIZE:
+                raise ValueError(f"{path} is not a repository image")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, mark, students, courses, _, _ = _HEADER.unpack_from(self._mmap, 0)
+        if magic != IMAGE_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a repository image")
+        if mark != _BYTE_ORDER_MARK:
+            self._mmap.close()
+            raise ValueError(f"{path} was written on a machine with another byte order")
+
+        buffer = memoryview(self._mmap)
+        self._views = [buffer]
+        sections = {}
+        starts = {}
+        for i, (name, typecode) in enumerate(_SECTIONS):
+            start, length = _SECTION_ENTRY.unpack_from(
+                self._mmap, _HEADER.size + i * _SECTION_ENTRY.size
+            )
+            if start + length > len(self._mmap):
+                self.close()
+                raise ValueError(f"{path} is truncated")
+            view = buffer[start:start + length].cast(typecode)
+            self._views.append(view)
+            sections[name] = view
+            starts[name] = start
+        for name, typecode in _COLUMNS:
+            setattr(self, name, _Column(sections[name], typecode))
+
+        self._string_offsets = sections["string_offsets"]
+        self._string_start = starts["string_data"]
+        self._student_ids = _StringColumn(self, 0, students)
+        self._student_names = _StringColumn(self, students, students)
+        self._student_handles = _StudentIndex(self, sections["student_index"])
+        codes = 2 * students
+        titles = codes + courses
+        self._courses = [
+            Course(
+                course_code=self._string(codes + c),
+                title=self._string(titles + c),
+                credits=sections["course_credits"][c],
+                max_capacity=sections["course_capacity"][c],
+            )
+            for c in range(courses)
+        ]
+        self._course_handles = {c.course_code: h for h, c in enumerate(self._courses)}
+
+    def _string_bytes(self, i: int) -> bytes:
+        start = self._string_start
+        return self._mmap[start + self._string_offsets[i]:start + self._string_offsets[i + 1]]
+
+    def _string(self, i: int) -> str:
+        return self._string_bytes(i).decode()
+
+    def close(self) -> None:
+        """Unmap the image; the repository cannot be used afterwards."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
@@ -0,0 +1,487 @@
+# app/sharded_repository.py
+"""
+Repository sharded across worker processes by student ID.
+
+Each shard process owns an InMemoryRepository holding a hash partition of
+the students (crc32 of the ID, so every process agrees) and all of their
+enrollments. Courses are replicated to every shard and to the facade. The
+facade keeps the authoritative per-course enrollment counts, so capacity
+checks see enrollments from every shard.
+
+Shards are driven over multiprocessing pipes with (method, args) requests
+answered by ("ok", result) or ("error", exception).
+"""
+import contextlib
+import multiprocessing
+import threading
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from .models import Student, Course, Enrollment
+from .repository import ChangeNotifier, InMemoryRepository
+from .reporting import generate_student_report
+from .utils import BusinessRuleViolationError, DuplicateEntityError, EntityNotFoundError
+
+_STOP = "__stop__"
+
+
+def _shard_reports(repo: InMemoryRepository, student_ids: List[str]) -> List[Tuple[str, Any]]:
+    # (status, report or exception) per student, so one bad student does
+    # not fail the whole batch
+    results = []
+    for student_id in student_ids:
+        try:
+            results.append(("ok", generate_student_report(repo, student_id)))
+        except (EntityNotFoundError, ValueError) as exc:
+            results.append(("error", exc))
+    return results
+
+
+def _remove_courses(repo: InMemoryRepository, course_codes: List[str]) -> None:
+    # undoes add_courses on a shard when another shard refused the batch;
+    # the courses are new, so nothing refers to them yet
+    for course_code in course_codes:
+        repo._courses.pop(course_code, None)
+
+
+# requests a shard handles besides InMemoryRepository's own methods
+_SHARD_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "report": generate_student_report,
+    "reports": _shard_reports,
+    "remove_courses": _remove_courses,
+}
+
+
+def _serve_shard(conn: Any) -> None:
+    """Shard process main loop."""
+    repo = InMemoryRepository()
+    while True:
+        method, args = conn.recv()
+        if method == _STOP:
+            conn.close()
+            return
+        try:
+            if method in _SHARD_FUNCTIONS:
+                result = _SHARD_FUNCTIONS[method](repo, *args)
+            else:
+                result = getattr(repo, method)(*args)
+        except Exception as exc:
+            conn.send(("error", exc))
+        else:
+            conn.send(("ok", result))
+
+
+class _Shard:
+    """Connection to one shard process; requests are one at a time."""
+
+    def __init__(self, context: Any) -> None:
+        self._conn, child = context.Pipe()
+        self._process = context.Process(target=_serve_shard, args=(child,), daemon=True)
+        self._process.start()
+        child.close()
+        self._lock = threading.Lock()
+
+    def send(self, method: str, *args: Any) -> None:
+        self._lock.acquire()
+        try:
+            # pickles the whole request before writing, so a request that
+            # does not pickle leaves the pipe untouched
+            self._conn.send((method, args))
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def receive(self) -> Any:
+        try:
+            status, result = self._conn.recv()
+        finally:
+            self._lock.release()
+        if status == "error":
+            raise result
+        return result
+
+    def call(self, method: str, *args: Any) -> Any:
+        self.send(method, *args)
+        return self.receive()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._conn.send((_STOP, ()))
+            self._conn.close()
+        self._process.join()
+
+
+def shard_of(student_id: str, shards: int) -> int:
+    return zlib.crc32(student_id.encode()) % shards
+
+
+class ShardedRepository(ChangeNotifier):
+    """
+    InMemoryRepository interface over `shards` worker processes.
+
+    Student reads and writes (get_student, list_enrollments_for_student,
+    update_score, update_grade, get_gpa, generate_student_report) go to the
+    student's shard. Course reads are answered by the facade; adding a
+    course sends it to every shard. add_enrollment_within_capacity checks
+    the facade's course count under a per-course lock, so Course.is_full
+    holds across shards. Batch calls (add_students, add_enrollments,
+    update_scores_and_grades, generate_student_reports) are split by shard
+    and run on all shards at once.
+
+    Enrollments are returned as snapshots (pickled copies). Listing
+    students or a course's enrollments keeps insertion order within a
+    shard, not across shards. Call close() to stop the shard processes.
+    """
+
+    def __init__(self, shards: int = 4, stripes: int = 64) -> None:
+        super().__init__()
+        if shards <= 0:
+            raise ValueError("shards must be positive")
+        context = multiprocessing.get_context()
+        self._shards = [_Shard(context) for _ in range(shards)]
+        self._courses: Dict[str, Course] = {}
+        self._course_counts: Dict[str, int] = {}
+        self._course_locks = [threading.Lock() for _ in range(stripes)]
+        self._catalog_lock = threading.Lock()
+
+    def close(self) -> None:
+        for shard in self._shards:
+            shard.stop()
+
+    def _shard(self, student_id: str) -> _Shard:
+        return self._shards[shard_of(student_id, len(self._shards))]
+
+    def _course_stripe(self, course_code: str) -> int:
+        return zlib.crc32(course_code.encode()) % len(self._course_locks)
+
+    def _course_lock(self, course_code: str) -> threading.Lock:
+        return self._course_locks[self._course_stripe(course_code)]
+
+    def _scatter_outcomes(self, method: str, batches: Dict[int, Any]) -> Dict[int, Tuple[str, Any]]:
+        """
+        Send `method(batch)` to every shard with a batch, then collect
+        ("ok", result) or ("error", exception) per shard; the shards work in
+        parallel. If a request cannot be sent, the shards after it are not
+        sent theirs either and report the same error. Every shard lock is
+        released on return.
+        """
+        # shard locks are held from send to receive, so always take them
+        # in index order
+        order = sorted(batches)
+        outcomes: Dict[int, Tuple[str, Any]] = {}
+        sent: List[int] = []
+        for index in order:
+            try:
+                self._shards[index].send(method, batches[index])
+            except Exception as exc:
+                for unsent in order[len(sent):]:
+                    outcomes[unsent] = ("error", exc)
+                break
+            sent.append(index)
+        for index in sent:
+            try:
+                outcomes[index] = ("ok", self._shards[index].receive())
+            except Exception as exc:
+                outcomes[index] = ("error", exc)
+        return outcomes
+
+    def _scatter(self, method: str, batches: Dict[int, Any]) -> Dict[int, Any]:
+        """
+        _scatter_outcomes, raising the error of the first failed shard once
+        every shard has answered.
+        """
+        outcomes = self._scatter_outcomes(method, batches)
+        for index in sorted(outcomes):
+            status, result = outcomes[index]
+            if status == "error":
+                raise result
+        return {index: result for index, (_, result) in outcomes.items()}
+
+    def _partition(self, items: Iterable[Any], student_id: Callable[[Any], str]) -> Dict[int, list]:
+        batches: Dict[int, list] = {}
+        for item in items:
+            batches.setdefault(shard_of(student_id(item), len(self._shards)), []).append(item)
+        return batches
+
+    # ---- students ----
+    def add_student(self, student: Student) -> None:
+        self._shard(student.student_id).call("add_student", student)
+
+    def add_students(self, students: Iterable[Student]) -> None:
+        """
+        Insert many students; each shard's part is all or nothing.
+        """
+        self._scatter("add_students", self._partition(students, lambda s: s.student_id))
+
+    def get_student(self, student_id: str) -> Student:
+        return self._shard(student_id).call("get_student", student_id)
+
+    def list_students(self) -> List[Student]:
+        return list(self.iter_students())
+
+    def iter_students(self) -> Iterator[Student]:
+        """
+        Students shard by shard, in insertion order within each shard.
+        """
+        for shard in self._shards:
+            yield from shard.call("list_students")
+
+    # ---- courses ----
+    def add_course(self, course: Course) -> None:
+        self.add_courses([course])
+
+    def add_courses(self, courses: Iterable[Course]) -> None:
+        """
+        Insert many courses on every shard; all or nothing. If a shard
+        refuses the batch, the shards that took it drop it again.
+        """
+        courses = list(courses)
+        with self._catalog_lock:
+            batch: Dict[str, Course] = {}
+            for course in courses:
+                if course.course_code in self._courses or course.course_code in batch:
+                    raise DuplicateEntityError(f"Course {course.course_code} already exists.")
+                batch[course.course_code] = course
+            outcomes = self._scatter_outcomes(
+                "add_courses", {i: courses for i in range(len(self._shards))}
+            )
+            failed = [result for status, result in outcomes.values() if status == "error"]
+            if failed:
+                applied = [i for i, (status, _) in outcomes.items() if status == "ok"]
+                self._scatter("remove_courses", {i: list(batch) for i in applied})
+                raise failed[0]
+            self._courses.update(batch)
+
+    def get_course(self, course_code: str) -> Course:
+        try:
+            return self._courses[course_code]
+        except KeyError:
+            raise EntityNotFoundError(f"Course {course_code} not found.")
+
+    def list_courses(self) -> List[Course]:
+        return list(self._courses.values())
+
+    # ---- enrollments ----
+    def _count(self, course_code: str, added: int) -> None:
+        # caller holds the course's lock
+        self._course_counts[course_code] = self._course_counts.get(course_code, 0) + added
+
+    def add_enrollment(self, enrollment: Enrollment) -> None:
+        with self._course_lock(enrollment.course_code):
+            self._shard(enrollment.student_id).call("add_enrollment", enrollment)
+            self._count(enrollment.course_code, 1)
+        self._notify_change(enrollment.student_id)
+
+    def add_enrollments(self, enrollments: Iterable[Enrollment]) -> None:
+        """
+        Insert many enrollments; each shard's part is all or nothing.
+        Capacity is not checked, as for add_enrollment.
+        """
+        batches = self._partition(enrollments, lambda e: e.student_id)
+        # every shard answers (and frees its lock) before any course lock is
+        # taken, the order add_enrollment_within_capacity takes them in
+        outcomes = self._scatter_outcomes("add_enrollments", batches)
+        error: Optional[Exception] = None
+        for index in sorted(outcomes):
+            status, result = outcomes[index]
+            if status == "error":
+                if error is None:
+                    error = result
+                continue
+            batch = batches[index]
+            for enrollment in batch:
+                with self._course_lock(enrollment.course_code):
+                    self._count(enrollment.course_code, 1)
+            for student_id in dict.fromkeys(e.student_id for e in batch):
+                self._notify_change(student_id)
+        if error is not None:
+            raise error
+
+    def add_enrollment_within_capacity(self, enrollment: Enrollment) -> None:
+        """
+        Insert the enrollment unless its course is already full, counting
+        enrollments on every shard. Checks run in order course, capacity,
+        student, duplicate.
+        """
+        with self._course_lock(enrollment.course_code):
+            course = self.get_course(enrollment.course_code)
+            if course.is_full(self.count_enrollments_for_course(enrollment.course_code)):
+                raise BusinessRuleViolationError("Course is full.")
+            # the shard's own count is a part of ours, so its capacity
+            # check always passes; it checks student and duplicate
+            self._shard(enrollment.student_id).call("add_enrollment_within_capacity", enrollment)
+            self._count(enrollment.course_code, 1)
+        self._notify_change(enrollment.student_id)
+
+    def add_enrollments_within_capacity(
+        self,
+        enrollments: Iterable[Enrollment],
+    ) -> List[Tuple[int, Exception]]:
+        """
+        Insert many enrollments in order, each as add_enrollment_within_capacity
+        would, with every shard inserting its part at once. An enrollment
+        that would fail is skipped; returns (position, error) for each of
+        those, in input order.
+
+        Under the courses' locks the facade hands out seats first come,
+        first served, then the shards check student and duplicate. Seats
+        handed to enrollments a shard rejected are offered again, in order,
+        to the enrollments that were turned away for a full course.
+        """
+        enrollments = list(enrollments)
+        errors: Dict[int, Exception] = {}
+        changed: Dict[str, None] = {}
+        stripes = sorted({self._course_stripe(e.course_code) for e in enrollments})
+        with contextlib.ExitStack() as stack:
+            for stripe in stripes:
+                stack.enter_context(self._course_locks[stripe])
+            waiting = list(range(len(enrollments)))
+            while waiting:
+                granted: List[int] = []
+                turned_away: List[int] = []
+                taken: Dict[str, int] = {}
+                for index in waiting:
+                    course_code = enrollments[index].course_code
+                    course = self._courses.get(course_code)
+                    if course is None:
+                        errors[index] = EntityNotFoundError(f"Course {course_code} not found.")
+                        continue
+                    seats = taken.get(course_code, self.count_enrollments_for_course(course_code))
+                    if course.is_full(seats):
+                        turned_away.append(index)
+                        continue
+                    taken[course_code] = seats + 1
+                    granted.append(index)
+
+                positions = self._partition(granted, lambda index: enrollments[index].student_id)
+                outcomes = self._scatter_outcomes(
+                    "add_enrollments_within_capacity",
+                    {i: [enrollments[index] for index in part] for i, part in positions.items()},
+                )
+                rejected = 0
+                for i, (status, result) in outcomes.items():
+                    # a shard that failed as a whole inserted none of its part
+                    shard_errors = result if status == "ok" else [
+                        (local, result) for local in range(len(positions[i]))
+                    ]
+                    for local, error in shard_errors:
+                        errors[positions[i][local]] = error
+                        rejected += 1
+                for index in granted:
+                    if index not in errors:
+                        self._count(enrollments[index].course_code, 1)
+                        changed[enrollments[index].student_id] = None
+                if not rejected:
+                    # no seat was freed: whoever was turned away stays out
+                    for index in turned_away:
+                        errors[index] = BusinessRuleViolationError("Course is full.")
+                    break
+                waiting = turned_away
+        for student_id in changed:
+            self._notify_change(student_id)
+        return sorted(errors.items(), key=lambda item: item[0])
+
+    def get_enrollment(self, student_id: str, course_code: str) -> Enrollment:
+        return self._shard(student_id).call("get_enrollment", student_id, course_code)
+
+    def list_enrollments_for_student(self, student_id: str) -> List[Enrollment]:
+        return self._shard(student_id).call("list_enrollments_for_student", student_id)
+
+    def list_enrollments_for_course(self, course_code: str) -> List[Enrollment]:
+        """
+        The course's enrollments shard by shard, in insertion order within
+        each shard.
+        """
+        results = self._scatter(
+            "list_enrollments_for_course",
+            {i: course_code for i in range(len(self._shards))},
+        )
+        return [e for i in range(len(self._shards)) for e in results[i]]
+
+    def count_enrollments_for_course(self, course_code: str) -> int:
+        return self._course_counts.get(course_code, 0)
+
+    def update_score(self, student_id: str, course_code: str, score: float) -> Enrollment:
+        enrollment = self._shard(student_id).call("update_score", student_id, course_code, score)
+        self._notify_change(student_id)
+        return enrollment
+
+    def update_grade(
+        self,
+        student_id: str,
+        course_code: str,
+        grade: str,
+        passed: bool,
+    ) -> Enrollment:
+        enrollment = self._shard(student_id).call(
+            "update_grade", student_id, course_code, grade, passed
+        )
+        self._notify_change(student_id)
+        return enrollment
+
+    def update_scores_and_grades(
+        self,
+        updates: Iterable[Tuple[str, str, float, str, bool]],
+    ) -> List[Tuple[int, Exception]]:
+        """
+        Apply many (student_id, course_code, score, grade, passed) updates,
+        each shard its own part in parallel. Returns (position, error) for
+        every update that was skipped, in input order. If a shard fails as a
+        whole, the students the other shards updated are still notified
+        before its error is raised.
+        """
+        positions = self._partition(enumerate(updates), lambda item: item[1][0])
+        outcomes = self._scatter_outcomes(
+            "update_scores_and_grades",
+            {i: [update for _, update in part] for i, part in positions.items()},
+        )
+        errors: List[Tuple[int, Exception]] = []
+        changed: Dict[str, None] = {}
+        error: Optional[Exception] = None
+        for i in sorted(outcomes):
+            status, result = outcomes[i]
+            if status == "error":
+                if error is None:
+                    error = result
+                continue
+            failed = {local for local, _ in result}
+            errors.extend((positions[i][local][0], exc) for local, exc in result)
+            for local, (_, update) in enumerate(positions[i]):
+                if local not in failed:
+                    changed[update[0]] = None
+        for student_id in changed:
+            self._notify_change(student_id)
+        if error is not None:
+            raise error
+        return sorted(errors, key=lambda item: item[0])
+
+    # ---- aggregates ----
+    def get_gpa(self, student_id: str) -> float:
+        return self._shard(student_id).call("get_gpa", student_id)
+
+    # ---- reports ----
+    def generate_student_report(self, student_id: str) -> Dict[str, Any]:
+        """
+        Same result as reporting.generate_student_report, built on the
+        student's shard in one round trip.
+        """
+        return self._shard(student_id).call("report", student_id)
+
+    def generate_student_reports(self, student_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Reports for many students, in input order, built on all shards in
+        parallel. Raises the first student's error, like calling
+        generate_student_report in a loop.
+        """
+        student_ids = list(student_ids)
+        positions = self._partition(range(len(student_ids)), lambda i: student_ids[i])
+        results = self._scatter(
+            "reports", {i: [student_ids[p] for p in part] for i, part in positions.items()}
+        )
+        reports: List[Any] = [None] * len(student_ids)
+        for i, part in positions.items():
+            for position, result in zip(part, results[i]):
+                reports[position] = result
+        for status, result in reports:
+            if status == "error":
+                raise result
+        return [report for _, report in reports]
@@ -0,0 +1,390 @@
+# app/sqlite_repository.py
+import contextlib
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .models import Student, Course, Enrollment
+from .grading import GRADE_POINTS
+from .repository import ChangeNotifier, score_update_error
+from .utils import BusinessRuleViolationError, EntityNotFoundError, DuplicateEntityError
+
+# The enrollments primary key doubles as the (student_id) index: SQLite
+# uses the leftmost column of a composite index for lookups by student.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    student_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    year INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS courses (
+    course_code TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    credits INTEGER NOT NULL,
+    max_capacity INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS enrollments (
+    student_id TEXT NOT NULL REFERENCES students (student_id),
+    course_code TEXT NOT NULL REFERENCES courses (course_code),
+    score REAL,
+    grade TEXT,
+    passed INTEGER,
+    PRIMARY KEY (student_id, course_code)
+);
+CREATE INDEX IF NOT EXISTS enrollments_by_course ON enrollments (course_code);
+"""
+
+_ENROLLMENT_COLUMNS = "student_id, course_code, score, grade, passed"
+
+# grade -> points as an SQL expression, so get_gpa runs as one aggregate
+_GRADE_POINTS_SQL = "CASE e.grade {} END".format(
+    " ".join(f"WHEN '{grade}' THEN {points}" for grade, points in GRADE_POINTS.items())
+)
+
+
+def _enrollment_from_row(row: tuple) -> Enrollment:
+    student_id, course_code, score, grade, passed = row
+    return Enrollment(
+        student_id=student_id,
+        course_code=course_code,
+        score=score,
+        grade=grade,
+        passed=None if passed is None else bool(passed),
+    )
+
+
+def _violates(exc: sqlite3.IntegrityError, constraint: str) -> bool:
+    # sqlite3 names the failed constraint only in the message, e.g.
+    # "UNIQUE constraint failed: students.student_id" (primary keys included)
+    return str(exc).startswith(f"{constraint} constraint failed")
+
+
+class SQLiteRepository(ChangeNotifier):
+    """
+    Persistent drop-in replacement for InMemoryRepository on sqlite3.
+
+    Same methods, exceptions and (insertion) ordering, so enrollment.py and
+    reporting.py work on it unchanged. Enrollments are returned as
+    snapshots: change them through update_score / update_grade, never by
+    mutating a returned Enrollment.
+
+    File databases run in WAL mode. Every write is its own transaction
+    (BEGIN IMMEDIATE), so add_enrollment_within_capacity stays atomic even
+    with other connections writing to the same file. A connection may only
+    be used from the thread that created it.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        super().__init__()
+        self.path = path
+        # isolation_level=None: transactions are opened explicitly by _write
+        self._conn = sqlite3.connect(path, isolation_level=None, cached_statements=256)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @contextlib.contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    # ---- students ----
+    def add_student(self, student: Student) -> None:
+        self.add_students([student])
+
+    def add_students(self, students: Iterable[Student]) -> None:
+        """
+        Insert many students with one executemany in one transaction; if any
+        of them already exists, none is inserted.
+        """
+        try:
+            with self._write() as conn:
+                conn.executemany(
+                    "INSERT INTO students (student_id, name, year) VALUES (?, ?, ?)",
+                    ((s.student_id, s.name, s.year) for s in students),
+                )
+        except sqlite3.IntegrityError as exc:
+            if not _violates(exc, "UNIQUE"):
+                raise
+            raise DuplicateEntityError(f"Student already exists: {exc}")
+
+    def get_student(self, student_id: str) -> Student:
+        row = self._conn.execute(
+            "SELECT student_id, name, year FROM students WHERE student_id = ?",
+            (student_id,),
+        ).fetchone()
+        if row is None:
+            raise EntityNotFoundError(f"Student {student_id} not found.")
+        return Student(*row)
+
+    def list_students(self) -> List[Student]:
+        return list(self.iter_students())
+
+    def iter_students(self) -> Iterator[Student]:
+        """
+        Students in insertion order, streamed from a cursor.
+        """
+        cursor = self._conn.execute(
+            "SELECT student_id, name, year FROM students ORDER BY rowid"
+        )
+        for row in cursor:
+            yield Student(*row)
+
+    # ---- courses ----
+    def add_course(self, course: Course) -> None:
+        self.add_courses([course])
+
+    def add_courses(self, courses: Iterable[Course]) -> None:
+        """
+        Insert many courses in one transaction; all or nothing.
+        """
+        try:
+            with self._write() as conn:
+                conn.executemany(
+                    "INSERT INTO courses (course_code, title, credits, max_capacity)"
+                    " VALUES (?, ?, ?, ?)",
+                    ((c.course_code, c.title, c.credits, c.max_capacity) for c in courses),
+                )
+        except sqlite3.IntegrityError as exc:
+            if not _violates(exc, "UNIQUE"):
+                raise
+            raise DuplicateEntityError(f"Course already exists: {exc}")
+
+    def get_course(self, course_code: str) -> Course:
+        row = self._conn.execute(
+            "SELECT course_code, title, credits, max_capacity FROM courses"
+            " WHERE course_code = ?",
+            (course_code,),
+        ).fetchone()
+        if row is None:
+            raise EntityNotFoundError(f"Course {course_code} not found.")
+        return Course(*row)
+
+    def list_courses(self) -> List[Course]:
+        rows = self._conn.execute(
+            "SELECT course_code, title, credits, max_capacity FROM courses ORDER BY rowid"
+        )
+        return [Course(*row) for row in rows]
+
+    # ---- enrollments ----
+    def _insert_enrollment(self, conn: sqlite3.Connection, enrollment: Enrollment) -> None:
+        key = (enrollment.student_id, enrollment.course_code)
+        exists = conn.execute(
+            "SELECT 1 FROM enrollments WHERE student_id = ? AND course_code = ?", key
+        ).fetchone()
+        if exists:
+            raise DuplicateEntityError(f"Enrollment {key} already exists.")
+        # ensure foreign keys exist
+        self.get_student(enrollment.student_id)
+        self.get_course(enrollment.course_code)
+        if enrollment.grade is not None and enrollment.grade not in GRADE_POINTS:
+            raise ValueError(f"Unknown grade {enrollment.grade}")
+        conn.execute(
+            f"INSERT INTO enrollments ({_ENROLLMENT_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+            (*key, enrollment.score, enrollment.grade, enrollment.passed),
+        )
+
+    def add_enrollment(self, enrollment: Enrollment) -> None:
+        with self._write() as conn:
+            self._insert_enrollment(conn, enrollment)
+        self._notify_change(enrollment.student_id)
+
+    def add_enrollments(self, enrollments: Iterable[Enrollment]) -> None:
+        """
+        Insert many enrollments with one executemany in one transaction;
+        all or nothing. Grades are checked before anything is written;
+        capacity is not checked, as for add_enrollment.
+        """
+        rows = [
+            (e.student_id, e.course_code, e.score, e.grade, e.passed) for e in enrollments
+        ]
+        for row in rows:
+            if row[3] is not None and row[3] not in GRADE_POINTS:
+                raise ValueError(f"Unknown grade {row[3]}")
+        try:
+            with self._write() as conn:
+                conn.executemany(
+                    f"INSERT INTO enrollments ({_ENROLLMENT_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.IntegrityError as exc:
+            if _violates(exc, "FOREIGN KEY"):
+                raise EntityNotFoundError(f"Unknown student or course: {exc}")
+            if not _violates(exc, "UNIQUE"):
+                raise
+            raise DuplicateEntityError(f"Enrollment already exists: {exc}")
+        for student_id in dict.fromkeys(row[0] for row in rows):
+            self._notify_change(student_id)
+
+    def add_enrollment_within_capacity(self, enrollment: Enrollment) -> None:
+        """
+        Insert the enrollment unless its course is already full; the count
+        and the insert share one write transaction.
+        """
+        with self._write() as conn:
+            course = self.get_course(enrollment.course_code)
+            if course.is_full(self.count_enrollments_for_course(enrollment.course_code)):
+                raise BusinessRuleViolationError("Course is full.")
+            self.get_student(enrollment.student_id)
+            self._insert_enrollment(conn, enrollment)
+        self._notify_change(enrollment.student_id)
+
+    def add_enrollments_within_capacity(
+        self,
+        enrollments: Iterable[Enrollment],
+    ) -> List[Tuple[int, Exception]]:
+        """
+        Insert many enrollments in order, each as add_enrollment_within_capacity
+        would, in one write transaction. An enrollment that would fail is
+        skipped; returns (position, error) for each of those.
+        """
+        errors: List[Tuple[int, Exception]] = []
+        changed: Dict[str, None] = {}
+        courses: Dict[str, Optional[Course]] = {}
+        counts: Dict[str, int] = {}
+        with self._write() as conn:
+            for index, enrollment in enumerate(enrollments):
+                course_code = enrollment.course_code
+                if course_code not in courses:
+                    try:
+                        courses[course_code] = self.get_course(course_code)
+                    except EntityNotFoundError:
+                        courses[course_code] = None
+                    counts[course_code] = self.count_enrollments_for_course(course_code)
+                course = courses[course_code]
+                try:
+                    if course is None:
+                        raise EntityNotFoundError(f"Course {course_code} not found.")
+                    if course.is_full(counts[course_code]):
+                        raise BusinessRuleViolationError("Course is full.")
+                    self.get_student(enrollment.student_id)
+                    self._insert_enrollment(conn, enrollment)
+                except (EntityNotFoundError, BusinessRuleViolationError,
+                        DuplicateEntityError, ValueError) as exc:
+                    errors.append((index, exc))
+                    continue
+                counts[course_code] += 1
+                changed[enrollment.student_id] = None
+        for student_id in changed:
+            self._notify_change(student_id)
+        return errors
+
+    def get_enrollment(self, student_id: str, course_code: str) -> Enrollment:
+        key = (student_id, course_code)
+        row = self._conn.execute(
+            f"SELECT {_ENROLLMENT_COLUMNS} FROM enrollments"
+            " WHERE student_id = ? AND course_code = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            raise EntityNotFoundError(f"Enrollment {key} not found.")
+        return _enrollment_from_row(row)
+
+    def list_enrollments_for_student(self, student_id: str) -> List[Enrollment]:
+        rows = self._conn.execute(
+            f"SELECT {_ENROLLMENT_COLUMNS} FROM enrollments WHERE student_id = ?"
+            " ORDER BY rowid",
+            (student_id,),
+        )
+        return [_enrollment_from_row(row) for row in rows]
+
+    def list_enrollments_for_course(self, course_code: str) -> List[Enrollment]:
+        rows = self._conn.execute(
+            f"SELECT {_ENROLLMENT_COLUMNS} FROM enrollments WHERE course_code = ?"
+            " ORDER BY rowid",
+            (course_code,),
+        )
+        return [_enrollment_from_row(row) for row in rows]
+
+    def count_enrollments_for_course(self, course_code: str) -> int:
+        (count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM enrollments WHERE course_code = ?", (course_code,)
+        ).fetchone()
+        return count
+
+    def update_score(self, student_id: str, course_code: str, score: float) -> Enrollment:
+        with self._write() as conn:
+            enrollment = self.get_enrollment(student_id, course_code)
+            enrollment.update_score(score)
+            conn.execute(
+                "UPDATE enrollments SET score = ? WHERE student_id = ? AND course_code = ?",
+                (score, student_id, course_code),
+            )
+        self._notify_change(student_id)
+        return enrollment
+
+    def update_grade(
+        self,
+        student_id: str,
+        course_code: str,
+        grade: str,
+        passed: bool,
+    ) -> Enrollment:
+        if grade not in GRADE_POINTS:
+            raise ValueError(f"Unknown grade {grade}")
+        with self._write() as conn:
+            enrollment = self.get_enrollment(student_id, course_code)
+            enrollment.update_grade(grade, passed)
+            conn.execute(
+                "UPDATE enrollments SET grade = ?, passed = ?"
+                " WHERE student_id = ? AND course_code = ?",
+                (grade, passed, student_id, course_code),
+            )
+        self._notify_change(student_id)
+        return enrollment
+
+    def update_scores_and_grades(
+        self,
+        updates: Iterable[Tuple[str, str, float, str, bool]],
+    ) -> List[Tuple[int, Exception]]:
+        """
+        Apply many (student_id, course_code, score, grade, passed) updates in
+        order with one executemany in one transaction. An update that would
+        fail is skipped; returns (position, error) for each of those. Every
+        update is checked before the first one is written.
+        """
+        errors: List[Tuple[int, Exception]] = []
+        rows = []
+        with self._write():
+            for index, (student_id, course_code, score, grade, passed) in enumerate(updates):
+                try:
+                    self.get_enrollment(student_id, course_code)
+                except EntityNotFoundError as exc:
+                    errors.append((index, exc))
+                    continue
+                error = score_update_error(score, grade, passed)
+                if error is not None:
+                    errors.append((index, error))
+                    continue
+                rows.append((score, grade, passed, student_id, course_code))
+            self._conn.executemany(
+                "UPDATE enrollments SET score = ?, grade = ?, passed = ?"
+                " WHERE student_id = ? AND course_code = ?",
+                rows,
+            )
+        for student_id in dict.fromkeys(row[3] for row in rows):
+            self._notify_change(student_id)
+        return errors
+
+    # ---- aggregates ----
+    def get_gpa(self, student_id: str) -> float:
+        """
+        GPA over the student's graded enrollments; 0.0 if none.
+        """
+        points, credits = self._conn.execute(
+            f"SELECT SUM({_GRADE_POINTS_SQL} * c.credits), SUM(c.credits)"
+            " FROM enrollments e JOIN courses c ON c.course_code = e.course_code"
+            " WHERE e.student_id = ? AND e.grade IS NOT NULL",
+            (student_id,),
+        ).fetchone()
+        if not credits:
+            return 0.0
+        return points / credits
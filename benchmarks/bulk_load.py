@@ -0,0 +1,74 @@
+# benchmarks/bulk_load.py
+"""
+Bulk load benchmark: write synthetic students, courses and enrollments
+files, then load them with app.loaders and report rows per second.
+
+    python -m benchmarks.bulk_load --enrollments 5000000 --repo compact
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+
+from app.compact_repository import CompactRepository
+from app.loaders import load_courses, load_enrollments, load_students
+from app.repository import InMemoryRepository
+
+REPOSITORIES = {"memory": InMemoryRepository, "compact": CompactRepository}
+
+
+def write_files(directory: str, args: argparse.Namespace) -> dict:
+    ext = args.format
+    paths = {name: os.path.join(directory, f"{name}.{ext}")
+             for name in ("students", "courses", "enrollments")}
+    students = args.enrollments // args.per_student
+    tables = {
+        "students": (["student_id", "name", "year"],
+                     ((f"S{s}", f"Student {s}", 1 + s % 4) for s in range(students))),
+        "courses": (["course_code", "title", "credits", "max_capacity"],
+                    ((f"C{c}", f"Course {c}", 1 + c % 4, args.enrollments)
+                     for c in range(args.courses))),
+        "enrollments": (["student_id", "course_code", "score"],
+                        ((f"S{s}", f"C{(s + k * 7) % args.courses}", (s + k) % 101)
+                         for s in range(students) for k in range(args.per_student))),
+    }
+    for name, (header, rows) in tables.items():
+        with open(paths[name], "w", newline="") as f:
+            if ext == "csv":
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
+            else:
+                for row in rows:
+                    f.write(json.dumps(dict(zip(header, row))) + "\n")
+    return paths
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--enrollments", type=int, default=1_000_000)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--courses", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--repo", choices=sorted(REPOSITORIES), default="memory")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_files(directory, args)
+        repo = REPOSITORIES[args.repo]()
+        began = time.perf_counter()
+        for name, load in (("students", load_students), ("courses", load_courses),
+                           ("enrollments", load_enrollments)):
+            report = load(repo, paths[name], chunk_size=args.chunk_size)
+            print(f"{name:<12}: {report.loaded:>10,} rows in {report.seconds:7.2f}s"
+                  f"  ({report.rows_per_second:,.0f} rows/s, {report.rejected} rejected)")
+        print(f"{'total':<12}: {time.perf_counter() - began:7.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
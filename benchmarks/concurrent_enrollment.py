@@ -0,0 +1,123 @@
+# benchmarks/concurrent_enrollment.py
+"""
+Stress benchmark for ConcurrentRepository: many threads register students
+into a few hot courses (plus a long tail of cold ones) and the capacity
+invariant is checked afterwards.
+
+    python -m benchmarks.concurrent_enrollment --threads 16 --students 50000
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from typing import List, Tuple
+
+from app.concurrent_repository import ConcurrentRepository
+from app.enrollment import enroll_student_in_course
+from app.models import Course, Student
+from app.utils import BusinessRuleViolationError, DuplicateEntityError
+
+
+def build_repo(args: argparse.Namespace) -> ConcurrentRepository:
+    repo = ConcurrentRepository(stripes=args.stripes)
+    for i in range(args.hot_courses):
+        repo.add_course(
+            Course(course_code=f"HOT{i}", title=f"Hot {i}", credits=3,
+                   max_capacity=args.hot_capacity)
+        )
+    for i in range(args.cold_courses):
+        repo.add_course(Course(course_code=f"COLD{i}", title=f"Cold {i}", credits=3,
+                               max_capacity=args.students))
+    for i in range(args.students):
+        repo.add_student(Student(student_id=f"S{i}", name=f"Student {i}", year=1 + i % 4))
+    return repo
+
+
+def build_requests(args: argparse.Namespace) -> List[Tuple[str, str]]:
+    rng = random.Random(args.seed)
+    requests = []
+    for i in range(args.students):
+        for _ in range(args.requests_per_student):
+            if args.cold_courses == 0 or rng.random() < args.hot_share:
+                course = f"HOT{rng.randrange(args.hot_courses)}"
+            else:
+                course = f"COLD{rng.randrange(args.cold_courses)}"
+            requests.append((f"S{i}", course))
+    rng.shuffle(requests)
+    return requests
+
+
+def run(args: argparse.Namespace) -> int:
+    repo = build_repo(args)
+    requests = build_requests(args)
+    counters = {"enrolled": 0, "full": 0, "duplicate": 0}
+    counters_lock = threading.Lock()
+    start = threading.Barrier(args.threads + 1)
+
+    def worker(chunk: List[Tuple[str, str]]) -> None:
+        local = {"enrolled": 0, "full": 0, "duplicate": 0}
+        start.wait()
+        for student_id, course_code in chunk:
+            try:
+                enroll_student_in_course(repo, student_id, course_code)
+                local["enrolled"] += 1
+            except BusinessRuleViolationError:
+                local["full"] += 1
+            except DuplicateEntityError:
+                local["duplicate"] += 1
+        with counters_lock:
+            for key, value in local.items():
+                counters[key] += value
+
+    threads = [
+        threading.Thread(target=worker, args=(requests[t::args.threads],))
+        for t in range(args.threads)
+    ]
+    for t in threads:
+        t.start()
+    start.wait()
+    began = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - began
+
+    print(f"Threads               : {args.threads}")
+    print(f"Requests              : {len(requests)}")
+    print(f"Enrolled              : {counters['enrolled']}")
+    print(f"Rejected (full)       : {counters['full']}")
+    print(f"Rejected (duplicate)  : {counters['duplicate']}")
+    print(f"Elapsed               : {elapsed:.3f}s")
+    print(f"Throughput            : {len(requests) / elapsed:,.0f} requests/s")
+
+    violations = []
+    for course in repo.list_courses():
+        count = repo.count_enrollments_for_course(course.course_code)
+        if count > course.max_capacity or count != len(
+            repo.list_enrollments_for_course(course.course_code)
+        ):
+            violations.append(f"{course.course_code}: {count}/{course.max_capacity}")
+    if violations:
+        print("Capacity invariant VIOLATED: " + ", ".join(violations))
+        return 1
+    print("Capacity invariant    : held")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--stripes", type=int, default=64)
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--requests-per-student", type=int, default=3)
+    parser.add_argument("--hot-courses", type=int, default=4)
+    parser.add_argument("--hot-capacity", type=int, default=500)
+    parser.add_argument("--cold-courses", type=int, default=200)
+    parser.add_argument("--hot-share", type=float, default=0.8,
+                        help="fraction of requests going to hot courses")
+    parser.add_argument("--seed", type=int, default=0)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# benchmarks/persistence_recovery.py
+"""
+Write and recovery benchmark for DurableRepository: log a synthetic
+dataset, snapshot it, log a tail of score updates, then time a restart.
+
+    python -m benchmarks.persistence_recovery --enrollments 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from app.grading import compute_grade_with_bonus
+from app.models import Course, Enrollment, Student
+from app.persistence import DurableRepository, SNAPSHOT_FILE, list_segments
+
+
+def timed(label: str, fn, count: int = 0):
+    began = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - began
+    rate = f"  ({count / elapsed:,.0f} ops/s)" if count else ""
+    print(f"{label:<34}: {elapsed:8.3f}s{rate}")
+    return result
+
+
+def load_dataset(repo: DurableRepository, args: argparse.Namespace) -> None:
+    for c in range(args.courses):
+        repo.add_course(Course(course_code=f"C{c}", title=f"Course {c}", credits=1 + c % 4,
+                               max_capacity=args.enrollments))
+    students = args.enrollments // args.per_student
+    for s in range(students):
+        repo.add_student(Student(student_id=f"S{s}", name=f"Student {s}", year=1 + s % 4))
+        for k in range(args.per_student):
+            repo.add_enrollment(
+                Enrollment(student_id=f"S{s}", course_code=f"C{(s + k * 7) % args.courses}")
+            )
+
+
+def log_tail(repo: DurableRepository, args: argparse.Namespace) -> None:
+    for i in range(args.tail // 2):
+        s = i % (args.enrollments // args.per_student)
+        course_code = f"C{s % args.courses}"
+        score = float(i % 101)
+        repo.update_score(f"S{s}", course_code, score)
+        grade, passed = compute_grade_with_bonus(score, 0.0)
+        repo.update_grade(f"S{s}", course_code, grade, passed)
+
+
+def group_commit(directory: str, threads: int, per_thread: int) -> None:
+    repo = DurableRepository(directory, snapshot_every=None, wait_for_sync=True)
+
+    def writer(t: int) -> None:
+        for i in range(per_thread):
+            repo.add_student(Student(student_id=f"G{t}-{i}", name="g", year=1))
+
+    workers = [threading.Thread(target=writer, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    repo.close()
+
+
+def run(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory(prefix="repo-persistence-", dir=args.dir) as directory:
+        ops = args.courses + args.enrollments // args.per_student + args.enrollments
+        repo = DurableRepository(directory, snapshot_every=None, wait_for_sync=False)
+        timed("log dataset (no fsync wait)", lambda: load_dataset(repo, args), ops)
+        timed("snapshot", repo.snapshot)
+        timed("log tail of score/grade updates", lambda: log_tail(repo, args), args.tail)
+        timed("close (flush log)", repo.close)
+
+        snapshot_size = os.path.getsize(os.path.join(directory, SNAPSHOT_FILE))
+        log_size = sum(os.path.getsize(p) for _, p in list_segments(directory))
+        print(f"{'snapshot size':<34}: {snapshot_size / 2**20:8.1f} MiB")
+        print(f"{'log tail size':<34}: {log_size / 2**20:8.1f} MiB")
+
+        recovered = timed(
+            "recover (snapshot + log tail)",
+            lambda: DurableRepository(directory, snapshot_every=None),
+        )
+        count = sum(
+            recovered.count_enrollments_for_course(c.course_code)
+            for c in recovered.list_courses()
+        )
+        recovered.close()
+        print(f"{'recovered enrollments':<34}: {count:8d}")
+
+    for threads in (1, args.sync_threads):
+        with tempfile.TemporaryDirectory(prefix="repo-group-commit-", dir=args.dir) as directory:
+            timed(
+                f"fsync'd writes, {threads} thread(s)",
+                lambda: group_commit(directory, threads, args.sync_writes),
+                threads * args.sync_writes,
+            )
+    return 0 if count == args.enrollments else 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--enrollments", type=int, default=1_000_000)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--courses", type=int, default=2000)
+    parser.add_argument("--tail", type=int, default=100_000,
+                        help="log records written after the snapshot")
+    parser.add_argument("--sync-threads", type=int, default=8)
+    parser.add_argument("--sync-writes", type=int, default=200,
+                        help="fsync'd writes per thread in the group commit run")
+    parser.add_argument("--dir", default=None, help="where to create the data directories")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
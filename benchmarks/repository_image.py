@@ -0,0 +1,71 @@
+# benchmarks/repository_image.py
+"""
+Cold-start benchmark: rebuild a repository with add_* calls versus open
+a prebuilt image of it through mmap.
+
+    python -m benchmarks.repository_image --enrollments 1000000
+"""
+import argparse
+import functools
+import os
+import sys
+import tempfile
+import time
+
+from app.compact_repository import CompactRepository
+from app.models import Course, Enrollment, Student
+from app.repository_image import MappedRepository, write_image
+
+
+def timed(label: str, fn):
+    began = time.perf_counter()
+    result = fn()
+    print(f"{label:<34}: {time.perf_counter() - began:8.3f}s")
+    return result
+
+
+def build(args: argparse.Namespace) -> CompactRepository:
+    repo = CompactRepository()
+    for c in range(args.courses):
+        repo.add_course(Course(course_code=f"C{c}", title=f"Course {c}", credits=1 + c % 4,
+                               max_capacity=args.enrollments))
+    students = args.enrollments // args.per_student
+    for s in range(students):
+        repo.add_student(Student(student_id=f"S{s}", name=f"Student {s}", year=1 + s % 4))
+    for s in range(students):
+        for k in range(args.per_student):
+            repo.add_enrollment(
+                Enrollment(student_id=f"S{s}", course_code=f"C{(s + k * 7) % args.courses}")
+            )
+    return repo
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--enrollments", type=int, default=1_000_000)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--courses", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "repository.img")
+        repo = timed("build with add_* calls", lambda: build(args))
+        # bind repo now: the name is deleted below so the mapped image is
+        # measured without the source repository still resident
+        timed("write image", functools.partial(write_image, repo, path))
+        print(f"{'image size':<34}: {os.path.getsize(path) / 2**20:8.1f} MiB")
+        del repo
+
+        mapped = timed("open image", lambda: MappedRepository(path))
+        last = f"S{args.enrollments // args.per_student - 1}"
+        timed("first lookup", lambda: mapped.list_enrollments_for_student(last))
+        timed("1000 student lookups", lambda: [mapped.get_student(f"S{s}") for s in range(1000)])
+        mapped.add_student(Student(student_id="new", name="New", year=1))
+        timed("first write", lambda: mapped.add_enrollment(
+            Enrollment(student_id="new", course_code="C0")))
+        mapped.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# benchmarks/repository_memory.py
+"""
+Memory benchmark: bytes per enrollment of InMemoryRepository versus
+CompactRepository, measured with tracemalloc.
+
+    python -m benchmarks.repository_memory --enrollments 1000000
+    python -m benchmarks.repository_memory --enrollments 10000000 --repos compact
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from app.compact_repository import CompactRepository
+from app.grading import compute_grade
+from app.models import Course, Enrollment, Student
+from app.repository import InMemoryRepository
+
+REPOSITORIES = {"memory": InMemoryRepository, "compact": CompactRepository}
+
+
+def measure(name: str, args: argparse.Namespace) -> float:
+    """Build the dataset in a fresh repository; returns bytes per enrollment."""
+    students = args.enrollments // args.per_student
+    gc.collect()
+    tracemalloc.start()
+    began = time.perf_counter()
+    repo = REPOSITORIES[name]()
+    for c in range(args.courses):
+        repo.add_course(Course(course_code=f"C{c}", title=f"Course {c}", credits=1 + c % 4,
+                               max_capacity=args.enrollments))
+    for s in range(students):
+        repo.add_student(Student(student_id=f"S{s}", name=f"Student {s}", year=1 + s % 4))
+    catalog_bytes, _ = tracemalloc.get_traced_memory()
+
+    for s in range(students):
+        student_id = f"S{s}"
+        for k in range(args.per_student):
+            course_code = f"C{(s + k * 7) % args.courses}"
+            repo.add_enrollment(Enrollment(student_id=student_id, course_code=course_code))
+            if args.graded:
+                score = float((s * 31 + k * 17) % 101)
+                repo.update_score(student_id, course_code, score)
+                repo.update_grade(student_id, course_code, *compute_grade(score))
+    total_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    elapsed = time.perf_counter() - began
+    tracemalloc.stop()
+
+    per_enrollment = (total_bytes - catalog_bytes) / args.enrollments
+    print(f"{name:<8} total {total_bytes / 2**20:9.1f} MiB   peak {peak_bytes / 2**20:9.1f} MiB"
+          f"   students+courses {catalog_bytes / 2**20:8.1f} MiB"
+          f"   {per_enrollment:6.1f} B/enrollment   build {elapsed:6.1f}s")
+    del repo
+    gc.collect()
+    return per_enrollment
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--enrollments", type=int, default=1_000_000)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--courses", type=int, default=2000)
+    parser.add_argument("--graded", action="store_true",
+                        help="also record a score and grade for every enrollment")
+    parser.add_argument("--repos", nargs="+", choices=sorted(REPOSITORIES),
+                        default=["memory", "compact"])
+    args = parser.parse_args(argv)
+
+    results = {name: measure(name, args) for name in args.repos}
+    if "memory" in results and "compact" in results:
+        print(f"reduction per enrollment: {results['memory'] / results['compact']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
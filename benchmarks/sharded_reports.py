@@ -0,0 +1,60 @@
+# benchmarks/sharded_reports.py
+"""
+Report throughput of ShardedRepository for several shard counts: load a
+graded dataset, then time generate_student_reports over every student.
+
+    python -m benchmarks.sharded_reports --enrollments 500000 --shards 1 2 4 8
+"""
+import argparse
+import sys
+import time
+
+from app.enrollment import record_scores
+from app.models import Course, Enrollment, Student
+from app.sharded_repository import ShardedRepository
+
+
+def measure(shards: int, args: argparse.Namespace) -> float:
+    repo = ShardedRepository(shards=shards)
+    try:
+        students = args.enrollments // args.per_student
+        repo.add_courses(Course(course_code=f"C{c}", title=f"Course {c}", credits=1 + c % 4,
+                                max_capacity=args.enrollments) for c in range(args.courses))
+        repo.add_students(Student(student_id=f"S{s}", name=f"Student {s}", year=1 + s % 4)
+                          for s in range(students))
+        rows = [(f"S{s}", f"C{(s + k * 7) % args.courses}") for s in range(students)
+                for k in range(args.per_student)]
+        repo.add_enrollments(Enrollment(student_id=s, course_code=c) for s, c in rows)
+        record_scores(repo, [(s, c, float(i % 101), 0.0) for i, (s, c) in enumerate(rows)])
+
+        student_ids = [f"S{s}" for s in range(students)]
+        began = time.perf_counter()
+        for start in range(0, students, args.batch):
+            repo.generate_student_reports(student_ids[start:start + args.batch])
+        elapsed = time.perf_counter() - began
+    finally:
+        repo.close()
+    rate = students / elapsed
+    print(f"{shards:>3} shard(s): {students:,} reports in {elapsed:7.2f}s  ({rate:,.0f} reports/s)")
+    return rate
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--enrollments", type=int, default=500_000)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--courses", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=10_000,
+                        help="students per generate_student_reports call")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args(argv)
+
+    rates = {shards: measure(shards, args) for shards in args.shards}
+    base = rates[min(rates)]
+    for shards, rate in rates.items():
+        print(f"{shards:>3} shard(s): {rate / base:5.2f}x of {min(rates)} shard(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
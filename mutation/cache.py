@@ -0,0 +1,151 @@
+# mutation/cache.py
+"""
+Persistent cache of mutant verdicts.
+
+A verdict only depends on the mutated module, the rest of the application
+and the tests that run against it, so it is stored under a hash of exactly
+those inputs. Re-running a campaign on an unchanged tree re-executes
+nothing; editing one test file only re-executes the mutants it covers.
+
+The suite-level data every campaign needs before running mutants (the
+baseline duration and the coverage map) is cached as well, under a
+fingerprint of the whole application and test tree.
+"""
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Optional
+
+CACHE_FILE = ".mutation_cache.json"
+# bump whenever the meaning of a cached entry changes
+CACHE_VERSION = 1
+
+SOURCE_DIRS = ("app", "tests")
+CONFIG_FILES = ("pytest.ini",)
+
+
+def sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def project_digests(project_root: str) -> Dict[str, str]:
+    """
+    relative path -> content hash of every .py file under SOURCE_DIRS and of
+    the test configuration files.
+    """
+    digests: Dict[str, str] = {}
+    for name in CONFIG_FILES:
+        path = os.path.join(project_root, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                digests[name] = hashlib.sha256(f.read()).hexdigest()
+    for source_dir in SOURCE_DIRS:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(project_root, source_dir)):
+            dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+            for filename in sorted(filenames):
+                if not filename.endswith(".py"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                relative = os.path.relpath(path, project_root).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    digests[relative] = hashlib.sha256(f.read()).hexdigest()
+    return digests
+
+
+class ResultCache:
+    """
+    Verdicts keyed by mutant inputs, plus per-fingerprint campaign setup.
+    Only what the latest campaign used is written back, so the file does not
+    grow with every edit.
+    """
+
+    def __init__(self, path: str, digests: Dict[str, str]) -> None:
+        self.path = path
+        self.digests = digests
+        self.fingerprint = sha256(json.dumps(digests, sort_keys=True))
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.setup: Dict[str, Any] = {}
+        self._used_keys = set()
+
+    @classmethod
+    def load(cls, project_root: str) -> "ResultCache":
+        cache = cls(os.path.join(project_root, CACHE_FILE), project_digests(project_root))
+        try:
+            with open(cache.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cache
+        if data.get("version") != CACHE_VERSION:
+            return cache
+        cache.results = data.get("results", {})
+        if data.get("fingerprint") == cache.fingerprint:
+            cache.setup = data.get("setup", {})
+        return cache
+
+    def save(self) -> None:
+        data = {
+            "version": CACHE_VERSION,
+            "fingerprint": self.fingerprint,
+            "setup": self.setup,
+            "results": {k: self.results[k] for k in sorted(self._used_keys)},
+        }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def _test_digests(self, tests: Optional[Iterable[str]]) -> Dict[str, str]:
+        """
+        Digests of the test files a mutant's verdict depends on: the files of
+        its selected tests (all test files for a whole-suite run) plus test
+        helpers and configuration, which every test may depend on.
+        """
+        selected = None
+        if tests is not None:
+            selected = {t.split("::", 1)[0] for t in tests}
+        relevant = {}
+        for path, digest in self.digests.items():
+            if path in CONFIG_FILES:
+                relevant[path] = digest
+            elif path.startswith("tests/"):
+                is_test_module = os.path.basename(path).startswith("test_")
+                if selected is None or not is_test_module or path in selected:
+                    relevant[path] = digest
+        return relevant
+
+    def key_for(
+        self,
+        operator_name: str,
+        file_path: str,
+        mutated_source: str,
+        tests: Optional[Iterable[str]],
+    ) -> str:
+        """
+        Hash of the mutated module, every other application module and the
+        relevant test files.
+        """
+        file_path = file_path.replace(os.sep, "/")
+        app = {
+            path: digest
+            for path, digest in self.digests.items()
+            if path.startswith("app/") and path != file_path
+        }
+        material = {
+            "operator": operator_name,
+            "file": file_path,
+            "mutant": sha256(mutated_source),
+            "app": app,
+            "tests": self._test_digests(tests),
+            "selection": None if tests is None else sorted(tests),
+        }
+        return sha256(json.dumps(material, sort_keys=True))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.results.get(key)
+        if entry is not None:
+            self._used_keys.add(key)
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        self.results[key] = entry
+        self._used_keys.add(key)
@@ -0,0 +1,146 @@
+# mutation/coverage_map.py
+"""
+Per-test line coverage, collected once per campaign.
+
+The unmutated suite is run under coverage.py with the `test_function`
+dynamic context, which tags every executed line with the test that ran it.
+Each mutant then only needs the tests that execute its line range.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from coverage import CoverageData
+
+# Lines executed outside any test (module import, class bodies) are
+# recorded under the empty context.
+IMPORT_CONTEXT = ""
+
+COVERAGE_RC = """\
+[run]
+source = {source}
+data_file = {data_file}
+dynamic_context = test_function
+"""
+
+
+class CoverageMap:
+    """
+    relative file -> line -> pytest node ids of the tests executing it.
+    """
+
+    def __init__(
+        self,
+        tests_by_line: Dict[str, Dict[int, Set[str]]],
+        all_tests: Iterable[str],
+    ) -> None:
+        self.tests_by_line = tests_by_line
+        self.all_tests = sorted(set(all_tests))
+
+    def tests_for(self, relative_file: str, first_line: int, last_line: int) -> List[str]:
+        """
+        Tests covering any line in [first_line, last_line]. An empty list
+        means the mutated code is never executed by the suite.
+
+        Code that runs at import time affects every test importing the
+        module, so such lines select the whole suite.
+        """
+        lines = self.tests_by_line.get(os.path.normpath(relative_file), {})
+        selected: Set[str] = set()
+        for line in range(first_line, last_line + 1):
+            tests = lines.get(line)
+            if not tests:
+                continue
+            if IMPORT_CONTEXT in tests:
+                return list(self.all_tests)
+            selected.update(tests)
+        return sorted(selected)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly form, for caching between campaigns."""
+        return {
+            "tests_by_line": {
+                path: {str(line): sorted(tests) for line, tests in lines.items()}
+                for path, lines in self.tests_by_line.items()
+            },
+            "all_tests": self.all_tests,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CoverageMap":
+        return cls(
+            {
+                path: {int(line): set(tests) for line, tests in lines.items()}
+                for path, lines in data["tests_by_line"].items()
+            },
+            data["all_tests"],
+        )
+
+
+def context_to_node_id(project_root: str, context: str) -> Optional[str]:
+    """
+    Turn a `test_function` context such as tests.unit.test_grading.test_x
+    (or ...TestClass.test_x) into the pytest node id
+    tests/unit/test_grading.py::test_x.
+    """
+    parts = context.split(".")
+    for split in range(len(parts) - 1, 0, -1):
+        module_path = os.path.join(*parts[:split]) + ".py"
+        if os.path.isfile(os.path.join(project_root, module_path)):
+            return "::".join([module_path.replace(os.sep, "/"), *parts[split:]])
+    return None
+
+
+def collect_coverage_map(project_root: str, source: str = "app") -> CoverageMap:
+    """
+    Run the unmutated suite once under coverage and build the map.
+    Raises RuntimeError if the suite does not pass on the original code,
+    since no mutant verdict would be meaningful then.
+    """
+    with tempfile.TemporaryDirectory(prefix="mutation-coverage-") as tmp:
+        data_file = os.path.join(tmp, ".coverage")
+        rcfile = os.path.join(tmp, "coveragerc")
+        with open(rcfile, "w", encoding="utf-8") as f:
+            f.write(COVERAGE_RC.format(source=source, data_file=data_file))
+
+        proc = subprocess.run(
+            [
+                sys.executable, "-m", "coverage", "run", f"--rcfile={rcfile}",
+                "-m", "pytest", "-q", "-p", "no:cacheprovider",
+            ],
+            cwd=project_root,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(
+                "Test suite fails on the unmutated code:\n" + proc.stdout + proc.stderr
+            )
+
+        data = CoverageData(basename=data_file)
+        data.read()
+
+        node_ids: Dict[str, Optional[str]] = {}
+        tests_by_line: Dict[str, Dict[int, Set[str]]] = {}
+        for measured in data.measured_files():
+            relative = os.path.normpath(os.path.relpath(measured, project_root))
+            lines: Dict[int, Set[str]] = {}
+            for line, contexts in data.contexts_by_lineno(measured).items():
+                for context in contexts:
+                    if context == IMPORT_CONTEXT:
+                        test = IMPORT_CONTEXT
+                    else:
+                        if context not in node_ids:
+                            node_ids[context] = context_to_node_id(project_root, context)
+                        test = node_ids[context]
+                        if test is None:
+                            continue
+                    lines.setdefault(line, set()).add(test)
+            tests_by_line[relative] = lines
+
+    all_tests = [t for t in node_ids.values() if t is not None]
+    return CoverageMap(tests_by_line, all_tests)
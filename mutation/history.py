@@ -0,0 +1,99 @@
+# mutation/history.py
+"""
+Historical kill rates of tests, per (operator, file).
+
+Mutants of the same operator in the same file tend to be killed by the same
+few tests, so running the historically best killers first lets fail-fast
+runs stop after one or two tests for most killed mutants.
+"""
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+HISTORY_FILE = ".mutation_history.json"
+
+# `pytest -rf` summary line of the test that killed the mutant
+FAILED_LINE = re.compile(r"^FAILED (\S+)", re.MULTILINE)
+
+
+def killing_test_from_output(stdout: str) -> Optional[str]:
+    """
+    Node id of the first failing test in pytest output, without the
+    parametrization suffix so it matches coverage-derived node ids.
+    """
+    match = FAILED_LINE.search(stdout)
+    if match is None:
+        return None
+    return match.group(1).split("[", 1)[0]
+
+
+class KillHistory:
+    """
+    "<operator>|<file>" -> test node id -> [kills, runs].
+
+    A run is only counted when the test is known to have executed: with
+    fail-fast, tests ordered after the killing test never run.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.stats: Dict[str, Dict[str, List[int]]] = {}
+
+    @classmethod
+    def load(cls, project_root: str) -> "KillHistory":
+        history = cls(os.path.join(project_root, HISTORY_FILE))
+        try:
+            with open(history.path, "r", encoding="utf-8") as f:
+                history.stats = json.load(f)
+        except (OSError, ValueError):
+            # missing or corrupt history just means no ranking yet
+            history.stats = {}
+        return history
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.stats, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    @staticmethod
+    def _key(operator_name: str, file_path: str) -> str:
+        return f"{operator_name}|{file_path.replace(os.sep, '/')}"
+
+    def kill_rate(self, operator_name: str, file_path: str, test: str) -> float:
+        kills, runs = self.stats.get(self._key(operator_name, file_path), {}).get(
+            test, (0, 0)
+        )
+        # Laplace smoothing: unseen tests rank between proven killers and
+        # tests that keep running without killing anything
+        return (kills + 1) / (runs + 2)
+
+    def rank(self, operator_name: str, file_path: str, tests: Iterable[str]) -> List[str]:
+        """
+        Order tests by descending kill rate; ties keep the given order.
+        """
+        tests = list(tests)
+        return sorted(
+            tests, key=lambda t: -self.kill_rate(operator_name, file_path, t)
+        )
+
+    def record(
+        self,
+        operator_name: str,
+        file_path: str,
+        tests: Iterable[str],
+        killing_test: Optional[str],
+    ) -> None:
+        """
+        Record one mutant run over `tests` (in execution order).
+        """
+        per_test = self.stats.setdefault(self._key(operator_name, file_path), {})
+        for test in tests:
+            counts = per_test.setdefault(test, [0, 0])
+            counts[1] += 1
+            if test == killing_test:
+                counts[0] += 1
+                break
@@ -0,0 +1,170 @@
+# mutation/inprocess.py
+"""
+In-process mutant execution.
+
+A long-lived worker imports pytest once and, for every mutant, serves the
+mutated module through a sys.meta_path finder instead of writing it to disk
+and spawning a new interpreter. Project modules (app.*, tests.*) are dropped
+from sys.modules between mutants, so each run imports a fresh copy of the
+application with exactly one module replaced by its mutant.
+"""
+import contextlib
+import importlib.abc
+import importlib.util
+import io
+import os
+import signal
+import sys
+from typing import List, Optional, Sequence, Tuple
+
+import pytest
+
+
+def module_name_for(relative_file: str) -> str:
+    """
+    Map a project-relative path such as app/grading.py to app.grading.
+    """
+    without_ext, _ = os.path.splitext(os.path.normpath(relative_file))
+    return without_ext.replace(os.sep, ".")
+
+
+class MutantLoader(importlib.abc.Loader):
+    """
+    Loader executing a precompiled mutant code object as the module body.
+    """
+
+    def __init__(self, code, path: str) -> None:
+        self.code = code
+        self.path = path
+
+    def create_module(self, spec):
+        return None  # default module creation
+
+    def exec_module(self, module) -> None:
+        module.__file__ = self.path
+        exec(self.code, module.__dict__)
+
+
+class MutantFinder(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder that answers for exactly one module name with the
+    mutated code and defers to the regular finders for everything else.
+    """
+
+    def __init__(self, module_name: str, path: str, source: str) -> None:
+        self.module_name = module_name
+        self.path = path
+        self.code = compile(source, path, "exec")
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname != self.module_name:
+            return None
+        return importlib.util.spec_from_loader(
+            fullname, MutantLoader(self.code, self.path), origin=self.path
+        )
+
+
+class InProcessTestRunner:
+    """
+    Runs the project's test suite inside the current interpreter, optionally
+    with one module swapped for a mutant.
+
+    With a `timeout`, a run that overstays it is interrupted from a SIGALRM
+    handler: pytest treats the KeyboardInterrupt as a user abort, ends the
+    session cleanly and the runner reports `timed_out`. The handler keeps
+    firing every second in case the mutant swallows the first interrupt.
+    Needs signal.setitimer and the main thread; elsewhere runs are unbounded.
+    """
+
+    def __init__(
+        self,
+        project_root: str,
+        packages: Sequence[str] = ("app", "tests"),
+        timeout: Optional[float] = None,
+    ):
+        self.project_root = project_root
+        self.packages = tuple(packages)
+        self.timeout = timeout
+        self.timed_out = False
+        # sandboxing is done through imports, never through files on disk
+        sys.dont_write_bytecode = True
+        os.chdir(project_root)
+        if project_root not in sys.path:
+            sys.path.insert(0, project_root)
+
+    def _is_project_module(self, name: str) -> bool:
+        return any(
+            name == pkg or name.startswith(pkg + ".") for pkg in self.packages
+        )
+
+    def reset(self) -> None:
+        """
+        Forget every imported project module so the next run re-imports them
+        (and re-binds `from app.x import y` names inside test modules).
+        """
+        for name in [n for n in sys.modules if self._is_project_module(n)]:
+            del sys.modules[name]
+
+    def run(
+        self,
+        relative_file: Optional[str] = None,
+        mutated_source: Optional[str] = None,
+        args: Sequence[str] = (),
+    ) -> Tuple[int, str, str]:
+        """
+        Run pytest and return (exit code, stdout, stderr), like a subprocess.
+        A mutated source that does not compile is reported as exit code 2,
+        the same code pytest uses for collection errors.
+        """
+        finder = None
+        if mutated_source is not None:
+            try:
+                finder = MutantFinder(
+                    module_name_for(relative_file),
+                    os.path.join(self.project_root, relative_file),
+                    mutated_source,
+                )
+            except SyntaxError as exc:
+                return 2, "", f"SyntaxError in mutant: {exc}"
+
+        self.reset()
+        self.timed_out = False
+        stdout, stderr = io.StringIO(), io.StringIO()
+        if finder is not None:
+            sys.meta_path.insert(0, finder)
+        try:
+            with self._deadline():
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                    exit_code = pytest.main(self.pytest_args(args))
+        except KeyboardInterrupt:
+            # deadline hit outside pytest's own interrupt handling
+            if not self.timed_out:
+                raise
+            exit_code = pytest.ExitCode.INTERRUPTED
+        finally:
+            if finder is not None:
+                sys.meta_path.remove(finder)
+            self.reset()
+        return int(exit_code), stdout.getvalue(), stderr.getvalue()
+
+    @contextlib.contextmanager
+    def _deadline(self):
+        if self.timeout is None or not hasattr(signal, "setitimer"):
+            yield
+            return
+
+        def on_alarm(signum, frame):
+            self.timed_out = True
+            raise KeyboardInterrupt
+
+        previous = signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, self.timeout, 1.0)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    @staticmethod
+    def pytest_args(args: Sequence[str]) -> List[str]:
+        return ["-q", "-x", "-rf", "-p", "no:cacheprovider", "--capture=sys", *args]
@@ -1,18 +1,38 @@
 # mutation/mutator.py
 import ast
+import functools
+import hashlib
+import multiprocessing
 import os
 import shutil
 import subprocess
 import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from dataclasses import dataclass
-from typing import List, Type, Dict
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
 
 import astor  # <-- NEW
 
+from .cache import CACHE_FILE, ResultCache
+from .coverage_map import CoverageMap, collect_coverage_map
+from .history import HISTORY_FILE, KillHistory, killing_test_from_output
+from .inprocess import InProcessTestRunner
 from .operators import (
     MutationOperator,
     UNIT_LEVEL_OPERATORS,
     INTEGRATION_LEVEL_OPERATORS,
+    collect_mutation_points,
 )
 
 
@@ -24,6 +44,112 @@ class MutantResult:
     killed: bool
     error: bool
     message: str
+    # no test executes the mutated line, so the mutant was never run
+    no_coverage: bool = False
+    # tests selected for the mutant, in execution order (None: whole suite)
+    tests: Optional[Tuple[str, ...]] = None
+    # node id of the test that killed the mutant, when known
+    killing_test: Optional[str] = None
+    # the run exceeded its deadline and was aborted; counted as killed
+    timed_out: bool = False
+    # verdict reused from the result cache instead of being re-executed
+    cached: bool = False
+    # compiles to the same code as the original module; never run
+    equivalent: bool = False
+    # compiles to the same code as an earlier mutant of the file; never run
+    duplicate: bool = False
+
+    @property
+    def survived(self) -> bool:
+        """Ran against the tests (or would have) and nothing detected it."""
+        return not (
+            self.killed
+            or self.error
+            or self.no_coverage
+            or self.equivalent
+            or self.duplicate
+        )
+
+
+@dataclass
+class Mutant:
+    operator_cls: Type[MutationOperator]
+    # occurrence number among this operator's mutants in the file
+    index: int
+    # (first, last) source line of the mutated node
+    lines: Tuple[int, int]
+    source: str
+    # compiles to the same code as the original source
+    equivalent: bool = False
+    # (operator, index) of an earlier mutant compiling to the same code
+    duplicate_of: Optional[Tuple[Type[MutationOperator], int]] = None
+
+
+@dataclass
+class MutantJob:
+    """
+    One mutant, ready to be shipped to a worker: the mutated module source
+    plus enough metadata to build its MutantResult.
+    """
+    operator_name: str
+    file_path: str
+    index: int
+    mutated_source: str
+    # (first, last) source line of the mutated node
+    lines: Tuple[int, int]
+    # pytest node ids to run; None means the whole suite
+    tests: Optional[Tuple[str, ...]] = None
+    equivalent: bool = False
+    # "<operator name> #<index>" of the earlier mutant this one duplicates
+    duplicate_of: Optional[str] = None
+
+
+# How many jobs may be queued per worker before we stop generating mutants.
+# Keeps memory bounded while still giving every worker something to pick up.
+JOBS_IN_FLIGHT_PER_WORKER = 2
+
+# Per-mutant deadline: TIMEOUT_FACTOR times the unmutated suite's duration,
+# stretched by how oversubscribed the CPUs are, plus TIMEOUT_GRACE_SECONDS
+# of slack for a busy machine. Mutants timing out on a pool are re-run one
+# at a time before the timeout counts.
+TIMEOUT_FACTOR = 3.0
+TIMEOUT_GRACE_SECONDS = 5.0
+
+# Workspace modes:
+#   "sandbox" - one pristine copy of the project per worker, prepared once;
+#               each mutant only swaps the mutated module in and back out.
+#   "copy"    - a fresh full copy of the project for every mutant.
+WORKSPACE_SANDBOX = "sandbox"
+WORKSPACE_COPY = "copy"
+WORKSPACE_MODES = (WORKSPACE_SANDBOX, WORKSPACE_COPY)
+
+# Never needed to run the test suite, so never copied into a sandbox.
+SANDBOX_IGNORE = shutil.ignore_patterns(
+    ".git",
+    "__pycache__",
+    "*.py[cod]",
+    ".pytest_cache",
+    ".coverage",
+    HISTORY_FILE,
+    CACHE_FILE,
+    "images",
+    "requests.jsonl",
+)
+
+# Execution modes:
+#   "subprocess" - a fresh `pytest` process per mutant.
+#   "inprocess"  - long-lived workers keep pytest loaded and import the
+#                  mutant through a sys.meta_path hook (no files written).
+EXECUTION_SUBPROCESS = "subprocess"
+EXECUTION_INPROCESS = "inprocess"
+EXECUTION_MODES = (EXECUTION_SUBPROCESS, EXECUTION_INPROCESS)
+
+# Sandbox and deadline of the current worker process, assigned by
+# _init_sandbox_worker.
+_worker_sandbox = None
+_worker_timeout = None
+# Test runner of the current worker process, assigned by _init_inprocess_worker.
+_worker_runner = None
 
 
 def read_source(path: str) -> str:
@@ -36,97 +162,569 @@ def write_source(path: str, source: str) -> None:
         f.write(source)
 
 
+def code_fingerprint(source: str) -> Optional[str]:
+    """
+    Hash of the bytecode `source` compiles to, ignoring file names and line
+    numbers, or None if it does not compile. Two sources with the same
+    fingerprint behave identically.
+    """
+    try:
+        code = compile(source, "<mutant>", "exec")
+    except SyntaxError:
+        return None
+    digest = hashlib.sha256()
+    _hash_code(code, digest)
+    return digest.hexdigest()
+
+
+def _hash_code(code, digest) -> None:
+    for attr in (
+        "co_argcount",
+        "co_posonlyargcount",
+        "co_kwonlyargcount",
+        "co_flags",
+        "co_name",
+        "co_names",
+        "co_varnames",
+        "co_freevars",
+        "co_cellvars",
+    ):
+        digest.update(repr(getattr(code, attr, None)).encode())
+    digest.update(code.co_code)
+    digest.update(getattr(code, "co_exceptiontable", b""))
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _hash_code(const, digest)
+        else:
+            # type matters: 1 == 1.0 == True, but they are different constants
+            digest.update(f"{type(const).__name__}:{const!r}".encode())
+
+
+def generate_mutants(
+    source: str,
+    operators: Sequence[Type[MutationOperator]],
+) -> Iterator[Mutant]:
+    """
+    Lazily yield every mutant of `source` for the given operators, grouped
+    by operator in the order given.
+
+    The source is parsed once and all mutation points are found in a single
+    traversal; each mutant is then produced by patching the shared tree in
+    place, unparsing it and undoing the patch, so only one mutant's source
+    is alive at a time.
+
+    Mutants are compiled and compared by bytecode fingerprint against the
+    original and all earlier mutants of the file, and flagged as
+    `equivalent` or `duplicate_of` accordingly.
+    """
+    tree = ast.parse(source)
+    points = collect_mutation_points(tree, operators)
+    original = code_fingerprint(astor.to_source(tree))
+    seen: Dict[str, Tuple[Type[MutationOperator], int]] = {}
+    for operator_cls in operators:
+        for index, point in enumerate(points[operator_cls]):
+            undo = point.apply()
+            try:
+                mutated_source = astor.to_source(tree)
+            finally:
+                undo()
+            mutant = Mutant(operator_cls, index, point.lines, mutated_source)
+            fingerprint = code_fingerprint(mutated_source)
+            if fingerprint is not None:
+                if fingerprint == original:
+                    mutant.equivalent = True
+                elif fingerprint in seen:
+                    mutant.duplicate_of = seen[fingerprint]
+                else:
+                    seen[fingerprint] = (operator_cls, index)
+            yield mutant
+
+
 def generate_mutants_for_file(
     operator_cls: Type[MutationOperator],
     source: str,
-) -> List[ast.AST]:
+) -> Iterator[Mutant]:
     """
-    Return list of mutated ASTs (one per occurrence).
+    Lazily yield the mutants of `source` for one operator (one per occurrence).
     """
-    tree = ast.parse(source)
-    total = operator_cls.count_applicable(tree)
-    mutants = []
-    for i in range(total):
-        tree_copy = ast.parse(source)
-        mutator = operator_cls(target_index=i)
-        mutated_tree = mutator.visit(tree_copy)
-        if mutator.mutated:
-            ast.fix_missing_locations(mutated_tree)
-            mutants.append(mutated_tree)
-    return mutants
+    return generate_mutants(source, [operator_cls])
 
 
-def run_tests_in_temp_dir(temp_dir: str) -> subprocess.CompletedProcess:
+def run_tests_in_temp_dir(
+    temp_dir: str,
+    tests: Optional[Iterable[str]] = None,
+    timeout: Optional[float] = None,
+) -> subprocess.CompletedProcess:
     """
-    Run pytest in the given temp directory.
+    Run pytest in the given temp directory, limited to `tests` if given.
+    Stops at the first failure: one failing test is enough to kill a mutant.
+    Raises subprocess.TimeoutExpired (after killing pytest) past `timeout`.
+
+    Bytecode caching is disabled: sandboxes rewrite the same module over and
+    over, and a mutant of identical size written within the same second
+    would otherwise be shadowed by the previous mutant's stale .pyc.
     """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
     return subprocess.run(
-        ["pytest", "-q"],
+        ["pytest", "-q", "-x", "-rf", "-p", "no:cacheprovider", *(tests or ())],
         cwd=temp_dir,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
+        env=env,
+        timeout=timeout,
+    )
+
+
+def measure_baseline_duration(project_root: str) -> float:
+    """
+    Time one run of the whole, unmutated suite. Raises RuntimeError if it
+    does not pass, since no mutant verdict would be meaningful then.
+    """
+    start = time.perf_counter()
+    proc = run_tests_in_temp_dir(project_root)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(
+            "Test suite fails on the unmutated code:\n" + proc.stdout + proc.stderr
+        )
+    return elapsed
+
+
+def system_load() -> float:
+    """One-minute load average, or 0.0 where the platform has none."""
+    try:
+        return os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return 0.0
+
+
+def mutant_deadline(
+    baseline_duration: float,
+    workers: int = 1,
+    cpus: Optional[int] = None,
+    load: Optional[float] = None,
+) -> float:
+    """
+    Deadline for one mutant run. The baseline is measured on a single run,
+    so it is stretched by the CPU contention `workers` concurrent runs meet
+    on top of the machine's current `load`.
+    """
+    cpus = cpus or os.cpu_count() or 1
+    if load is None:
+        load = system_load()
+    contention = max(1.0, (max(workers, 1) + load) / cpus)
+    return baseline_duration * TIMEOUT_FACTOR * contention + TIMEOUT_GRACE_SECONDS
+
+
+def iter_mutant_jobs(
+    project_root: str,
+    relative_file: str,
+    operators: Sequence[Type[MutationOperator]],
+    level_label: str,
+    coverage: Optional[CoverageMap] = None,
+    history: Optional[KillHistory] = None,
+) -> Iterator[MutantJob]:
+    """
+    Lazily yield one job per mutant of `relative_file` for the given operators.
+    With a coverage map, each job is limited to the tests covering its lines;
+    with a kill history, those tests are ordered likeliest killer first.
+    """
+    abs_file = os.path.join(project_root, relative_file)
+    original_source = read_source(abs_file)
+    for mutant in generate_mutants(original_source, operators):
+        operator_name = f"{level_label}:{mutant.operator_cls.__name__}"
+        tests = None
+        if coverage is not None:
+            tests = coverage.tests_for(relative_file, *mutant.lines)
+            if history is not None:
+                tests = history.rank(operator_name, relative_file, tests)
+            tests = tuple(tests)
+        duplicate_of = None
+        if mutant.duplicate_of is not None:
+            op, index = mutant.duplicate_of
+            duplicate_of = f"{level_label}:{op.__name__} #{index}"
+        yield MutantJob(
+            operator_name=operator_name,
+            file_path=relative_file,
+            index=mutant.index,
+            mutated_source=mutant.source,
+            lines=mutant.lines,
+            tests=tests,
+            equivalent=mutant.equivalent,
+            duplicate_of=duplicate_of,
+        )
+
+
+def build_mutant_result(
+    job: MutantJob,
+    returncode: int,
+    stdout: str,
+    stderr: str,
+) -> MutantResult:
+    killed = returncode != 0
+    error = False
+    msg = ""
+    if returncode not in (0, 1):
+        # abnormal error (e.g., syntax), mark separately
+        error = True
+        msg = stderr
+
+    return MutantResult(
+        operator_name=job.operator_name,
+        file_path=job.file_path,
+        index=job.index,
+        killed=killed,
+        error=error,
+        message=msg if error else stdout,
+        tests=job.tests,
+        killing_test=killing_test_from_output(stdout) if killed else None,
+    )
+
+
+def timeout_result(job: MutantJob, timeout: float) -> MutantResult:
+    return MutantResult(
+        operator_name=job.operator_name,
+        file_path=job.file_path,
+        index=job.index,
+        killed=True,
+        error=False,
+        message=f"Test run exceeded the {timeout:.1f}s deadline.",
+        tests=job.tests,
+        timed_out=True,
+    )
+
+
+def run_job_tests(
+    temp_dir: str,
+    job: MutantJob,
+    timeout: Optional[float] = None,
+) -> MutantResult:
+    try:
+        proc = run_tests_in_temp_dir(temp_dir, job.tests, timeout)
+    except subprocess.TimeoutExpired:
+        return timeout_result(job, timeout)
+    return build_mutant_result(job, proc.returncode, proc.stdout, proc.stderr)
+
+
+def redundant_result(job: MutantJob) -> Optional[MutantResult]:
+    """
+    Result for an equivalent or duplicate mutant, or None if it must run.
+    """
+    if not job.equivalent and job.duplicate_of is None:
+        return None
+    if job.equivalent:
+        message = "Compiles to the same code as the original module."
+    else:
+        message = f"Compiles to the same code as {job.duplicate_of}."
+    return MutantResult(
+        operator_name=job.operator_name,
+        file_path=job.file_path,
+        index=job.index,
+        killed=False,
+        error=False,
+        message=message,
+        equivalent=job.equivalent,
+        duplicate=not job.equivalent,
+    )
+
+
+def no_coverage_result(job: MutantJob) -> Optional[MutantResult]:
+    """
+    Result for a mutant whose lines no test executes, or None if it must run.
+    """
+    if job.tests is None or job.tests:
+        return None
+    return MutantResult(
+        operator_name=job.operator_name,
+        file_path=job.file_path,
+        index=job.index,
+        killed=False,
+        error=False,
+        message="",
+        no_coverage=True,
+    )
+
+
+def run_mutant_in_copy(
+    project_root: str,
+    job: MutantJob,
+    timeout: Optional[float] = None,
+) -> MutantResult:
+    """
+    Copy the project into a temp dir, install the mutant and run the tests.
+    Module-level so it can be pickled into worker processes.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # copy entire project into temp_dir
+        for item in os.listdir(project_root):
+            s = os.path.join(project_root, item)
+            d = os.path.join(temp_dir, item)
+            if os.path.isdir(s):
+                shutil.copytree(s, d)
+            else:
+                shutil.copy2(s, d)
+
+        # overwrite the target file with mutated version
+        mutated_file_path = os.path.join(temp_dir, job.file_path)
+        write_source(mutated_file_path, job.mutated_source)
+
+        return run_job_tests(temp_dir, job, timeout)
+
+
+def prepare_sandbox(project_root: str, sandbox: str) -> str:
+    """
+    Create a pristine copy of the project at `sandbox`, leaving out VCS data,
+    caches and assets the tests never read. Done once per worker.
+    """
+    shutil.copytree(project_root, sandbox, ignore=SANDBOX_IGNORE)
+    return sandbox
+
+
+def run_mutant_in_sandbox(
+    sandbox: str,
+    job: MutantJob,
+    timeout: Optional[float] = None,
+) -> MutantResult:
+    """
+    Swap the mutated module into a prepared sandbox, run the tests and put
+    the original module back, so the sandbox is pristine for the next job.
+    """
+    target = os.path.join(sandbox, job.file_path)
+    original_source = read_source(target)
+    write_source(target, job.mutated_source)
+    try:
+        return run_job_tests(sandbox, job, timeout)
+    finally:
+        write_source(target, original_source)
+
+
+def _init_sandbox_worker(sandboxes, timeout: Optional[float]) -> None:
+    global _worker_sandbox, _worker_timeout
+    _worker_sandbox = sandboxes.get()
+    _worker_timeout = timeout
+
+
+def _run_in_worker_sandbox(job: MutantJob) -> MutantResult:
+    return run_mutant_in_sandbox(_worker_sandbox, job, _worker_timeout)
+
+
+def _init_inprocess_worker(project_root: str, timeout: Optional[float]) -> None:
+    global _worker_runner
+    _worker_runner = InProcessTestRunner(project_root, timeout=timeout)
+
+
+def _run_in_worker_process(job: MutantJob) -> MutantResult:
+    returncode, stdout, stderr = _worker_runner.run(
+        job.file_path, job.mutated_source, job.tests or ()
+    )
+    if _worker_runner.timed_out:
+        return timeout_result(job, _worker_runner.timeout)
+    return build_mutant_result(job, returncode, stdout, stderr)
+
+
+def _run_jobs_in_pool(
+    jobs: Iterable[MutantJob],
+    workers: int,
+    run_job,
+    retry: Optional[Callable[[List[MutantJob]], List[MutantResult]]] = None,
+    **pool_kwargs,
+) -> List[MutantResult]:
+    """
+    Run jobs on `workers` processes and return results in job order.
+
+    At most JOBS_IN_FLIGHT_PER_WORKER * workers jobs are submitted at any
+    time, so mutants are generated only as fast as they are consumed.
+
+    A run that times out may only have been starved by its neighbours, so
+    once the pool is done the timed-out jobs are handed to `retry`, which
+    runs them one at a time; only its verdict counts.
+    """
+    results: Dict[int, MutantResult] = {}
+    max_pending = workers * JOBS_IN_FLIGHT_PER_WORKER
+    pending: Dict[Future, Tuple[int, MutantJob]] = {}
+    timed_out: Dict[int, MutantJob] = {}
+
+    def collect(done: Iterable[Future]) -> None:
+        for future in done:
+            seq, job = pending.pop(future)
+            results[seq] = future.result()
+            if retry is not None and results[seq].timed_out:
+                timed_out[seq] = job
+
+    with ProcessPoolExecutor(max_workers=workers, **pool_kwargs) as pool:
+        for seq, job in enumerate(jobs):
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[pool.submit(run_job, job)] = (seq, job)
+        collect(wait(pending).done)
+
+    if timed_out:
+        retried = sorted(timed_out)
+        for seq, result in zip(retried, retry([timed_out[seq] for seq in retried])):
+            results[seq] = result
+    return [results[seq] for seq in range(len(results))]
+
+
+def execute_mutant_jobs(
+    project_root: str,
+    jobs: Iterable[MutantJob],
+    workers: int = 1,
+    workspace: str = WORKSPACE_SANDBOX,
+    execution: str = EXECUTION_SUBPROCESS,
+    timeout: Optional[float] = None,
+) -> List[MutantResult]:
+    """
+    Run jobs on `workers` processes and return results in job order.
+    Equivalent and duplicate mutants, and those no test covers, are reported
+    as such without being executed.
+    A job running longer than `timeout` seconds is aborted and its worker
+    carries on with the next job; with several workers it is re-run alone
+    afterwards and only reported as timed out if it overruns again.
+    """
+    return resolve_then_execute(
+        jobs,
+        lambda job: redundant_result(job) or no_coverage_result(job),
+        lambda runnable: _execute_jobs(
+            project_root, runnable, workers, workspace, execution, timeout
+        ),
     )
 
 
+def resolve_then_execute(
+    jobs: Iterable[MutantJob],
+    resolve: Callable[[MutantJob], Optional[MutantResult]],
+    execute: Callable[[Iterable[MutantJob]], List[MutantResult]],
+) -> List[MutantResult]:
+    """
+    Settle jobs with `resolve` where possible and send the rest through
+    `execute`, keeping the results in job order.
+    """
+    resolved: Dict[int, MutantResult] = {}
+    total = 0
+
+    def unresolved() -> Iterator[MutantJob]:
+        nonlocal total
+        for seq, job in enumerate(jobs):
+            total = seq + 1
+            result = resolve(job)
+            if result is None:
+                yield job
+            else:
+                resolved[seq] = result
+
+    executed = iter(execute(unresolved()))
+    return [
+        resolved[seq] if seq in resolved else next(executed)
+        for seq in range(total)
+    ]
+
+
+def _execute_jobs(
+    project_root: str,
+    jobs: Iterable[MutantJob],
+    workers: int,
+    workspace: str,
+    execution: str,
+    timeout: Optional[float],
+) -> List[MutantResult]:
+    """
+    In-process execution needs no workspace: the project tree is only read,
+    mutants reach the tests through an import hook. It always runs in worker
+    processes (even for workers=1) so the caller's interpreter stays clean.
+    """
+    if workspace not in WORKSPACE_MODES:
+        raise ValueError(f"Unknown workspace mode {workspace!r}")
+    if execution not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode {execution!r}")
+
+    if execution == EXECUTION_INPROCESS:
+
+        def run_inprocess(batch: Iterable[MutantJob], processes: int, retry=None):
+            return _run_jobs_in_pool(
+                batch,
+                processes,
+                _run_in_worker_process,
+                retry=retry,
+                initializer=_init_inprocess_worker,
+                initargs=(project_root, timeout),
+            )
+
+        if workers <= 1:
+            return run_inprocess(jobs, 1)
+        return run_inprocess(jobs, workers, lambda retried: run_inprocess(retried, 1))
+
+    if workspace == WORKSPACE_COPY:
+        run_job = functools.partial(run_mutant_in_copy, project_root, timeout=timeout)
+        if workers <= 1:
+            return [run_job(job) for job in jobs]
+        return _run_jobs_in_pool(
+            jobs, workers, run_job, retry=lambda retried: [run_job(job) for job in retried]
+        )
+
+    with tempfile.TemporaryDirectory(prefix="mutation-sandboxes-") as root:
+        sandboxes = [
+            prepare_sandbox(project_root, os.path.join(root, f"worker-{i}"))
+            for i in range(max(workers, 1))
+        ]
+
+        def run_serially(jobs: Iterable[MutantJob]) -> List[MutantResult]:
+            # workers restore their sandbox after every job, so once the
+            # pool is done any of them is pristine
+            return [run_mutant_in_sandbox(sandboxes[0], job, timeout) for job in jobs]
+
+        if workers <= 1:
+            return run_serially(jobs)
+
+        ctx = multiprocessing.get_context()
+        sandbox_queue = ctx.Queue()
+        for sandbox in sandboxes:
+            sandbox_queue.put(sandbox)
+        return _run_jobs_in_pool(
+            jobs,
+            workers,
+            _run_in_worker_sandbox,
+            retry=run_serially,
+            mp_context=ctx,
+            initializer=_init_sandbox_worker,
+            initargs=(sandbox_queue, timeout),
+        )
+
+
 def apply_mutation_and_run_tests(
     project_root: str,
     relative_file: str,
     operator_cls: Type[MutationOperator],
     level_label: str,
+    workers: int = 1,
+    workspace: str = WORKSPACE_SANDBOX,
+    execution: str = EXECUTION_SUBPROCESS,
+    coverage: Optional[CoverageMap] = None,
+    history: Optional[KillHistory] = None,
+    timeout: Optional[float] = None,
 ) -> List[MutantResult]:
     """
     For a given file and mutation operator, generate mutants,
     run tests, and determine which mutants are killed.
     """
-    abs_file = os.path.join(project_root, relative_file)
-    original_source = read_source(abs_file)
-    mutants = generate_mutants_for_file(operator_cls, original_source)
-
-    results: List[MutantResult] = []
-
-    for index, mutant_tree in enumerate(mutants):
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # copy entire project into temp_dir
-            for item in os.listdir(project_root):
-                s = os.path.join(project_root, item)
-                d = os.path.join(temp_dir, item)
-                if os.path.isdir(s):
-                    shutil.copytree(s, d)
-                else:
-                    shutil.copy2(s, d)
-
-            # overwrite the target file with mutated version
-            mutated_source = astor.to_source(mutant_tree)  # <-- CHANGED
-            mutated_file_path = os.path.join(temp_dir, relative_file)
-            write_source(mutated_file_path, mutated_source)
-
-            proc = run_tests_in_temp_dir(temp_dir)
-            killed = proc.returncode != 0
-            error = False
-            msg = ""
-            if proc.returncode not in (0, 1):
-                # abnormal error (e.g., syntax), mark separately
-                error = True
-                msg = proc.stderr
-
-            results.append(
-                MutantResult(
-                    operator_name=f"{level_label}:{operator_cls.__name__}",
-                    file_path=relative_file,
-                    index=index,
-                    killed=killed,
-                    error=error,
-                    message=msg if error else proc.stdout,
-                )
-            )
-
-    return results
+    jobs = iter_mutant_jobs(
+        project_root, relative_file, [operator_cls], level_label, coverage, history
+    )
+    return execute_mutant_jobs(
+        project_root,
+        jobs,
+        workers=workers,
+        workspace=workspace,
+        execution=execution,
+        timeout=timeout,
+    )
 
 
-def run_mutation_campaign(project_root: str) -> List[MutantResult]:
+def campaign_plan() -> List[Tuple[str, List[Type[MutationOperator]], str]]:
     """
-    Run a full mutation campaign across selected files and operators.
+    (file, operators, level label) triples making up a full campaign, in the
+    order their results are reported.
     """
 
     # Files mainly used for unit-level mutation:
@@ -141,45 +739,165 @@ def run_mutation_campaign(project_root: str) -> List[MutantResult]:
         os.path.join("app", "reporting.py"),
     ]
 
-    all_results: List[MutantResult] = []
-
+    plan = []
     for f in unit_files:
-        for op in UNIT_LEVEL_OPERATORS:
-            all_results.extend(
-                apply_mutation_and_run_tests(
-                    project_root=project_root,
-                    relative_file=f,
-                    operator_cls=op,
-                    level_label="UNIT",
-                )
-            )
-
+        plan.append((f, UNIT_LEVEL_OPERATORS, "UNIT"))
     for f in integration_files:
-        for op in INTEGRATION_LEVEL_OPERATORS:
-            all_results.extend(
-                apply_mutation_and_run_tests(
-                    project_root=project_root,
-                    relative_file=f,
-                    operator_cls=op,
-                    level_label="INT",
-                )
+        plan.append((f, INTEGRATION_LEVEL_OPERATORS, "INT"))
+    return plan
+
+
+# MutantResult fields that make up a cached verdict
+CACHED_FIELDS = ("killed", "error", "message", "no_coverage", "killing_test", "timed_out")
+
+
+def cached_result(job: MutantJob, entry: Dict) -> MutantResult:
+    return MutantResult(
+        operator_name=job.operator_name,
+        file_path=job.file_path,
+        index=job.index,
+        tests=job.tests,
+        cached=True,
+        **{name: entry[name] for name in CACHED_FIELDS},
+    )
+
+
+def prepare_campaign(
+    project_root: str,
+    coverage_guided: bool,
+    cache: Optional[ResultCache],
+    workers: int = 1,
+) -> Tuple[float, Optional[CoverageMap]]:
+    """
+    Per-mutant deadline for `workers` concurrent runs and coverage map (if
+    wanted) for this campaign. The baseline duration and the coverage map
+    are reused from the cache when neither the application nor the tests
+    changed.
+    """
+    setup = cache.setup if cache is not None else {}
+    if "baseline" not in setup:
+        setup["baseline"] = measure_baseline_duration(project_root)
+    coverage = None
+    if coverage_guided:
+        if "coverage" not in setup:
+            setup["coverage"] = collect_coverage_map(project_root).to_dict()
+        coverage = CoverageMap.from_dict(setup["coverage"])
+    if cache is not None:
+        cache.setup = setup
+    return mutant_deadline(setup["baseline"], workers), coverage
+
+
+def run_mutation_campaign(
+    project_root: str,
+    workers: int = 1,
+    workspace: str = WORKSPACE_SANDBOX,
+    execution: str = EXECUTION_SUBPROCESS,
+    coverage_guided: bool = True,
+    use_cache: bool = True,
+) -> List[MutantResult]:
+    """
+    Run a full mutation campaign across selected files and operators.
+
+    Mutants from every file/operator pair share one worker pool, so a
+    campaign with `workers` processes keeps all of them busy until the end.
+    When `coverage_guided`, per-test coverage is collected once up front and
+    each mutant runs only the tests that execute its lines, ordered by their
+    kill rate in previous campaigns (stored in HISTORY_FILE).
+
+    Every mutant gets a deadline derived from the duration of an unmutated
+    run and the number of workers, so mutants that never terminate are
+    reported as timeouts. Timeouts are confirmed by a serial re-run before
+    they are scored or cached.
+
+    With `use_cache`, verdicts are stored in CACHE_FILE keyed by the mutant's
+    inputs, and only mutants whose inputs changed since the last campaign
+    are executed.
+    """
+    cache = ResultCache.load(project_root) if use_cache else None
+    timeout, coverage = prepare_campaign(project_root, coverage_guided, cache, workers)
+    history = KillHistory.load(project_root)
+    jobs = (
+        job
+        for f, ops, level in campaign_plan()
+        for job in iter_mutant_jobs(project_root, f, ops, level, coverage, history)
+    )
+
+    keys: List[Optional[str]] = []
+
+    def resolve(job: MutantJob) -> Optional[MutantResult]:
+        redundant = redundant_result(job)
+        if redundant is not None:
+            keys.append(None)
+            return redundant
+        key = None
+        if cache is not None:
+            key = cache.key_for(
+                job.operator_name, job.file_path, job.mutated_source, job.tests
             )
+        keys.append(key)
+        entry = cache.get(key) if cache is not None else None
+        if entry is not None:
+            return cached_result(job, entry)
+        return no_coverage_result(job)
+
+    results = resolve_then_execute(
+        jobs,
+        resolve,
+        lambda runnable: _execute_jobs(
+            project_root, runnable, workers, workspace, execution, timeout
+        ),
+    )
 
-    return all_results
+    if cache is not None:
+        for key, result in zip(keys, results):
+            if key is not None and not result.cached:
+                cache.put(key, {name: getattr(result, name) for name in CACHED_FIELDS})
+        cache.save()
+    update_kill_history(history, (r for r in results if not r.cached))
+    return results
+
+
+def update_kill_history(history: KillHistory, results: Iterable[MutantResult]) -> None:
+    """
+    Fold a campaign's outcomes into the kill history and persist it.
+    Only runs with a known test order and a clear verdict are counted.
+    """
+    for r in results:
+        if not r.tests or r.error or (r.killed and r.killing_test is None):
+            continue
+        history.record(r.operator_name, r.file_path, r.tests, r.killing_test)
+    history.save()
 
 
 def summarize_results(results: List[MutantResult]) -> Dict[str, float]:
+    """
+    Count mutants per outcome. Timeouts are reported on their own but, like
+    failing tests, they detect the mutant and count towards the score.
+    Equivalent and duplicate mutants are reported separately and left out
+    of the score: no test could ever kill the former, and the latter are
+    already counted through the mutant they duplicate.
+    """
     total = len(results)
-    killed = sum(1 for r in results if r.killed)
-    survived = sum(1 for r in results if not r.killed and not r.error)
+    killed = sum(1 for r in results if r.killed and not r.timed_out)
+    timeout = sum(1 for r in results if r.timed_out)
+    survived = sum(1 for r in results if r.survived)
     errored = sum(1 for r in results if r.error)
+    no_coverage = sum(1 for r in results if r.no_coverage)
+    equivalent = sum(1 for r in results if r.equivalent)
+    duplicate = sum(1 for r in results if r.duplicate)
 
-    mutation_score = (killed / total) * 100 if total else 0.0
+    scored = total - equivalent - duplicate
+    mutation_score = ((killed + timeout) / scored) * 100 if scored else 0.0
 
     return {
         "total_mutants": total,
         "killed": killed,
+        "timeout": timeout,
         "survived": survived,
         "errored": errored,
+        "no_coverage": no_coverage,
+        "equivalent": equivalent,
+        "duplicate": duplicate,
+        "cached": sum(1 for r in results if r.cached),
         "mutation_score": mutation_score,
     }
@@ -1,32 +1,117 @@
 # mutation/operators.py
 import ast
-from typing import List, Tuple, Type
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type
 
 
-class MutationOperator(ast.NodeTransformer):
+@dataclass
+class MutationPoint:
+    """
+    One place in a tree where an operator can apply one mutation.
+    `site` is operator specific (e.g. which comparison of a chained Compare).
+    """
+    operator: Type["MutationOperator"]
+    node: ast.AST
+    site: Any
+    parent: Optional[ast.AST]
+    field: Optional[str]
+    position: Optional[int]
+
+    @property
+    def lines(self) -> Tuple[int, int]:
+        """(first, last) source line of the mutated node."""
+        return self.node.lineno, self.node.end_lineno or self.node.lineno
+
+    def apply(self) -> Callable[[], None]:
+        """Mutate the tree in place and return a function undoing it."""
+        return self.operator.apply(self)
+
+    def replace_node(self, new_node: ast.AST) -> Callable[[], None]:
+        """Put `new_node` where the point's node sits in its parent."""
+        slot = getattr(self.parent, self.field)
+        if self.position is None:
+            setattr(self.parent, self.field, new_node)
+            return lambda: setattr(self.parent, self.field, self.node)
+        slot[self.position] = new_node
+
+        def undo() -> None:
+            slot[self.position] = self.node
+
+        return undo
+
+
+class MutationOperator:
     """
     Base class for mutation operators.
-    We use an index-based approach to create one mutant per occurrence.
+    An operator looks at one node at a time: `sites` lists the mutations it
+    can make on that node and `apply` performs one of them in place,
+    returning a function that restores the original tree. Mutants are
+    numbered per operator in post-order (children before their parent).
     """
 
-    def __init__(self, target_index: int) -> None:
-        self.target_index = target_index
-        self.current_index = 0
-        self.mutated = False
+    @classmethod
+    def sites(cls, node: ast.AST) -> Sequence[Any]:
+        return ()
 
-    def _match(self) -> bool:
-        if self.current_index == self.target_index:
-            self.mutated = True
-            self.current_index += 1
-            return True
-        self.current_index += 1
-        return False
+    @classmethod
+    def apply(cls, point: MutationPoint) -> Callable[[], None]:
+        raise NotImplementedError
 
     @classmethod
     def count_applicable(cls, tree: ast.AST) -> int:
-        counter = cls(target_index=-1)
-        counter.visit(tree)
-        return counter.current_index
+        return len(collect_mutation_points(tree, [cls])[cls])
+
+
+def iter_nodes_postorder(
+    node: ast.AST,
+    parent: Optional[ast.AST] = None,
+    field: Optional[str] = None,
+    position: Optional[int] = None,
+) -> Iterator[Tuple[ast.AST, Optional[ast.AST], Optional[str], Optional[int]]]:
+    """
+    Yield (node, parent, field, position in field list) children first.
+    """
+    for name, value in ast.iter_fields(node):
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                if isinstance(item, ast.AST):
+                    yield from iter_nodes_postorder(item, node, name, i)
+        elif isinstance(value, ast.AST):
+            yield from iter_nodes_postorder(value, node, name, None)
+    yield node, parent, field, position
+
+
+def collect_mutation_points(
+    tree: ast.AST,
+    operators: Sequence[Type[MutationOperator]],
+) -> Dict[Type[MutationOperator], List[MutationPoint]]:
+    """
+    Find the mutation points of all operators in a single traversal.
+    """
+    points: Dict[Type[MutationOperator], List[MutationPoint]] = {
+        op: [] for op in operators
+    }
+    for node, parent, field, position in iter_nodes_postorder(tree):
+        for op in operators:
+            for site in op.sites(node):
+                points[op].append(
+                    MutationPoint(op, node, site, parent, field, position)
+                )
+    return points
+
+
+def _swap_attr(obj: Any, attr: str, value: Any) -> Callable[[], None]:
+    old = getattr(obj, attr)
+    setattr(obj, attr, value)
+    return lambda: setattr(obj, attr, old)
+
+
+def _call_name(call: ast.Call) -> Optional[str]:
+    if isinstance(call.func, ast.Name):
+        return call.func.id
+    if isinstance(call.func, ast.Attribute):
+        return call.func.attr
+    return None
 
 
 # -------- Unit-level operators --------
@@ -36,50 +121,52 @@ class ArithmeticOperatorReplacement(MutationOperator):
     Replace + with -, * with / and vice versa for BinOp nodes.
     """
 
-    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
-        self.generic_visit(node)
-        if isinstance(node.op, (ast.Add, ast.Sub, ast.Mult, ast.Div)):
-            if self._match():
-                if isinstance(node.op, ast.Add):
-                    node.op = ast.Sub()
-                elif isinstance(node.op, ast.Sub):
-                    node.op = ast.Add()
-                elif isinstance(node.op, ast.Mult):
-                    node.op = ast.Div()
-                elif isinstance(node.op, ast.Div):
-                    node.op = ast.Mult()
-        return node
+    SWAPS = {ast.Add: ast.Sub, ast.Sub: ast.Add, ast.Mult: ast.Div, ast.Div: ast.Mult}
+
+    @classmethod
+    def sites(cls, node: ast.AST) -> Sequence[Any]:
+        if isinstance(node, ast.BinOp) and type(node.op) in cls.SWAPS:
+            return (None,)
+        return ()
+
+    @classmethod
+    def apply(cls, point: MutationPoint) -> Callable[[], None]:
+        node = point.node
+        return _swap_attr(node, "op", cls.SWAPS[type(node.op)]())
 
 
 class RelationalOperatorReplacement(MutationOperator):
     """
     Replace relational operators: > < >= <= == != with another logically close variant.
+    One mutant per comparison operator, so `a < b < c` yields two.
     """
 
-    def visit_Compare(self, node: ast.Compare) -> ast.AST:
-        self.generic_visit(node)
-        new_ops = []
-        for op in node.ops:
-            if isinstance(op, (ast.Gt, ast.GtE, ast.Lt, ast.LtE, ast.Eq, ast.NotEq)):
-                if self._match():
-                    if isinstance(op, ast.Gt):
-                        new_ops.append(ast.GtE())
-                    elif isinstance(op, ast.GtE):
-                        new_ops.append(ast.Gt())
-                    elif isinstance(op, ast.Lt):
-                        new_ops.append(ast.LtE())
-                    elif isinstance(op, ast.LtE):
-                        new_ops.append(ast.Lt())
-                    elif isinstance(op, ast.Eq):
-                        new_ops.append(ast.NotEq())
-                    elif isinstance(op, ast.NotEq):
-                        new_ops.append(ast.Eq())
-                else:
-                    new_ops.append(op)
-            else:
-                new_ops.append(op)
-        node.ops = new_ops
-        return node
+    SWAPS = {
+        ast.Gt: ast.GtE,
+        ast.GtE: ast.Gt,
+        ast.Lt: ast.LtE,
+        ast.LtE: ast.Lt,
+        ast.Eq: ast.NotEq,
+        ast.NotEq: ast.Eq,
+    }
+
+    @classmethod
+    def sites(cls, node: ast.AST) -> Sequence[Any]:
+        if not isinstance(node, ast.Compare):
+            return ()
+        return [i for i, op in enumerate(node.ops) if type(op) in cls.SWAPS]
+
+    @classmethod
+    def apply(cls, point: MutationPoint) -> Callable[[], None]:
+        ops = point.node.ops
+        i = point.site
+        old = ops[i]
+        ops[i] = cls.SWAPS[type(old)]()
+
+        def undo() -> None:
+            ops[i] = old
+
+        return undo
 
 
 class LogicalConnectorReplacement(MutationOperator):
@@ -87,15 +174,18 @@ class LogicalConnectorReplacement(MutationOperator):
     Replace 'and' with 'or' and vice versa in BoolOp nodes.
     """
 
-    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
-        self.generic_visit(node)
-        if isinstance(node.op, (ast.And, ast.Or)):
-            if self._match():
-                if isinstance(node.op, ast.And):
-                    node.op = ast.Or()
-                else:
-                    node.op = ast.And()
-        return node
+    SWAPS = {ast.And: ast.Or, ast.Or: ast.And}
+
+    @classmethod
+    def sites(cls, node: ast.AST) -> Sequence[Any]:
+        if isinstance(node, ast.BoolOp) and type(node.op) in cls.SWAPS:
+            return (None,)
+        return ()
+
+    @classmethod
+    def apply(cls, point: MutationPoint) -> Callable[[], None]:
+        node = point.node
+        return _swap_attr(node, "op", cls.SWAPS[type(node.op)]())
 
 
 # -------- Integration-level operators --------
@@ -108,18 +198,25 @@ class ParameterSwapMutator(MutationOperator):
 
     TARGET_FUNC_NAMES = {"compute_grade_with_bonus"}
 
-    def visit_Call(self, node: ast.Call) -> ast.AST:
-        self.generic_visit(node)
-        func_name = None
-        if isinstance(node.func, ast.Name):
-            func_name = node.func.id
-        elif isinstance(node.func, ast.Attribute):
-            func_name = node.func.attr
+    @classmethod
+    def sites(cls, node: ast.AST) -> Sequence[Any]:
+        if (
+            isinstance(node, ast.Call)
+            and _call_name(node) in cls.TARGET_FUNC_NAMES
+            and len(node.args) >= 2
+        ):
+            return (None,)
+        return ()
+
+    @classmethod
+    def apply(cls, point: MutationPoint) -> Callable[[], None]:
+        args = point.node.args
+
+        def swap() -> None:
+            args[0], args[1] = args[1], args[0]
 
-        if func_name in self.TARGET_FUNC_NAMES and len(node.args) >= 2:
-            if self._match():
-                node.args[0], node.args[1] = node.args[1], node.args[0]
-        return node
+        swap()
+        return swap
 
 
 class CallDeletionMutator(MutationOperator):
@@ -130,20 +227,19 @@ class CallDeletionMutator(MutationOperator):
 
     TARGET_FUNC_NAMES = {"record_score_for_enrollment"}
 
-    def visit_Expr(self, node: ast.Expr) -> ast.AST:
-        self.generic_visit(node)
-        if isinstance(node.value, ast.Call):
-            func = node.value.func
-            func_name = None
-            if isinstance(func, ast.Name):
-                func_name = func.id
-            elif isinstance(func, ast.Attribute):
-                func_name = func.attr
+    @classmethod
+    def sites(cls, node: ast.AST) -> Sequence[Any]:
+        if (
+            isinstance(node, ast.Expr)
+            and isinstance(node.value, ast.Call)
+            and _call_name(node.value) in cls.TARGET_FUNC_NAMES
+        ):
+            return (None,)
+        return ()
 
-            if func_name in self.TARGET_FUNC_NAMES:
-                if self._match():
-                    return ast.Pass()
-        return node
+    @classmethod
+    def apply(cls, point: MutationPoint) -> Callable[[], None]:
+        return point.replace_node(ast.Pass())
 
 
 class ReturnValueModificationMutator(MutationOperator):
@@ -152,15 +248,20 @@ class ReturnValueModificationMutator(MutationOperator):
     For report generation / grading, we can tweak a dict or string.
     """
 
-    def visit_Return(self, node: ast.Return) -> ast.AST:
-        self.generic_visit(node)
-        # Apply only to functions returning a dict or simple variable
-        if self._match():
-            # Simple heuristic: wrap in a dummy expression or replace with None
-            if node.value is not None:
-                # Replace return X with return None (breaking the contract)
-                node.value = ast.Constant(value=None)
-        return node
+    @classmethod
+    def sites(cls, node: ast.AST) -> Sequence[Any]:
+        if isinstance(node, ast.Return):
+            return (None,)
+        return ()
+
+    @classmethod
+    def apply(cls, point: MutationPoint) -> Callable[[], None]:
+        node = point.node
+        # Replace return X with return None (breaking the contract);
+        # a bare `return` is left as is.
+        if node.value is None:
+            return lambda: None
+        return _swap_attr(node, "value", ast.Constant(value=None))
 
 
 # List of operator classes for convenience
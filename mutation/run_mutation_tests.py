@@ -2,31 +2,91 @@
 """
 Run this as:
 
-    python -m mutation.run_mutation_tests
+    python -m mutation.run_mutation_tests [-j WORKERS]
 
 from the project root (course_mgmt_project).
 """
+import argparse
 import os
-from .mutator import run_mutation_campaign, summarize_results
+from .mutator import (
+    EXECUTION_MODES,
+    EXECUTION_SUBPROCESS,
+    WORKSPACE_MODES,
+    WORKSPACE_SANDBOX,
+    run_mutation_campaign,
+    summarize_results,
+)
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the mutation campaign.")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes running mutants (default: CPU count)",
+    )
+    parser.add_argument(
+        "--workspace",
+        choices=WORKSPACE_MODES,
+        default=WORKSPACE_SANDBOX,
+        help="'sandbox' reuses one project copy per worker and only swaps the "
+        "mutated module; 'copy' copies the whole project for every mutant",
+    )
+    parser.add_argument(
+        "--execution",
+        choices=EXECUTION_MODES,
+        default=EXECUTION_SUBPROCESS,
+        help="'subprocess' starts pytest per mutant; 'inprocess' keeps pytest "
+        "loaded in each worker and imports mutants through an import hook",
+    )
+    parser.add_argument(
+        "--no-coverage-selection",
+        dest="coverage_guided",
+        action="store_false",
+        help="run the whole suite for every mutant instead of only the tests "
+        "covering the mutated lines",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="ignore cached verdicts and re-run every mutant",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    print(f"Running mutation campaign in: {project_root}")
-    results = run_mutation_campaign(project_root)
+    print(f"Running mutation campaign in: {project_root} ({args.workers} workers)")
+    results = run_mutation_campaign(
+        project_root,
+        workers=args.workers,
+        workspace=args.workspace,
+        execution=args.execution,
+        coverage_guided=args.coverage_guided,
+        use_cache=args.use_cache,
+    )
     summary = summarize_results(results)
 
     print("\n=== Mutation Testing Summary ===")
     print(f"Total mutants: {summary['total_mutants']}")
     print(f"Killed      : {summary['killed']}")
+    print(f"Timeout     : {summary['timeout']}")
     print(f"Survived    : {summary['survived']}")
     print(f"Errored     : {summary['errored']}")
+    print(f"No coverage : {summary['no_coverage']}")
+    print(f"Equivalent  : {summary['equivalent']}")
+    print(f"Duplicate   : {summary['duplicate']}")
+    print(f"From cache  : {summary['cached']}")
     print(f"Mutation score: {summary['mutation_score']:.2f}%")
 
     # Optional: list surviving mutants for analysis
     print("\n=== Surviving Mutants ===")
     for r in results:
-        if not r.killed and not r.error:
+        if r.survived:
             print(
                 f"- {r.operator_name} in {r.file_path} occurrence #{r.index}"
             )
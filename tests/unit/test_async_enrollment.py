@@ -0,0 +1,115 @@
+# tests/unit/test_async_enrollment.py
+import asyncio
+
+import pytest
+from app.async_repository import AsyncInMemoryRepository, AsyncSQLiteRepository
+from app.async_enrollment import async_enroll, async_record_score
+from app.enrollment import enroll_student_in_course
+from app.sqlite_repository import SQLiteRepository
+from app.models import Student, Course
+from app.utils import BusinessRuleViolationError, DuplicateEntityError, EntityNotFoundError
+
+
+def run_with_repo(kind, scenario):
+    async def main():
+        repo = AsyncInMemoryRepository() if kind == "memory" else AsyncSQLiteRepository()
+        await repo.add_student(Student(student_id="S1", name="Alice", year=3))
+        await repo.add_course(Course(course_code="C1", title="ST", credits=3, max_capacity=1))
+        try:
+            return await scenario(repo)
+        finally:
+            if kind == "sqlite":
+                await repo.close()
+
+    return asyncio.run(main())
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repo_kind(request):
+    return request.param
+
+
+def test_async_enroll_and_record_score(repo_kind):
+    async def scenario(repo):
+        enrollment = await async_enroll(repo, "S1", "C1")
+        assert (enrollment.student_id, enrollment.course_code) == ("S1", "C1")
+        graded = await async_record_score(repo, "S1", "C1", 78, bonus=5)
+        assert (graded.score, graded.grade, graded.passed) == (78, "B", True)
+        stored = await repo.get_enrollment("S1", "C1")
+        assert (stored.score, stored.grade, stored.passed) == (78, "B", True)
+
+    run_with_repo(repo_kind, scenario)
+
+
+def test_async_enroll_errors(repo_kind):
+    async def scenario(repo):
+        with pytest.raises(EntityNotFoundError):
+            await async_enroll(repo, "S1", "C9")
+        with pytest.raises(EntityNotFoundError):
+            await async_enroll(repo, "S9", "C1")
+        await repo.add_course(Course(course_code="C2", title="Algo", credits=4))
+        await async_enroll(repo, "S1", "C2")
+        with pytest.raises(DuplicateEntityError):
+            await async_enroll(repo, "S1", "C2")
+        await async_enroll(repo, "S1", "C1")
+        with pytest.raises(BusinessRuleViolationError):
+            await async_enroll(repo, "S1", "C1")
+        with pytest.raises(ValueError):
+            await async_record_score(repo, "S1", "C1", 101)
+        with pytest.raises(EntityNotFoundError):
+            await async_record_score(repo, "S9", "C1", 50)
+
+    run_with_repo(repo_kind, scenario)
+
+
+def test_async_enroll_concurrent_calls_respect_capacity(repo_kind):
+    async def scenario(repo):
+        await repo.add_course(Course(course_code="HOT", title="Hot", credits=3, max_capacity=10))
+        for i in range(40):
+            await repo.add_student(Student(student_id=f"T{i}", name=f"T{i}", year=1))
+        results = await asyncio.gather(
+            *(async_enroll(repo, f"T{i}", "HOT") for i in range(40)),
+            return_exceptions=True,
+        )
+        assert sum(not isinstance(r, Exception) for r in results) == 10
+        assert all(
+            isinstance(r, BusinessRuleViolationError)
+            for r in results
+            if isinstance(r, Exception)
+        )
+        assert await repo.count_enrollments_for_course("HOT") == 10
+
+    run_with_repo(repo_kind, scenario)
+
+
+def test_async_enroll_other_courses_are_not_blocked(repo_kind):
+    async def scenario(repo):
+        await repo.add_course(Course(course_code="C2", title="Algo", credits=4))
+        async with repo.course_lock("C1"):
+            enrollment = await asyncio.wait_for(async_enroll(repo, "S1", "C2"), timeout=5)
+        assert enrollment.course_code == "C2"
+
+    run_with_repo(repo_kind, scenario)
+
+
+def test_async_sqlite_shares_the_database_with_sqlite_repository(tmp_path):
+    path = str(tmp_path / "school.db")
+    other = SQLiteRepository(path)
+    other.add_student(Student(student_id="S1", name="Alice", year=3))
+    other.add_student(Student(student_id="S2", name="Bob", year=2))
+    other.add_course(Course(course_code="C1", title="ST", credits=3, max_capacity=1))
+
+    async def main():
+        repo = AsyncSQLiteRepository(path)
+        try:
+            await async_enroll(repo, "S1", "C1")
+            await async_record_score(repo, "S1", "C1", 91)
+        finally:
+            await repo.close()
+
+    asyncio.run(main())
+    assert other.get_enrollment("S1", "C1").grade == "A"
+    # the seat taken through the async front-end counts for every connection
+    with pytest.raises(BusinessRuleViolationError):
+        enroll_student_in_course(other, "S2", "C1")
+    other.close()
@@ -0,0 +1,102 @@
+# tests/unit/test_cache.py
+import json
+
+import pytest
+from mutation.cache import CACHE_FILE, CACHE_VERSION, ResultCache
+
+OP = "UNIT:ArithmeticOperatorReplacement"
+GRADING = "app/grading.py"
+T_GRADING = "tests/unit/test_grading.py::test_grade"
+MUTANT = "def f():\n    return 1 - 1\n"
+
+
+@pytest.fixture
+def project(tmp_path):
+    for relative, text in (
+        ("app/grading.py", "def f():\n    return 1 + 1\n"),
+        ("app/models.py", "class Student:\n    pass\n"),
+        ("tests/__init__.py", ""),
+        ("tests/unit/test_grading.py", "def test_grade():\n    pass\n"),
+        ("tests/unit/test_models.py", "def test_model():\n    pass\n"),
+        ("pytest.ini", "[pytest]\n"),
+    ):
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return tmp_path
+
+
+def key(project, tests=(T_GRADING,), mutant=MUTANT):
+    return ResultCache.load(str(project)).key_for(OP, GRADING, mutant, tests)
+
+
+def test_key_is_stable_for_unchanged_inputs(project):
+    assert key(project) == key(project)
+
+
+def test_key_changes_with_mutant_and_selection(project):
+    assert key(project, mutant=MUTANT.replace("-", "*")) != key(project)
+    assert key(project, tests=None) != key(project)
+
+
+def test_key_ignores_the_original_of_the_mutated_module(project):
+    before = key(project)
+    (project / "app" / "grading.py").write_text("def f():\n    return 2\n")
+    assert key(project) == before
+
+
+@pytest.mark.parametrize(
+    "changed",
+    ["app/models.py", "tests/unit/test_grading.py", "tests/__init__.py", "pytest.ini"],
+)
+def test_key_changes_when_an_input_changes(project, changed):
+    before = key(project)
+    (project / changed).write_text("# edited\n")
+    assert key(project) != before
+
+
+def test_key_ignores_unselected_test_modules(project):
+    before = key(project)
+    (project / "tests" / "unit" / "test_models.py").write_text("# edited\n")
+    assert key(project) == before
+    # a whole-suite run depends on every test module
+    assert key(project, tests=None) != before
+
+
+def test_verdicts_and_setup_survive_save_and_load(project):
+    cache = ResultCache.load(str(project))
+    k = cache.key_for(OP, GRADING, MUTANT, (T_GRADING,))
+    cache.put(k, {"killed": True})
+    cache.setup = {"baseline": 1.5}
+    cache.save()
+
+    loaded = ResultCache.load(str(project))
+    assert loaded.get(k) == {"killed": True}
+    assert loaded.setup == {"baseline": 1.5}
+
+
+def test_setup_is_dropped_when_the_tree_changes(project):
+    cache = ResultCache.load(str(project))
+    cache.setup = {"baseline": 1.5}
+    cache.save()
+    (project / "app" / "models.py").write_text("# edited\n")
+    assert ResultCache.load(str(project)).setup == {}
+
+
+def test_save_keeps_only_entries_used_by_the_campaign(project):
+    cache = ResultCache.load(str(project))
+    cache.put("old", {"killed": False})
+    cache.put("kept", {"killed": True})
+    cache.save()
+
+    cache = ResultCache.load(str(project))
+    cache.get("kept")
+    cache.save()
+    assert set(ResultCache.load(str(project)).results) == {"kept"}
+
+
+def test_other_cache_version_is_ignored(project):
+    (project / CACHE_FILE).write_text(
+        json.dumps({"version": CACHE_VERSION + 1, "results": {"k": {}}})
+    )
+    assert ResultCache.load(str(project)).results == {}
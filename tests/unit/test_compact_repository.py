@@ -0,0 +1,94 @@
+# tests/unit/test_compact_repository.py
+import pytest
+from app.compact_repository import CompactRepository, EnrollmentView
+from app.models import Student, Course, Enrollment
+from app.enrollment import bulk_enroll, enroll_student_in_course, record_score_for_enrollment
+from app.reporting import ReportCache, generate_student_report
+from app.repository import InMemoryRepository
+from app.grading import compute_gpa
+from app.utils import BusinessRuleViolationError, DuplicateEntityError, EntityNotFoundError
+
+
+def create_repo():
+    repo = CompactRepository()
+    repo.add_student(Student(student_id="S1", name="Alice", year=3))
+    repo.add_student(Student(student_id="S2", name="Bob", year=2))
+    repo.add_course(Course(course_code="C1", title="ST", credits=3, max_capacity=2))
+    repo.add_course(Course(course_code="C2", title="Algo", credits=4))
+    return repo
+
+
+def test_compact_students_and_courses():
+    repo = create_repo()
+    assert repo.get_student("S2").name == "Bob"
+    assert [s.student_id for s in repo.iter_students()] == ["S1", "S2"]
+    assert [c.course_code for c in repo.list_courses()] == ["C1", "C2"]
+    with pytest.raises(DuplicateEntityError):
+        repo.add_student(Student(student_id="S1", name="Alice", year=3))
+    with pytest.raises(DuplicateEntityError):
+        repo.add_course(Course(course_code="C2", title="Algo", credits=4))
+    with pytest.raises(EntityNotFoundError):
+        repo.get_student("S9")
+    with pytest.raises(EntityNotFoundError):
+        repo.get_course("C9")
+
+
+def test_compact_enrollments_are_views_in_insertion_order():
+    repo = create_repo()
+    repo.add_enrollment(Enrollment(student_id="S1", course_code="C2"))
+    repo.add_enrollment(Enrollment(student_id="S2", course_code="C1"))
+    repo.add_enrollment(Enrollment(student_id="S1", course_code="C1"))
+    with pytest.raises(DuplicateEntityError):
+        repo.add_enrollment(Enrollment(student_id="S1", course_code="C1"))
+    with pytest.raises(EntityNotFoundError):
+        repo.add_enrollment(Enrollment(student_id="S9", course_code="C1"))
+    with pytest.raises(EntityNotFoundError):
+        repo.get_enrollment("S2", "C2")
+
+    view = repo.get_enrollment("S1", "C2")
+    assert isinstance(view, EnrollmentView)
+    assert view == Enrollment(student_id="S1", course_code="C2")
+    assert [e.course_code for e in repo.list_enrollments_for_student("S1")] == ["C2", "C1"]
+    assert [e.student_id for e in repo.list_enrollments_for_course("C1")] == ["S2", "S1"]
+    assert repo.count_enrollments_for_course("C1") == 2
+    assert repo.list_enrollments_for_student("S9") == []
+
+    repo.update_score("S1", "C2", 88)
+    assert view.score == 88  # views read the live row
+
+
+def test_compact_matches_in_memory_repository_through_app_functions():
+    reports = []
+    for repo in (create_repo(), InMemoryRepository()):
+        if isinstance(repo, InMemoryRepository):
+            repo.add_student(Student(student_id="S1", name="Alice", year=3))
+            repo.add_student(Student(student_id="S2", name="Bob", year=2))
+            repo.add_course(Course(course_code="C1", title="ST", credits=3, max_capacity=2))
+            repo.add_course(Course(course_code="C2", title="Algo", credits=4))
+        results = bulk_enroll(repo, [("S1", "C1"), ("S2", "C1"), ("S2", "C2")])
+        assert all(r.ok for r in results)
+        with pytest.raises(BusinessRuleViolationError):
+            enroll_student_in_course(repo, "S1", "C1")
+        enroll_student_in_course(repo, "S1", "C2")
+        record_score_for_enrollment(repo, "S1", "C1", 93)
+        record_score_for_enrollment(repo, "S1", "C2", 61, bonus=10)
+        record_score_for_enrollment(repo, "S1", "C2", 55)  # re-grade
+        with pytest.raises(ValueError):
+            record_score_for_enrollment(repo, "S1", "C2", -1)
+        reports.append(generate_student_report(repo, "S1"))
+    assert reports[0] == reports[1]
+    assert reports[0]["gpa"] == compute_gpa(["A", "F"], [3, 4])
+
+
+def test_compact_gpa_and_listeners():
+    repo = create_repo()
+    enroll_student_in_course(repo, "S1", "C1")
+    cache = ReportCache(repo)
+    record_score_for_enrollment(repo, "S1", "C1", 75)
+    assert cache.get_report("S1")["gpa"] == 6.0
+    record_score_for_enrollment(repo, "S1", "C1", 95)
+    assert cache.get_report("S1")["gpa"] == 10.0
+    assert repo.get_gpa("S2") == 0.0
+    with pytest.raises(ValueError):
+        repo.update_grade("S1", "C1", "E", False)
+    assert repo.get_gpa("S1") == 10.0
@@ -0,0 +1,66 @@
+# tests/unit/test_concurrent_repository.py
+import sys
+import threading
+
+import pytest
+from app.concurrent_repository import ConcurrentRepository
+from app.models import Student, Course
+from app.enrollment import enroll_student_in_course, record_score_for_enrollment
+from app.utils import BusinessRuleViolationError, DuplicateEntityError
+
+
+@pytest.fixture
+def frequent_thread_switches():
+    # switch threads as often as possible so check-then-act races show up
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(previous)
+
+
+def test_concurrent_enrollment_never_exceeds_capacity(frequent_thread_switches):
+    repo = ConcurrentRepository(stripes=4)
+    repo.add_course(Course(course_code="HOT", title="Popular", credits=3, max_capacity=25))
+    for i in range(200):
+        repo.add_student(Student(student_id=f"S{i}", name=f"Student {i}", year=1))
+
+    start = threading.Barrier(8)
+    outcomes = []
+
+    def register(worker: int) -> None:
+        start.wait()
+        for i in range(worker, 200, 8):
+            try:
+                enroll_student_in_course(repo, f"S{i}", "HOT")
+                outcomes.append("ok")
+            except BusinessRuleViolationError:
+                outcomes.append("full")
+
+    threads = [threading.Thread(target=register, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert outcomes.count("ok") == 25
+    assert outcomes.count("full") == 175
+    assert repo.count_enrollments_for_course("HOT") == 25
+    assert len(repo.list_enrollments_for_course("HOT")) == 25
+
+
+def test_concurrent_repository_keeps_repository_behaviour():
+    repo = ConcurrentRepository()
+    repo.add_student(Student(student_id="S1", name="Alice", year=3))
+    repo.add_course(Course(course_code="C1", title="ST", credits=3, max_capacity=1))
+    enroll_student_in_course(repo, "S1", "C1")
+    with pytest.raises(DuplicateEntityError):
+        repo.add_student(Student(student_id="S1", name="Alice", year=3))
+    with pytest.raises(BusinessRuleViolationError):
+        enroll_student_in_course(repo, "S1", "C1")
+    record_score_for_enrollment(repo, "S1", "C1", 85)
+    assert repo.get_gpa("S1") == 8.0
+
+
+def test_concurrent_repository_rejects_non_positive_stripes():
+    with pytest.raises(ValueError):
+        ConcurrentRepository(stripes=0)
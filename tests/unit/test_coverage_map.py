@@ -0,0 +1,50 @@
+# tests/unit/test_coverage_map.py
+import os
+
+from mutation.coverage_map import IMPORT_CONTEXT, CoverageMap
+
+GRADING = os.path.join("app", "grading.py")
+T_GRADE = "tests/unit/test_grading.py::test_grade"
+T_GPA = "tests/unit/test_grading.py::test_gpa"
+T_REPORT = "tests/unit/test_reporting.py::test_report"
+
+
+def make_map():
+    return CoverageMap(
+        {
+            GRADING: {
+                1: {IMPORT_CONTEXT},
+                10: {T_GRADE},
+                11: {T_GRADE, T_GPA},
+                20: {T_REPORT},
+            }
+        },
+        [T_REPORT, T_GRADE, T_GPA],
+    )
+
+
+def test_tests_for_single_line():
+    assert make_map().tests_for(GRADING, 10, 10) == [T_GRADE]
+
+
+def test_tests_for_line_range_unions_and_sorts():
+    assert make_map().tests_for(GRADING, 10, 20) == [T_GPA, T_GRADE, T_REPORT]
+
+
+def test_tests_for_uncovered_lines_is_empty():
+    assert make_map().tests_for(GRADING, 12, 19) == []
+    assert make_map().tests_for(os.path.join("app", "models.py"), 1, 5) == []
+
+
+def test_tests_for_import_time_line_selects_whole_suite():
+    assert make_map().tests_for(GRADING, 1, 10) == [T_GPA, T_GRADE, T_REPORT]
+
+
+def test_tests_for_normalizes_the_path():
+    assert make_map().tests_for("app/./grading.py", 10, 10) == [T_GRADE]
+
+
+def test_round_trips_through_dict():
+    restored = CoverageMap.from_dict(make_map().to_dict())
+    assert restored.tests_by_line == make_map().tests_by_line
+    assert restored.all_tests == make_map().all_tests
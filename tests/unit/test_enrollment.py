@@ -1,9 +1,19 @@
 # tests/unit/test_enrollment.py
 import pytest
+from app.compact_repository import CompactRepository
+from app.concurrent_repository import ConcurrentRepository
+from app.persistence import DurableRepository
 from app.repository import InMemoryRepository
+from app.sqlite_repository import SQLiteRepository
 from app.models import Student, Course
-from app.enrollment import enroll_student_in_course, record_score_for_enrollment
-from app.utils import BusinessRuleViolationError, EntityNotFoundError
+from app.enrollment import (
+    bulk_enroll,
+    enroll_student_in_course,
+    record_score_for_enrollment,
+    record_scores,
+)
+from app.reporting import ReportCache
+from app.utils import BusinessRuleViolationError, DuplicateEntityError, EntityNotFoundError
 
 
 def setup_repo():
@@ -57,4 +67,147 @@ def test_enroll_two_students_until_course_full():
 
     enroll_student_in_course(repo, "S1", "C1")
     with pytest.raises(BusinessRuleViolationError):
-        enroll_student_in_course(repo, "S2", "C1")
\ No newline at end of file
+        enroll_student_in_course(repo, "S2", "C1")
+
+
+def test_bulk_enroll_reports_each_request():
+    repo = setup_repo()
+    repo.add_student(Student(student_id="S2", name="Bob", year=2))
+    repo.add_course(Course(course_code="C2", title="Algo", credits=4, max_capacity=5))
+    results = bulk_enroll(
+        repo,
+        [("S1", "C2"), ("S9", "C2"), ("S1", "C9"), ("S1", "C2"), ("S2", "C2")],
+    )
+    assert [r.ok for r in results] == [True, False, False, False, True]
+    assert isinstance(results[1].error, EntityNotFoundError)
+    assert isinstance(results[2].error, EntityNotFoundError)
+    assert isinstance(results[3].error, DuplicateEntityError)
+    assert results[0].enrollment == repo.get_enrollment("S1", "C2")
+    assert repo.count_enrollments_for_course("C2") == 2
+
+
+def test_bulk_enroll_applies_capacity_in_request_order():
+    repo = setup_repo()
+    repo.add_student(Student(student_id="S2", name="Bob", year=2))
+    results = bulk_enroll(repo, [("S2", "C1"), ("S1", "C1"), ("S9", "C1")])
+    assert results[0].ok
+    # capacity is checked before the student, like enroll_student_in_course
+    assert isinstance(results[1].error, BusinessRuleViolationError)
+    assert isinstance(results[2].error, BusinessRuleViolationError)
+    assert repo.count_enrollments_for_course("C1") == 1
+
+
+@pytest.mark.parametrize(
+    "make_repo",
+    [InMemoryRepository, ConcurrentRepository, CompactRepository, SQLiteRepository, "durable"],
+)
+def test_bulk_enroll_matches_single_request_api(make_repo, tmp_path):
+    requests = [
+        ("S1", "C1"), ("S2", "C1"), ("S9", "C1"), ("S1", "C1"), ("S3", "C1"),
+        ("S1", "C9"), ("S4", "C1"), ("S2", "C2"), ("S2", "C2"), ("S3", "C2"),
+    ]
+    repos = []
+    for i in range(2):
+        if make_repo == "durable":
+            repo = DurableRepository(str(tmp_path / f"db{i}"))
+        else:
+            repo = make_repo()
+        repo.add_students([Student(f"S{n}", "x", 1) for n in range(1, 5)])
+        repo.add_courses([Course("C1", "ST", 3, max_capacity=3), Course("C2", "AI", 4)])
+        repos.append(repo)
+
+    results = bulk_enroll(repos[0], requests)
+    expected = []
+    for student_id, course_code in requests:
+        try:
+            enroll_student_in_course(repos[1], student_id, course_code)
+            expected.append(None)
+        except (BusinessRuleViolationError, DuplicateEntityError, EntityNotFoundError) as exc:
+            expected.append(exc)
+
+    assert [type(r.error) for r in results] == [type(e) for e in expected]
+    assert [str(r.error) for r in results] == [str(e) for e in expected]
+    for course_code in ("C1", "C2"):
+        assert repos[0].list_enrollments_for_course(course_code) == \
+            repos[1].list_enrollments_for_course(course_code)
+    for repo in repos:
+        if make_repo == "durable":
+            repo.close()
+
+
+@pytest.mark.parametrize("make_repo", [InMemoryRepository, CompactRepository, SQLiteRepository])
+def test_record_scores_matches_single_row_api(make_repo):
+    rows = [
+        ("S1", "C1", 85.0, 5.0),
+        ("S2", "C1", 59.0, 0.0),
+        ("S9", "C1", 70.0, 0.0),
+        ("S1", "C2", 101.0, 0.0),
+        ("S1", "C2", 72.0, 0.0),
+        ("S2", "C1", 95.0, 10.0),  # later row for the same enrollment wins
+    ]
+    repos = []
+    for _ in range(2):
+        repo = make_repo()
+        repo.add_students([Student("S1", "Alice", 3), Student("S2", "Bob", 2)])
+        repo.add_courses([Course("C1", "ST", 3), Course("C2", "Algo", 4)])
+        bulk_enroll(repo, [("S1", "C1"), ("S2", "C1"), ("S1", "C2")])
+        repos.append(repo)
+
+    errors = record_scores(repos[0], rows)
+    assert [(e.index, type(e.error)) for e in errors] == [
+        (2, EntityNotFoundError),
+        (3, ValueError),
+    ]
+    for student_id, course_code, score, bonus in rows:
+        try:
+            record_score_for_enrollment(repos[1], student_id, course_code, score, bonus)
+        except (EntityNotFoundError, ValueError):
+            pass
+    for student_id in ("S1", "S2"):
+        assert repos[0].list_enrollments_for_student(student_id) == \
+            repos[1].list_enrollments_for_student(student_id)
+        assert repos[0].get_gpa(student_id) == repos[1].get_gpa(student_id)
+
+
+def test_record_scores_grades_every_course_in_one_batch():
+    repo = InMemoryRepository()
+    repo.add_students([Student(f"S{i}", "x", 1) for i in range(20)])
+    repo.add_courses([Course(f"C{c}", "x", 1 + c, max_capacity=100) for c in range(3)])
+    bulk_enroll(repo, [(f"S{i}", f"C{c}") for i in range(20) for c in range(3)])
+    rows = [(f"S{i}", f"C{c}", float(i * 5), 0.0) for i in range(20) for c in range(3)]
+
+    assert record_scores(repo, rows) == []
+    assert repo.get_enrollment("S19", "C2").grade == "A"
+    assert repo.get_enrollment("S11", "C0").grade == "F"
+    assert repo.get_gpa("S14") == 6.0
+
+
+@pytest.mark.parametrize(
+    "make_repo", [InMemoryRepository, ConcurrentRepository, CompactRepository, SQLiteRepository]
+)
+def test_record_scores_reports_malformed_rows_and_keeps_caches_fresh(make_repo):
+    repo = make_repo()
+    repo.add_student(Student(student_id="S1", name="Alice", year=3))
+    repo.add_courses([Course("C1", "ST", 3), Course("C2", "Algo", 4)])
+    bulk_enroll(repo, [("S1", "C1"), ("S1", "C2")])
+    assert record_scores(repo, [("S1", "C1", 40, 0), ("S1", "C2", 40, 0)]) == []
+    cache = ReportCache(repo)
+    assert cache.get_report("S1")["gpa"] == 0.0
+
+    rows = [("S1", "C1", 95, 0), ("S1", "C2", None, 0), ("S1", "C2", 70, "x")]
+    errors = record_scores(repo, rows)
+    assert [(e.index, type(e.error)) for e in errors] == [(1, TypeError), (2, TypeError)]
+    assert repo.get_enrollment("S1", "C2").score == 40
+    assert cache.get_report("S1")["gpa"] == repo.get_gpa("S1") == 30 / 7
+
+    # the repository checks types itself, before applying any update
+    skipped = repo.update_scores_and_grades([
+        ("S1", "C1", 50, "F", False),
+        ("S1", "C2", None, "A", True),
+        ("S1", "C2", 90, None, True),
+        ("S1", "C2", 90, "A", None),
+    ])
+    assert [(index, type(error)) for index, error in skipped] == [
+        (1, TypeError), (2, ValueError), (3, TypeError)
+    ]
+    assert cache.get_report("S1")["gpa"] == repo.get_gpa("S1") == 0.0
@@ -1,6 +1,16 @@
 # tests/unit/test_grading.py
+from array import array
+
 import pytest
-from app.grading import compute_grade, compute_grade_with_bonus, compute_gpa
+from app import grading
+from app.grading import (
+    compute_grade,
+    compute_grade_with_bonus,
+    compute_gpa,
+    compute_cohort_gpa,
+    compute_grades,
+    compute_grades_with_bonus,
+)
 
 
 @pytest.mark.parametrize(
@@ -92,3 +102,146 @@ def test_compute_gpa_heavily_weighted_course():
     gpa = compute_gpa(grades, credits)
     # Should be closer to A than C → > 9.0
     assert gpa > 9.0
+
+
+def test_compute_grades_matches_compute_grade():
+    scores = [0, 59, 59.5, 60, 69, 70, 79.99, 80, 89, 90, 100]
+    grades, passed = compute_grades(scores)
+    assert list(zip(grades, passed)) == [compute_grade(s) for s in scores]
+
+
+def test_compute_grades_accepts_buffers():
+    scores = array("d", [95.0, 40.0])
+    assert compute_grades(scores) == (["A", "F"], [True, False])
+    assert compute_grades(memoryview(scores)) == (["A", "F"], [True, False])
+    assert compute_grades([]) == ([], [])
+
+
+def test_compute_grades_reports_offending_indices():
+    with pytest.raises(ValueError, match=r"\[1, 3\]"):
+        compute_grades([50, -1, 100, 101])
+
+
+def test_compute_grades_with_bonus_matches_scalar_version():
+    scores = [98, 1, 5, 50, 55, 78]
+    bonuses = [10, -5, -20, 100, 5, 0]
+    grades, passed = compute_grades_with_bonus(scores, bonuses)
+    expected = [compute_grade_with_bonus(s, b) for s, b in zip(scores, bonuses)]
+    assert list(zip(grades, passed)) == expected
+
+
+def test_compute_grades_with_single_bonus():
+    assert compute_grades_with_bonus([85, 55], 5) == (["A", "D"], [True, True])
+
+
+def test_compute_grades_with_bonus_length_mismatch():
+    with pytest.raises(ValueError):
+        compute_grades_with_bonus([85, 55], [5])
+
+
+@pytest.fixture(params=["numpy", "python"])
+def batch_backend(request, monkeypatch):
+    """Run a test with the NumPy path and again with the plain Python one."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(grading, "np", None)
+    return request.param
+
+
+def test_compute_grades_backends_agree(batch_backend):
+    scores = [0, 59.99, 60, 75, 89.5, 90, 100, float("nan")]
+    grades, passed = compute_grades(iter(scores))
+    assert grades == ["F", "F", "D", "C", "B", "A", "A", "F"]
+    assert passed == [False, False, True, True, True, True, True, False]
+    assert all(type(p) is bool for p in passed)
+
+
+def test_compute_grades_offending_indices_with_nan(batch_backend):
+    with pytest.raises(ValueError, match=r"\[2, 3\]"):
+        compute_grades([float("nan"), 50, -0.5, float("inf")])
+
+
+def test_compute_grades_with_bonus_backends_agree(batch_backend):
+    assert compute_grades_with_bonus([98, 1, 55], [10, -5, 5]) == (
+        ["A", "F", "D"],
+        [True, False, True],
+    )
+    with pytest.raises(ValueError):
+        compute_grades_with_bonus([85, 55], [5])
+
+
+def test_compute_grades_with_numpy_scalar_bonus(batch_backend):
+    np = pytest.importorskip("numpy")
+    for bonus in (np.int64(5), np.float32(5.0)):
+        assert compute_grades_with_bonus([85, 55], bonus) == (["A", "D"], [True, True])
+
+
+def test_compute_grades_accepts_numpy_arrays():
+    np = pytest.importorskip("numpy")
+    scores = np.array([95, 40, 71], dtype=np.int32)
+    assert compute_grades(scores) == (["A", "F", "C"], [True, False, True])
+    assert compute_grades_with_bonus(scores, np.array([0, 30, -2])) == (
+        ["A", "C", "D"],
+        [True, True, True],
+    )
+
+
+def test_compute_cohort_gpa_matches_compute_gpa(batch_backend):
+    per_student = [
+        (["A", "B", "C"], [3, 3, 4]),
+        ([], []),
+        (["F", "D"], [2, 5]),
+    ]
+    student_indices, grades, credits = [], [], []
+    for s, (gs, cs) in enumerate(per_student):
+        student_indices += [s] * len(gs)
+        grades += gs
+        credits += cs
+    # interleave rows of different students
+    rows = sorted(zip(student_indices, grades, credits), key=lambda r: r[2])
+    student_indices, grades, credits = map(list, zip(*rows))
+
+    gpas = compute_cohort_gpa(student_indices, grades, credits, num_students=4)
+    assert gpas == [compute_gpa(gs, cs) for gs, cs in per_student] + [0.0]
+
+
+def test_compute_cohort_gpa_defaults_to_highest_index(batch_backend):
+    assert compute_cohort_gpa([1], ["A"], [3]) == [0.0, 10.0]
+    assert compute_cohort_gpa([], [], []) == []
+
+
+@pytest.mark.parametrize(
+    "student_indices, grades, credits",
+    [
+        ([0, 0], ["A", "X"], [3, 3]),
+        ([0], ["A"], [0]),
+        ([0], ["A", "B"], [3, 3]),
+        ([-1], ["A"], [3]),
+        ([2], ["A"], [3]),
+    ],
+)
+def test_compute_cohort_gpa_invalid_rows(student_indices, grades, credits, batch_backend):
+    with pytest.raises(ValueError):
+        compute_cohort_gpa(student_indices, grades, credits, num_students=2)
+
+
+@pytest.mark.parametrize(
+    "student_indices, grades, credits, message",
+    [
+        ([0, 5], ["A", "X"], [0, 3], "credits must be positive"),
+        ([0, 0], ["X", "A"], [3, 0], "Unknown grade X"),
+        ([0, 1], ["A", "B"], [3, 3], "Unknown student index 1"),
+    ],
+)
+def test_compute_cohort_gpa_reports_first_bad_row(
+    student_indices, grades, credits, message, batch_backend
+):
+    with pytest.raises(ValueError, match=message):
+        compute_cohort_gpa(student_indices, grades, credits, num_students=1)
+
+
+def test_compute_cohort_gpa_accepts_numpy_columns():
+    np = pytest.importorskip("numpy")
+    gpas = compute_cohort_gpa(np.array([1, 0, 1]), np.array(["A", "C", "B"]), np.array([3, 4, 1]))
+    assert gpas == [6.0, compute_gpa(["A", "B"], [3, 1])]
@@ -0,0 +1,58 @@
+# tests/unit/test_history.py
+import os
+
+from mutation.history import HISTORY_FILE, KillHistory, killing_test_from_output
+
+OP = "UNIT:ArithmeticOperatorReplacement"
+FILE = os.path.join("app", "grading.py")
+
+
+def test_record_counts_runs_up_to_the_killing_test():
+    history = KillHistory()
+    history.record(OP, FILE, ["t1", "t2", "t3"], "t2")
+
+    stats = history.stats[f"{OP}|app/grading.py"]
+    assert stats == {"t1": [0, 1], "t2": [1, 1]}  # t3 never ran
+
+
+def test_record_without_kill_counts_every_test():
+    history = KillHistory()
+    history.record(OP, FILE, ["t1", "t2"], None)
+    assert history.stats[f"{OP}|app/grading.py"] == {"t1": [0, 1], "t2": [0, 1]}
+
+
+def test_rank_orders_killers_first_and_keeps_ties_stable():
+    history = KillHistory()
+    for _ in range(3):
+        history.record(OP, FILE, ["never", "killer"], "killer")
+
+    ranked = history.rank(OP, FILE, ["never", "unseen_b", "killer", "unseen_a"])
+    # killer 4/5, unseen 1/2 (in given order), never 1/5
+    assert ranked == ["killer", "unseen_b", "unseen_a", "never"]
+
+
+def test_rank_is_per_operator_and_file():
+    history = KillHistory()
+    history.record(OP, FILE, ["t2"], "t2")
+    assert history.rank("UNIT:Other", FILE, ["t1", "t2"]) == ["t1", "t2"]
+    assert history.rank(OP, "app/models.py", ["t1", "t2"]) == ["t1", "t2"]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    history = KillHistory.load(str(tmp_path))
+    history.record(OP, FILE, ["t1"], "t1")
+    history.save()
+
+    loaded = KillHistory.load(str(tmp_path))
+    assert loaded.stats == history.stats
+
+
+def test_load_ignores_corrupt_history(tmp_path):
+    (tmp_path / HISTORY_FILE).write_text("{not json")
+    assert KillHistory.load(str(tmp_path)).stats == {}
+
+
+def test_killing_test_from_output_strips_parametrization():
+    stdout = "F\nFAILED tests/unit/test_grading.py::test_x[95-A] - assert\n"
+    assert killing_test_from_output(stdout) == "tests/unit/test_grading.py::test_x"
+    assert killing_test_from_output("1 passed\n") is None
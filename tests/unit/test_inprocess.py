@@ -0,0 +1,125 @@
+# tests/unit/test_inprocess.py
+import importlib
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from mutation.inprocess import MutantFinder, module_name_for
+
+MODULE = "mutation_finder_demo"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Drives InProcessTestRunner over a tiny project in a child interpreter, so
+# its chdir, sys.dont_write_bytecode and SIGALRM handler stay out of this one.
+RUNNER_SCRIPT = textwrap.dedent(
+    """
+    import json, os, sys
+    from mutation.inprocess import InProcessTestRunner
+
+    project, mutant = sys.argv[1], sys.argv[2]
+    runner = InProcessTestRunner(project, packages=("calc", "calc_tests"), timeout=0.5)
+    side_effects = [os.getcwd() == project, sys.dont_write_bytecode]
+    if mutant == "-":
+        code, out, err = runner.run(args=["calc_tests"])
+    else:
+        code, out, err = runner.run("calc/core.py", mutant, args=["calc_tests"])
+    print(json.dumps({
+        "code": code,
+        "timed_out": runner.timed_out,
+        "stderr": err,
+        "side_effects": side_effects,
+        "leftover": sorted(n for n in sys.modules if n.split(".")[0] in ("calc", "calc_tests")),
+    }))
+    """
+)
+
+
+@pytest.fixture
+def finder(tmp_path):
+    finder = MutantFinder(MODULE, str(tmp_path / "demo.py"), "VALUE = 'mutant'\n")
+    sys.meta_path.insert(0, finder)
+    yield finder
+    sys.meta_path.remove(finder)
+    sys.modules.pop(MODULE, None)
+
+
+def test_module_name_for_maps_paths_to_dotted_names():
+    assert module_name_for(os.path.join("app", "grading.py")) == "app.grading"
+    assert module_name_for("app/models.py") == "app.models"
+
+
+def test_finder_serves_mutated_code_for_its_module(finder):
+    module = importlib.import_module(MODULE)
+    assert module.VALUE == "mutant"
+    assert module.__file__ == finder.path
+
+
+def test_finder_defers_other_modules(finder):
+    assert finder.find_spec("json") is None
+    assert finder.find_spec(MODULE + ".sub") is None
+    # regular imports are unaffected while the finder is installed
+    assert importlib.import_module("json").__name__ == "json"
+
+
+def test_finder_rejects_mutant_that_does_not_compile(tmp_path):
+    with pytest.raises(SyntaxError):
+        MutantFinder(MODULE, str(tmp_path / "demo.py"), "def broken(:\n")
+
+
+@pytest.fixture
+def project(tmp_path):
+    for package in ("calc", "calc_tests"):
+        (tmp_path / package).mkdir()
+        (tmp_path / package / "__init__.py").write_text("")
+    (tmp_path / "calc" / "core.py").write_text("def add(a, b):\n    return a + b\n")
+    (tmp_path / "calc_tests" / "test_core.py").write_text(
+        "from calc.core import add\n\n\ndef test_add():\n    assert add(2, 3) == 5\n"
+    )
+    return tmp_path
+
+
+def run_in_child(project, mutant="-"):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    completed = subprocess.run(
+        [sys.executable, "-c", RUNNER_SCRIPT, str(project), mutant],
+        capture_output=True, text=True, env=env, timeout=60, check=True,
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def test_runner_passes_unmutated_project_and_sets_up_the_process(project):
+    result = run_in_child(project)
+    assert result["code"] == 0
+    assert result["side_effects"] == [True, True]
+    # project modules are forgotten after the run, and nothing hit the disk
+    assert result["leftover"] == []
+    assert not list(project.rglob("__pycache__"))
+
+
+def test_runner_reports_killed_mutant(project):
+    result = run_in_child(project, "def add(a, b):\n    return a - b\n")
+    assert result["code"] == 1
+    assert not result["timed_out"]
+    assert result["leftover"] == []
+
+
+def test_runner_reports_surviving_mutant(project):
+    result = run_in_child(project, "def add(a, b):\n    return b + a\n")
+    assert result["code"] == 0
+
+
+def test_runner_reports_mutant_that_does_not_compile_as_exit_2(project):
+    result = run_in_child(project, "def add(a, b):\n    return a +\n")
+    assert result["code"] == 2
+    assert "SyntaxError" in result["stderr"]
+    assert not result["timed_out"]
+
+
+def test_runner_interrupts_mutant_past_its_deadline(project):
+    result = run_in_child(project, "def add(a, b):\n    while True:\n        pass\n")
+    assert result["timed_out"]
+    assert result["code"] == int(pytest.ExitCode.INTERRUPTED)
+    assert result["leftover"] == []
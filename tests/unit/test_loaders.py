@@ -0,0 +1,123 @@
+# tests/unit/test_loaders.py
+import json
+
+import pytest
+from app.compact_repository import CompactRepository
+from app.loaders import load_courses, load_enrollments, load_students
+from app.models import Enrollment
+from app.persistence import DurableRepository
+from app.repository import InMemoryRepository
+from app.sqlite_repository import SQLiteRepository
+from app.utils import DuplicateEntityError, EntityNotFoundError
+
+
+def write_catalog(tmp_path):
+    (tmp_path / "students.csv").write_text(
+        "student_id,name,year\nS1,Alice,3\nS2,Bob,2\nS3,Chloé,1\n", encoding="utf-8"
+    )
+    (tmp_path / "courses.jsonl").write_text(
+        '{"course_code": "C1", "title": "ST", "credits": 3, "max_capacity": 2}\n'
+        '{"course_code": "C2", "title": "Algo", "credits": 4}\n'
+    )
+
+
+@pytest.mark.parametrize("make_repo", [InMemoryRepository, CompactRepository, SQLiteRepository])
+def test_loaders_populate_every_repository(tmp_path, make_repo):
+    write_catalog(tmp_path)
+    (tmp_path / "enrollments.csv").write_text(
+        "student_id,course_code,score,grade,passed\n"
+        "S1,C1,91,A,true\n"
+        "S1,C2,74,C,true\n"
+        "S2,C1,,,\n"
+    )
+    repo = make_repo()
+    assert load_students(repo, str(tmp_path / "students.csv"), chunk_size=2).loaded == 3
+    assert load_courses(repo, str(tmp_path / "courses.jsonl")).loaded == 2
+    report = load_enrollments(repo, str(tmp_path / "enrollments.csv"))
+    assert (report.rows, report.loaded, report.rejected) == (3, 3, 0)
+    assert report.rows_per_second > 0
+
+    assert repo.get_student("S3").name == "Chloé"
+    assert repo.get_course("C2").max_capacity == 60
+    assert repo.get_enrollment("S1", "C1").passed is True
+    assert repo.get_enrollment("S2", "C1").score is None
+    assert repo.get_gpa("S1") == (10 * 3 + 6 * 4) / 7
+
+
+def test_collect_policy_reports_every_bad_row(tmp_path):
+    write_catalog(tmp_path)
+    (tmp_path / "enrollments.jsonl").write_text("\n".join([
+        json.dumps({"student_id": "S1", "course_code": "C1"}),
+        json.dumps({"student_id": "S9", "course_code": "C1"}),
+        "{not json",
+        json.dumps({"student_id": "S2", "course_code": "C2", "score": 101}),
+        json.dumps({"student_id": "S1", "course_code": "C1"}),
+        json.dumps({"student_id": "S2", "course_code": "C1", "grade": "E"}),
+        json.dumps({"student_id": "S3", "course_code": "C2", "grade": "B", "passed": True}),
+    ]) + "\n")
+    repo = InMemoryRepository()
+    load_students(repo, str(tmp_path / "students.csv"))
+    load_courses(repo, str(tmp_path / "courses.jsonl"))
+
+    report = load_enrollments(repo, str(tmp_path / "enrollments.jsonl"), on_error="collect")
+    assert (report.rows, report.loaded, report.rejected) == (7, 2, 5)
+    assert [e.line for e in report.errors] == [3, 4, 6, 2, 5]
+    assert isinstance(report.errors[3].error, EntityNotFoundError)
+    assert isinstance(report.errors[4].error, DuplicateEntityError)
+    assert repo.get_gpa("S3") == 8.0
+
+    repo = InMemoryRepository()
+    load_students(repo, str(tmp_path / "students.csv"))
+    load_courses(repo, str(tmp_path / "courses.jsonl"))
+    report = load_enrollments(repo, str(tmp_path / "enrollments.jsonl"))
+    assert report.rejected == 5 and report.errors == []
+
+
+def test_abort_policy_keeps_rows_before_the_bad_one(tmp_path):
+    write_catalog(tmp_path)
+    (tmp_path / "dup.csv").write_text("student_id,name,year\nS4,Dan,4\nS1,Alice,3\nS5,Eve,1\n")
+    repo = InMemoryRepository()
+    load_students(repo, str(tmp_path / "students.csv"))
+    with pytest.raises(DuplicateEntityError):
+        load_students(repo, str(tmp_path / "dup.csv"), on_error="abort")
+    assert [s.student_id for s in repo.list_students()] == ["S1", "S2", "S3", "S4"]
+    with pytest.raises(ValueError):
+        load_students(repo, str(tmp_path / "dup.csv"), on_error="ignore")
+
+
+def test_batch_inserts_are_logged(tmp_path):
+    write_catalog(tmp_path)
+    repo = DurableRepository(str(tmp_path / "db"), snapshot_every=None)
+    load_students(repo, str(tmp_path / "students.csv"))
+    load_courses(repo, str(tmp_path / "courses.jsonl"))
+    with pytest.raises(DuplicateEntityError):
+        repo.add_students(repo.list_students()[:1])
+    repo.close()
+    reopened = DurableRepository(str(tmp_path / "db"), snapshot_every=None)
+    assert len(reopened.list_students()) == 3
+    assert reopened.get_course("C1").max_capacity == 2
+    reopened.close()
+
+
+@pytest.mark.parametrize(
+    "make_repo", [InMemoryRepository, CompactRepository, SQLiteRepository, "durable"]
+)
+def test_single_and_batch_inserts_agree_on_unknown_grades(tmp_path, make_repo):
+    # a failed chunk is retried row by row with add_enrollment, so both
+    # paths must reject the same rows
+    write_catalog(tmp_path)
+    if make_repo == "durable":
+        repo = DurableRepository(str(tmp_path / "db"), snapshot_every=None)
+    else:
+        repo = make_repo()
+    load_students(repo, str(tmp_path / "students.csv"))
+    load_courses(repo, str(tmp_path / "courses.jsonl"))
+
+    with pytest.raises(ValueError, match="Unknown grade E"):
+        repo.add_enrollments([Enrollment("S1", "C1", grade="A"), Enrollment("S2", "C1", grade="E")])
+    with pytest.raises(ValueError, match="Unknown grade E"):
+        repo.add_enrollment(Enrollment("S2", "C1", grade="E"))
+    assert repo.count_enrollments_for_course("C1") == 0
+    assert repo.get_gpa("S1") == 0.0
+    if isinstance(repo, DurableRepository):
+        repo.close()
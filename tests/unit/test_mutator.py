@@ -0,0 +1,253 @@
+# tests/unit/test_mutator.py
+import os
+import time
+
+import pytest
+from mutation import mutator
+from mutation.operators import ArithmeticOperatorReplacement, RelationalOperatorReplacement
+from mutation.mutator import (
+    TIMEOUT_FACTOR,
+    TIMEOUT_GRACE_SECONDS,
+    MutantJob,
+    MutantResult,
+    _run_jobs_in_pool,
+    build_mutant_result,
+    code_fingerprint,
+    generate_mutants,
+    mutant_deadline,
+    prepare_sandbox,
+    redundant_result,
+    run_mutant_in_sandbox,
+    timeout_result,
+)
+
+BRANCHY = (
+    "def f(a, b):\n"
+    "    if a > b:\n"
+    "        return a + b\n"
+    "    return a - b\n"
+)
+ORIGINAL_MODULE = "def add(a, b):\n    return a + b\n"
+PASSING_TEST = (
+    "from pkg.calc import add\n\n\n"
+    "def test_add():\n    assert add(2, 3) == 5\n"
+)
+
+
+def _make_project(root):
+    for relative, text in (
+        ("pkg/__init__.py", ""),
+        ("pkg/calc.py", ORIGINAL_MODULE),
+        ("tests/test_calc.py", PASSING_TEST),
+        ("pytest.ini", "[pytest]\npythonpath = .\n"),
+        (".git/HEAD", "ref: refs/heads/main\n"),
+        ("pkg/__pycache__/calc.cpython-311.pyc", ""),
+        ("images/big.img", ""),
+    ):
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return str(root)
+
+
+def _job(mutated_source, index=0):
+    return MutantJob(
+        operator_name="UNIT:Test",
+        file_path=os.path.join("pkg", "calc.py"),
+        index=index,
+        mutated_source=mutated_source,
+        lines=(2, 2),
+    )
+
+
+def _time_out_odd_jobs(job):
+    """Pool job: report jobs with an odd index as timed out."""
+    if job.index % 2:
+        return timeout_result(job, 1.0)
+    return build_mutant_result(job, 0, "", "")
+
+
+def _timed_job(delay):
+    """Pool job: sleep `delay` seconds, return (delay, start, end)."""
+    start = time.monotonic()
+    time.sleep(delay)
+    return delay, start, time.monotonic()
+
+
+def test_pool_returns_results_in_job_order():
+    # later jobs finish first, results still come back in submission order
+    delays = [0.3, 0.2, 0.1, 0.0]
+    results = _run_jobs_in_pool(iter(delays), 4, _timed_job)
+    assert [delay for delay, _, _ in results] == delays
+
+
+def test_pool_handles_no_jobs():
+    assert _run_jobs_in_pool(iter(()), 2, _timed_job) == []
+
+
+def test_pool_bounds_jobs_in_flight():
+    workers = 1
+    max_pending = workers * mutator.JOBS_IN_FLIGHT_PER_WORKER
+    pulled_at = []
+
+    def jobs():
+        for _ in range(6):
+            pulled_at.append(time.monotonic())
+            yield 0.05
+
+    results = _run_jobs_in_pool(jobs(), workers, _timed_job)
+
+    assert len(results) == 6
+    # besides the submitted jobs, only the one waiting for a free slot has
+    # been generated: job i + max_pending + 1 is pulled after job i is done
+    for i in range(len(results) - max_pending - 1):
+        _, _, finished = results[i]
+        assert pulled_at[i + max_pending + 1] >= finished
+
+
+def test_prepare_sandbox_copies_only_what_tests_need(tmp_path):
+    project = _make_project(tmp_path / "project")
+    sandbox = prepare_sandbox(project, str(tmp_path / "sandbox"))
+
+    assert (tmp_path / "sandbox" / "pkg" / "calc.py").read_text() == ORIGINAL_MODULE
+    assert (tmp_path / "sandbox" / "tests" / "test_calc.py").exists()
+    assert sandbox == str(tmp_path / "sandbox")
+    for ignored in (".git", "images", os.path.join("pkg", "__pycache__")):
+        assert not (tmp_path / "sandbox" / ignored).exists()
+
+
+def test_sandbox_run_kills_mutant_and_restores_module(tmp_path):
+    sandbox = prepare_sandbox(_make_project(tmp_path / "project"), str(tmp_path / "sandbox"))
+    module = tmp_path / "sandbox" / "pkg" / "calc.py"
+
+    killed = run_mutant_in_sandbox(sandbox, _job(ORIGINAL_MODULE.replace("+", "-")))
+    assert killed.killed and not killed.error
+    assert module.read_text() == ORIGINAL_MODULE
+
+    # the next job in the same sandbox sees the pristine project
+    survived = run_mutant_in_sandbox(sandbox, _job(ORIGINAL_MODULE.replace("a + b", "b + a")))
+    assert survived.survived
+    assert module.read_text() == ORIGINAL_MODULE
+
+
+def test_sandbox_restores_module_when_run_fails(tmp_path, monkeypatch):
+    sandbox = prepare_sandbox(_make_project(tmp_path / "project"), str(tmp_path / "sandbox"))
+
+    def broken(*args, **kwargs):
+        raise OSError("pytest not found")
+
+    monkeypatch.setattr(mutator, "run_tests_in_temp_dir", broken)
+    with pytest.raises(OSError):
+        run_mutant_in_sandbox(sandbox, _job("broken = True\n"))
+    assert (tmp_path / "sandbox" / "pkg" / "calc.py").read_text() == ORIGINAL_MODULE
+
+
+def test_mutant_deadline_without_contention():
+    assert mutant_deadline(2.0, workers=1, cpus=4, load=0.0) == (
+        2.0 * TIMEOUT_FACTOR + TIMEOUT_GRACE_SECONDS
+    )
+    assert mutant_deadline(2.0, workers=4, cpus=4, load=0.0) == (
+        2.0 * TIMEOUT_FACTOR + TIMEOUT_GRACE_SECONDS
+    )
+
+
+def test_mutant_deadline_scales_with_workers_and_load():
+    base = mutant_deadline(2.0, workers=1, cpus=2, load=0.0)
+    assert mutant_deadline(2.0, workers=4, cpus=2, load=0.0) == (
+        2.0 * TIMEOUT_FACTOR * 2 + TIMEOUT_GRACE_SECONDS
+    )
+    assert mutant_deadline(2.0, workers=2, cpus=2, load=2.0) > base
+
+
+def test_pool_retries_timeouts_serially():
+    jobs = [_job(ORIGINAL_MODULE, index) for index in range(4)]
+    retried = []
+
+    def retry(timed_out):
+        retried.extend(job.index for job in timed_out)
+        return [
+            MutantResult(job.operator_name, job.file_path, job.index, False, False, "")
+            for job in timed_out
+        ]
+
+    results = _run_jobs_in_pool(iter(jobs), 2, _time_out_odd_jobs, retry=retry)
+
+    assert retried == [1, 3]
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert not any(r.timed_out for r in results)
+    assert not any(r.killed for r in results)
+
+
+def test_pool_keeps_timeouts_confirmed_by_retry():
+    jobs = [_job(ORIGINAL_MODULE, index) for index in range(2)]
+    results = _run_jobs_in_pool(
+        iter(jobs),
+        2,
+        _time_out_odd_jobs,
+        retry=lambda timed_out: [_time_out_odd_jobs(job) for job in timed_out],
+    )
+    assert [r.timed_out for r in results] == [False, True]
+    assert results[1].killed
+
+
+def test_generate_mutants_groups_by_operator_and_numbers_per_operator():
+    mutants = list(
+        generate_mutants(BRANCHY, [ArithmeticOperatorReplacement, RelationalOperatorReplacement])
+    )
+    assert [(m.operator_cls, m.index, m.lines) for m in mutants] == [
+        (ArithmeticOperatorReplacement, 0, (3, 3)),
+        (ArithmeticOperatorReplacement, 1, (4, 4)),
+        (RelationalOperatorReplacement, 0, (2, 2)),
+    ]
+    assert "return a - b\n    return a - b" in mutants[0].source
+    assert "if a >= b" in mutants[2].source
+
+
+def test_generate_mutants_is_lazy_and_restores_the_tree():
+    mutants = generate_mutants(BRANCHY, [ArithmeticOperatorReplacement])
+    assert iter(mutants) is mutants
+    # every mutant carries exactly one change: the previous patch to the
+    # shared tree is undone before the next one is applied
+    assert next(mutants).source == BRANCHY.replace("a + b", "a - b")
+    assert next(mutants).source == BRANCHY.replace("a - b", "a + b")
+    assert next(mutants, None) is None
+
+
+def test_code_fingerprint_ignores_layout_but_not_behaviour():
+    source = "def f(a):\n    return a + 1\n"
+    assert code_fingerprint(source) == code_fingerprint("\n\n" + source.replace("+", " + "))
+    assert code_fingerprint(source) != code_fingerprint(source.replace("+", "-"))
+    # equal but differently typed constants are different code
+    assert code_fingerprint("X = 1\n") != code_fingerprint("X = 1.0\n")
+    assert code_fingerprint("X = 1\n") != code_fingerprint("X = True\n")
+
+
+def test_code_fingerprint_of_invalid_source_is_none():
+    assert code_fingerprint("def broken(:\n") is None
+
+
+def test_generate_mutants_flags_equivalent_mutants():
+    # 2 - 0 folds to the same constant as 2 + 0
+    (mutant,) = generate_mutants("X = 2 + 0\n", [ArithmeticOperatorReplacement])
+    assert mutant.equivalent
+    assert mutant.duplicate_of is None
+
+
+def test_generate_mutants_flags_duplicates_of_earlier_mutants():
+    # (4 + 2) - 2 and (4 - 2) + 2 both fold to 4
+    first, second = generate_mutants("X = 4 - 2 - 2\n", [ArithmeticOperatorReplacement])
+    assert not first.equivalent and first.duplicate_of is None
+    assert second.duplicate_of == (ArithmeticOperatorReplacement, 0)
+
+
+def test_redundant_result_skips_equivalent_and_duplicate_jobs():
+    job = _job(ORIGINAL_MODULE)
+    assert redundant_result(job) is None
+
+    job.duplicate_of = "UNIT:Test #0"
+    result = redundant_result(job)
+    assert result.duplicate and not result.survived
+    assert "UNIT:Test #0" in result.message
+
+    job.equivalent = True
+    assert redundant_result(job).equivalent
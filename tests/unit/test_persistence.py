@@ -0,0 +1,243 @@
+# tests/unit/test_persistence.py
+import json
+import os
+import struct
+import threading
+
+import pytest
+from app.persistence import (
+    FORMAT_VERSION,
+    SEGMENT_MAGIC,
+    SNAPSHOT_MAGIC,
+    DurableRepository,
+    list_segments,
+    read_segment,
+)
+from app.models import Student, Course, Enrollment
+from app.enrollment import (
+    bulk_enroll,
+    enroll_student_in_course,
+    record_score_for_enrollment,
+    record_scores,
+)
+from app.reporting import generate_student_report
+from app.utils import BusinessRuleViolationError, DuplicateEntityError
+
+
+def populate(repo):
+    repo.add_student(Student(student_id="S1", name="Alice", year=3))
+    repo.add_student(Student(student_id="S2", name="Bob", year=2))
+    repo.add_course(Course(course_code="C1", title="ST", credits=3, max_capacity=2))
+    repo.add_course(Course(course_code="C2", title="Algo", credits=4))
+    enroll_student_in_course(repo, "S1", "C1")
+    enroll_student_in_course(repo, "S1", "C2")
+    enroll_student_in_course(repo, "S2", "C1")
+    record_score_for_enrollment(repo, "S1", "C1", 91)
+    record_score_for_enrollment(repo, "S1", "C2", 74)
+
+
+def test_durable_repository_replays_log_on_reopen(tmp_path):
+    repo = DurableRepository(str(tmp_path), snapshot_every=None)
+    populate(repo)
+    report = generate_student_report(repo, "S1")
+    repo.close()
+
+    reopened = DurableRepository(str(tmp_path), snapshot_every=None)
+    assert generate_student_report(reopened, "S1") == report
+    assert reopened.get_gpa("S1") == repo.get_gpa("S1")
+    assert reopened.count_enrollments_for_course("C1") == 2
+    with pytest.raises(BusinessRuleViolationError):
+        enroll_student_in_course(reopened, "S2", "C1")
+    reopened.close()
+
+
+def test_failed_operations_are_not_logged(tmp_path):
+    repo = DurableRepository(str(tmp_path), snapshot_every=None)
+    populate(repo)
+    with pytest.raises(DuplicateEntityError):
+        repo.add_student(Student(student_id="S1", name="Alice", year=3))
+    with pytest.raises(ValueError):
+        record_score_for_enrollment(repo, "S2", "C1", 150)
+    repo.close()
+    records = [op for _, path in list_segments(str(tmp_path)) for _, op in read_segment(path)]
+    assert len(records) == 11
+
+
+def test_snapshot_plus_log_tail(tmp_path):
+    repo = DurableRepository(str(tmp_path), snapshot_every=None)
+    populate(repo)
+    repo.snapshot()
+    assert os.path.exists(tmp_path / "snapshot.bin")
+    assert len(list_segments(str(tmp_path))) == 1
+    record_score_for_enrollment(repo, "S1", "C1", 65)
+    repo.add_enrollment(Enrollment(student_id="S2", course_code="C2"))
+    expected = generate_student_report(repo, "S1")
+    repo.close()
+
+    reopened = DurableRepository(str(tmp_path), snapshot_every=None)
+    assert generate_student_report(reopened, "S1") == expected
+    assert [e.course_code for e in reopened.list_enrollments_for_student("S2")] == ["C1", "C2"]
+    reopened.close()
+
+
+def test_background_snapshots_compact_the_log(tmp_path):
+    repo = DurableRepository(str(tmp_path), snapshot_every=4)
+    populate(repo)
+    repo.close()
+    assert os.path.exists(tmp_path / "snapshot.bin")
+    reopened = DurableRepository(str(tmp_path), snapshot_every=4)
+    assert reopened.get_enrollment("S1", "C2").grade == "C"
+    assert len(reopened.list_students()) == 2
+    reopened.close()
+
+
+def test_torn_log_tail_is_dropped(tmp_path):
+    repo = DurableRepository(str(tmp_path), snapshot_every=None)
+    populate(repo)
+    repo.close()
+    _, last_segment = list_segments(str(tmp_path))[-1]
+    with open(last_segment, "ab") as f:
+        f.write(b"\x20\x00\x00\x00garbage")
+
+    reopened = DurableRepository(str(tmp_path), snapshot_every=None)
+    assert reopened.get_enrollment("S1", "C2").score == 74
+    reopened.add_student(Student(student_id="S3", name="Carol", year=1))
+    reopened.close()
+    again = DurableRepository(str(tmp_path), snapshot_every=None)
+    assert again.get_student("S3").name == "Carol"
+    again.close()
+
+
+def test_concurrent_writers_share_group_commits(tmp_path):
+    repo = DurableRepository(str(tmp_path), snapshot_every=50)
+    repo.add_course(Course(course_code="C1", title="ST", credits=3, max_capacity=1000))
+
+    def writer(worker):
+        for i in range(40):
+            student_id = f"W{worker}-{i}"
+            repo.add_student(Student(student_id=student_id, name=student_id, year=1))
+            enroll_student_in_course(repo, student_id, "C1")
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    repo.close()
+
+    reopened = DurableRepository(str(tmp_path), snapshot_every=None)
+    assert reopened.count_enrollments_for_course("C1") == 160
+    assert len(reopened.list_students()) == 160
+    reopened.close()
+
+
+def test_batch_score_updates_are_logged(tmp_path):
+    repo = DurableRepository(str(tmp_path), snapshot_every=None)
+    populate(repo)
+    errors = record_scores(repo, [("S2", "C1", 88, 0), ("S2", "C2", 70, 0), ("S1", "C2", 95, 0)])
+    assert [e.index for e in errors] == [1]
+    expected = generate_student_report(repo, "S1")
+    repo.close()
+
+    reopened = DurableRepository(str(tmp_path), snapshot_every=None)
+    assert generate_student_report(reopened, "S1") == expected
+    assert reopened.get_enrollment("S2", "C1").grade == "B"
+    reopened.close()
+
+
+def test_files_carry_a_format_version_and_json_payloads(tmp_path):
+    repo = DurableRepository(str(tmp_path), snapshot_every=None)
+    populate(repo)
+    repo.snapshot()
+    repo.add_student(Student(student_id="S3", name="Zoë", year=1))
+    repo.close()
+
+    snapshot = (tmp_path / "snapshot.bin").read_bytes()
+    assert snapshot.startswith(SNAPSHOT_MAGIC + struct.pack("<H", FORMAT_VERSION))
+    students, _, _ = json.loads(snapshot[len(SNAPSHOT_MAGIC) + 2 + 12:])
+    assert students == [["S1", "Alice", 3], ["S2", "Bob", 2]]
+
+    (_, segment), = list_segments(str(tmp_path))
+    with open(segment, "rb") as f:
+        assert f.read(len(SEGMENT_MAGIC) + 2) == SEGMENT_MAGIC + struct.pack("<H", FORMAT_VERSION)
+    assert [op for _, op in read_segment(segment)] == [(1, "S3", "Zoë", 1)]
+
+
+@pytest.mark.parametrize("target", ["snapshot", "segment"])
+def test_unsupported_format_version_is_refused(tmp_path, target):
+    repo = DurableRepository(str(tmp_path), snapshot_every=None)
+    populate(repo)
+    repo.snapshot()
+    repo.add_student(Student(student_id="S3", name="Carol", year=1))
+    repo.close()
+
+    if target == "snapshot":
+        path, magic = str(tmp_path / "snapshot.bin"), SNAPSHOT_MAGIC
+    else:
+        (_, path), = list_segments(str(tmp_path))
+        magic = SEGMENT_MAGIC
+    with open(path, "r+b") as f:
+        f.seek(len(magic))
+        f.write(struct.pack("<H", FORMAT_VERSION + 1))
+    with pytest.raises(ValueError, match="unsupported format version"):
+        DurableRepository(str(tmp_path), snapshot_every=None)
+
+
+def test_torn_segment_header_is_dropped(tmp_path):
+    repo = DurableRepository(str(tmp_path), snapshot_every=None)
+    populate(repo)
+    repo.snapshot()
+    repo.close()
+    # a crash right after a rotation can leave a partial header behind
+    (_, segment), = list_segments(str(tmp_path))
+    with open(segment, "wb") as f:
+        f.write(SEGMENT_MAGIC[:3])
+
+    reopened = DurableRepository(str(tmp_path), snapshot_every=None)
+    assert reopened.get_enrollment("S1", "C2").score == 74
+    reopened.add_student(Student(student_id="S3", name="Carol", year=1))
+    reopened.close()
+    again = DurableRepository(str(tmp_path), snapshot_every=None)
+    assert again.get_student("S3").name == "Carol"
+    again.close()
+
+
+def test_batches_with_bad_rows_are_logged_as_applied(tmp_path):
+    repo = DurableRepository(str(tmp_path), snapshot_every=None)
+    populate(repo)
+    repo.add_student(Student(student_id="S3", name="Carol", year=1))
+    errors = record_scores(repo, [("S2", "C1", 95, 0), ("S1", "C2", None, 0)])
+    assert [(e.index, type(e.error)) for e in errors] == [(1, TypeError)]
+    results = bulk_enroll(repo, [("S3", "C2"), ("S9", "C2"), ("S3", "C1")])
+    assert [r.ok for r in results] == [True, False, False]
+    repo.close()
+
+    reopened = DurableRepository(str(tmp_path), snapshot_every=None)
+    graded = reopened.get_enrollment("S2", "C1")
+    assert (graded.score, graded.grade, graded.passed) == (95, "A", True)
+    assert reopened.get_enrollment("S1", "C2").score == 74
+    assert [e.course_code for e in reopened.list_enrollments_for_student("S3")] == ["C2"]
+    assert reopened.count_enrollments_for_course("C1") == 2
+    reopened.close()
+
+
+def test_batches_are_logged_even_if_a_listener_fails(tmp_path):
+    repo = DurableRepository(str(tmp_path), snapshot_every=None)
+    populate(repo)
+
+    def failing_listener(student_id):
+        raise RuntimeError("listener failed")
+
+    repo.add_change_listener(failing_listener)
+    with pytest.raises(RuntimeError):
+        record_scores(repo, [("S2", "C1", 95, 0)])
+    repo.add_student(Student(student_id="S3", name="Carol", year=1))
+    with pytest.raises(RuntimeError):
+        bulk_enroll(repo, [("S3", "C2")])
+    repo.close()
+
+    # whatever was applied in memory survives a restart
+    reopened = DurableRepository(str(tmp_path), snapshot_every=None)
+    assert reopened.get_enrollment("S2", "C1").grade == "A"
+    assert reopened.count_enrollments_for_course("C2") == 2
+    reopened.close()
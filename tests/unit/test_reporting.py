@@ -1,9 +1,20 @@
 # tests/unit/test_reporting.py
+import csv
+import io
+import json
+
 import pytest
 from app.repository import InMemoryRepository
 from app.models import Student, Course
 from app.enrollment import enroll_student_in_course, record_score_for_enrollment
-from app.reporting import generate_student_report
+from app.reporting import (
+    ReportCache,
+    export_reports_csv,
+    export_reports_jsonl,
+    generate_student_report,
+    iter_student_reports,
+)
+from app.grading import compute_gpa
 from app.utils import EntityNotFoundError
 
 
@@ -34,3 +45,161 @@ def test_generate_student_report_no_enrollments():
     repo.add_student(Student(student_id="S1", name="Alice", year=3))
     with pytest.raises(EntityNotFoundError):
         generate_student_report(repo, "S1")
+
+
+def test_generate_student_report_gpa_matches_compute_gpa():
+    repo = setup_repo_with_data()
+    # re-grading must not double count the course
+    record_score_for_enrollment(repo, "S1", "C2", 65)
+    report = generate_student_report(repo, "S1")
+    assert report["gpa"] == compute_gpa(["A", "D"], [3, 4])
+
+
+def test_generate_student_report_missing_grade():
+    repo = setup_repo_with_data()
+    repo.add_course(Course(course_code="C3", title="DB", credits=2))
+    enroll_student_in_course(repo, "S1", "C3")
+    with pytest.raises(ValueError):
+        generate_student_report(repo, "S1")
+
+
+def test_generate_student_report_unknown_grade_raises():
+    repo = setup_repo_with_data()
+    with pytest.raises(ValueError, match="Unknown grade X"):
+        repo.update_grade("S1", "C2", "X", True)
+    assert generate_student_report(repo, "S1")["gpa"] == compute_gpa(["A", "B"], [3, 4])
+
+
+def test_generate_student_report_ignores_changes_to_returned_enrollments():
+    repo = setup_repo_with_data()
+    # a returned enrollment is a snapshot; only the repository changes grades
+    repo.get_enrollment("S1", "C2").update_grade("F", False)
+    repo.list_enrollments_for_student("S1")[0].update_grade("F", False)
+    report = generate_student_report(repo, "S1")
+    assert [c["grade"] for c in report["courses"]] == ["A", "B"]
+    assert report["gpa"] == repo.get_gpa("S1") == compute_gpa(["A", "B"], [3, 4])
+
+
+# ---- REPORT CACHE TESTS ----
+
+def test_report_cache_hits_until_student_changes():
+    repo = setup_repo_with_data()
+    cache = ReportCache(repo)
+
+    first = cache.get_report("S1")
+    assert cache.get_report("S1") is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    record_score_for_enrollment(repo, "S1", "C1", 50)
+    refreshed = cache.get_report("S1")
+    assert refreshed is not first
+    assert refreshed == generate_student_report(repo, "S1")
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_report_cache_invalidates_only_the_touched_student():
+    repo = setup_repo_with_data()
+    repo.add_student(Student(student_id="S2", name="Bob", year=2))
+    enroll_student_in_course(repo, "S2", "C1")
+    record_score_for_enrollment(repo, "S2", "C1", 75)
+    cache = ReportCache(repo)
+    cache.get_report("S1")
+    cache.get_report("S2")
+
+    repo.update_score("S2", "C1", 80)
+    assert len(cache) == 1
+    cache.get_report("S1")
+    assert cache.hits == 1
+
+
+def test_report_cache_evicts_least_recently_used():
+    repo = setup_repo_with_data()
+    repo.add_student(Student(student_id="S2", name="Bob", year=2))
+    enroll_student_in_course(repo, "S2", "C1")
+    record_score_for_enrollment(repo, "S2", "C1", 75)
+    cache = ReportCache(repo, max_entries=1)
+
+    cache.get_report("S1")
+    cache.get_report("S2")
+    assert len(cache) == 1
+    assert cache.evictions == 1
+    cache.get_report("S1")
+    assert cache.stats()["misses"] == 3
+
+
+def test_report_cache_respects_memory_bound():
+    repo = setup_repo_with_data()
+    cache = ReportCache(repo, max_bytes=1)
+    cache.get_report("S1")
+    assert len(cache) == 0
+    assert cache.stats()["bytes"] == 0
+
+
+def test_report_cache_does_not_cache_errors():
+    repo = InMemoryRepository()
+    repo.add_student(Student(student_id="S1", name="Alice", year=3))
+    cache = ReportCache(repo)
+    with pytest.raises(EntityNotFoundError):
+        cache.get_report("S1")
+    assert len(cache) == 0
+
+
+# ---- EXPORT TESTS ----
+
+def setup_repo_for_export():
+    repo = setup_repo_with_data()
+    repo.add_student(Student(student_id="S2", name="Bob", year=2))  # no enrollments
+    repo.add_student(Student(student_id="S3", name="Carol", year=1))
+    enroll_student_in_course(repo, "S3", "C1")  # never graded
+    repo.add_student(Student(student_id="S4", name="Dan", year=4))
+    enroll_student_in_course(repo, "S4", "C2")
+    record_score_for_enrollment(repo, "S4", "C2", 65)
+    return repo
+
+
+def test_iter_student_reports_skips_incomplete_students():
+    repo = setup_repo_for_export()
+    reports = iter_student_reports(repo)
+    assert next(reports) == generate_student_report(repo, "S1")
+    assert [r["student_id"] for r in reports] == ["S4"]
+
+
+def test_iter_student_reports_annotates_incomplete_students():
+    repo = setup_repo_for_export()
+    reports = {r["student_id"]: r for r in iter_student_reports(repo, on_incomplete="annotate")}
+    assert list(reports) == ["S1", "S2", "S3", "S4"]
+    assert "error" not in reports["S1"]
+    assert reports["S2"]["gpa"] is None and reports["S2"]["courses"] == []
+    assert reports["S3"]["gpa"] is None and reports["S3"]["courses"][0]["grade"] is None
+    assert reports["S3"]["error"]
+
+
+def test_iter_student_reports_resume_after():
+    repo = setup_repo_for_export()
+    assert [r["student_id"] for r in iter_student_reports(repo, resume_after="S1")] == ["S4"]
+    assert list(iter_student_reports(repo, resume_after="S4")) == []
+    with pytest.raises(EntityNotFoundError):
+        list(iter_student_reports(repo, resume_after="S9"))
+
+
+def test_export_reports_jsonl():
+    repo = setup_repo_for_export()
+    out = io.StringIO()
+    assert export_reports_jsonl(repo, out) == 2
+    lines = out.getvalue().splitlines()
+    assert [json.loads(line)["student_id"] for line in lines] == ["S1", "S4"]
+
+
+def test_export_reports_csv_one_row_per_course():
+    repo = setup_repo_for_export()
+    out = io.StringIO()
+    assert export_reports_csv(repo, out, on_incomplete="annotate") == 4
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [(r["student_id"], r["course_code"]) for r in rows] == [
+        ("S1", "C1"),
+        ("S1", "C2"),
+        ("S2", ""),
+        ("S3", "C1"),
+        ("S4", "C2"),
+    ]
+    assert rows[2]["error"] and rows[2]["gpa"] == ""
@@ -2,6 +2,7 @@
 import pytest
 from app.repository import InMemoryRepository
 from app.models import Student, Course, Enrollment
+from app.grading import compute_gpa
 from app.utils import EntityNotFoundError, DuplicateEntityError
 
 
@@ -85,7 +86,11 @@ def test_add_and_get_enrollment():
     enrollment = Enrollment(student_id="S1", course_code="C1")
     repo.add_enrollment(enrollment)
     loaded = repo.get_enrollment("S1", "C1")
-    assert loaded is enrollment
+    assert loaded == enrollment
+    # stored as a copy: changing the caller's object changes nothing
+    enrollment.update_grade("A", True)
+    assert repo.get_enrollment("S1", "C1").grade is None
+    assert repo.get_gpa("S1") == 0.0
 
 
 def test_add_enrollment_unknown_student_raises():
@@ -146,3 +151,109 @@ def test_count_enrollments_for_course():
     repo.add_enrollment(e2)
     count = repo.count_enrollments_for_course("C1")
     assert count == 2
+
+
+def test_enrollment_indexes_preserve_insertion_order():
+    repo = InMemoryRepository()
+    repo.add_student(Student(student_id="S1", name="Alice", year=3))
+    repo.add_student(Student(student_id="S2", name="Bob", year=2))
+    repo.add_course(Course(course_code="C1", title="ST", credits=3))
+    repo.add_course(Course(course_code="C2", title="AI", credits=4))
+
+    repo.add_enrollment(Enrollment(student_id="S1", course_code="C2"))
+    repo.add_enrollment(Enrollment(student_id="S2", course_code="C1"))
+    repo.add_enrollment(Enrollment(student_id="S1", course_code="C1"))
+
+    assert [e.course_code for e in repo.list_enrollments_for_student("S1")] == ["C2", "C1"]
+    assert [e.student_id for e in repo.list_enrollments_for_course("C1")] == ["S2", "S1"]
+    assert repo.list_enrollments_for_student("S3") == []
+    assert repo.count_enrollments_for_course("C2") == 1
+
+
+def test_failed_enrollment_does_not_touch_indexes():
+    repo = create_repo_with_one_student_and_course()
+    repo.add_enrollment(Enrollment(student_id="S1", course_code="C1"))
+    with pytest.raises(DuplicateEntityError):
+        repo.add_enrollment(Enrollment(student_id="S1", course_code="C1"))
+    with pytest.raises(EntityNotFoundError):
+        repo.add_enrollment(Enrollment(student_id="S2", course_code="C1"))
+
+    assert repo.count_enrollments_for_course("C1") == 1
+    assert len(repo.list_enrollments_for_student("S1")) == 1
+
+
+def test_listed_enrollments_are_a_copy_of_the_index():
+    repo = create_repo_with_one_student_and_course()
+    repo.add_enrollment(Enrollment(student_id="S1", course_code="C1"))
+    repo.list_enrollments_for_course("C1").clear()
+    assert repo.count_enrollments_for_course("C1") == 1
+    assert len(repo.list_enrollments_for_course("C1")) == 1
+
+
+# ---- SCORE / GRADE / GPA TESTS ----
+
+def create_repo_with_two_graded_courses():
+    repo = create_repo_with_one_student_and_course()
+    repo.add_course(Course(course_code="C2", title="AI", credits=4))
+    repo.add_enrollment(Enrollment(student_id="S1", course_code="C1"))
+    repo.add_enrollment(Enrollment(student_id="S1", course_code="C2"))
+    return repo
+
+
+def test_update_score_sets_score():
+    repo = create_repo_with_two_graded_courses()
+    enrollment = repo.update_score("S1", "C1", 72.5)
+    assert enrollment == repo.get_enrollment("S1", "C1")
+    assert enrollment.score == 72.5
+
+
+def test_update_score_invalid_raises():
+    repo = create_repo_with_two_graded_courses()
+    with pytest.raises(ValueError):
+        repo.update_score("S1", "C1", 101)
+    with pytest.raises(EntityNotFoundError):
+        repo.update_score("S2", "C1", 50)
+
+
+def test_get_gpa_tracks_grades():
+    repo = create_repo_with_two_graded_courses()
+    assert repo.get_gpa("S1") == 0.0
+
+    repo.update_grade("S1", "C1", "A", True)
+    assert repo.get_gpa("S1") == compute_gpa(["A"], [3])
+
+    repo.update_grade("S1", "C2", "C", True)
+    assert repo.get_gpa("S1") == compute_gpa(["A", "C"], [3, 4])
+
+
+def test_get_gpa_after_regrade():
+    repo = create_repo_with_two_graded_courses()
+    repo.update_grade("S1", "C1", "A", True)
+    repo.update_grade("S1", "C2", "C", True)
+    repo.update_grade("S1", "C1", "F", False)
+    assert repo.get_gpa("S1") == compute_gpa(["F", "C"], [3, 4])
+    assert repo.get_enrollment("S1", "C1").passed is False
+
+
+def test_update_grade_unknown_grade_leaves_state_untouched():
+    repo = create_repo_with_two_graded_courses()
+    repo.update_grade("S1", "C1", "B", True)
+    with pytest.raises(ValueError):
+        repo.update_grade("S1", "C1", "X", True)
+    assert repo.get_enrollment("S1", "C1").grade == "B"
+    assert repo.get_gpa("S1") == 8.0
+
+
+def test_add_enrollment_counts_preset_grade():
+    repo = create_repo_with_one_student_and_course()
+    repo.add_enrollment(Enrollment("S1", "C1", score=85, grade="B", passed=True))
+    assert repo.get_gpa("S1") == 8.0
+
+
+def test_add_enrollment_unknown_grade_raises():
+    repo = create_repo_with_one_student_and_course()
+    with pytest.raises(ValueError, match="Unknown grade X"):
+        repo.add_enrollment(Enrollment("S1", "C1", grade="X"))
+    assert repo.list_enrollments_for_student("S1") == []
+    assert repo.count_enrollments_for_course("C1") == 0
+    assert repo.get_gpa("S1") == 0.0
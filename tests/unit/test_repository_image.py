@@ -0,0 +1,100 @@
+# tests/unit/test_repository_image.py
+import pytest
+from app.compact_repository import CompactRepository
+from app.repository_image import MappedRepository, write_image
+from app.models import Student, Course, Enrollment
+from app.enrollment import enroll_student_in_course, record_score_for_enrollment
+from app.reporting import generate_student_report
+from app.utils import BusinessRuleViolationError, DuplicateEntityError, EntityNotFoundError
+
+
+def create_repo():
+    repo = CompactRepository()
+    repo.add_student(Student(student_id="S1", name="Alice", year=3))
+    repo.add_student(Student(student_id="S2", name="Bob", year=2))
+    repo.add_student(Student(student_id="S3", name="Chloé", year=1))
+    repo.add_course(Course(course_code="C1", title="ST", credits=3, max_capacity=2))
+    repo.add_course(Course(course_code="C2", title="Algo", credits=4))
+    enroll_student_in_course(repo, "S1", "C1")
+    enroll_student_in_course(repo, "S1", "C2")
+    enroll_student_in_course(repo, "S2", "C1")
+    record_score_for_enrollment(repo, "S1", "C1", 91)
+    record_score_for_enrollment(repo, "S1", "C2", 74)
+    return repo
+
+
+def test_mapped_repository_reads_the_image(tmp_path):
+    repo = create_repo()
+    path = str(tmp_path / "repo.img")
+    write_image(repo, path)
+
+    mapped = MappedRepository(path)
+    assert mapped.list_students() == repo.list_students()
+    assert mapped.list_courses() == repo.list_courses()
+    assert mapped.get_student("S3").name == "Chloé"
+    assert generate_student_report(mapped, "S1") == generate_student_report(repo, "S1")
+    assert mapped.get_gpa("S1") == repo.get_gpa("S1")
+    assert [e.student_id for e in mapped.list_enrollments_for_course("C1")] == ["S1", "S2"]
+    assert mapped.list_enrollments_for_student("S3") == []
+    with pytest.raises(EntityNotFoundError):
+        mapped.get_student("S9")
+    with pytest.raises(BusinessRuleViolationError):
+        enroll_student_in_course(mapped, "S3", "C1")
+    mapped.close()
+
+
+def test_writes_go_to_a_private_delta(tmp_path):
+    path = str(tmp_path / "repo.img")
+    write_image(create_repo(), path)
+
+    mapped = MappedRepository(path)
+    record_score_for_enrollment(mapped, "S1", "C1", 55)
+    mapped.add_student(Student(student_id="S4", name="Dan", year=4))
+    mapped.add_course(Course(course_code="C3", title="OS", credits=2))
+    enroll_student_in_course(mapped, "S4", "C2")
+    enroll_student_in_course(mapped, "S1", "C3")
+    with pytest.raises(DuplicateEntityError):
+        mapped.add_student(Student(student_id="S2", name="Bob", year=2))
+    with pytest.raises(DuplicateEntityError):
+        mapped.add_enrollment(Enrollment(student_id="S4", course_code="C2"))
+    assert mapped.get_enrollment("S1", "C1").grade == "F"
+    assert [e.student_id for e in mapped.list_enrollments_for_course("C2")] == ["S1", "S4"]
+    assert [e.course_code for e in mapped.list_enrollments_for_student("S1")] == ["C1", "C2", "C3"]
+
+    # the image itself is untouched, and a new image carries the changes
+    untouched = MappedRepository(path)
+    assert untouched.get_enrollment("S1", "C1").grade == "A"
+    with pytest.raises(EntityNotFoundError):
+        untouched.get_student("S4")
+    untouched.close()
+
+    saved = str(tmp_path / "saved.img")
+    write_image(mapped, saved)
+    reopened = MappedRepository(saved)
+    assert reopened.get_student("S4").name == "Dan"
+    assert reopened.get_gpa("S1") == mapped.get_gpa("S1")
+    assert reopened.count_enrollments_for_course("C2") == 2
+    reopened.close()
+    mapped.close()
+
+
+def test_rejects_files_that_are_not_images(tmp_path):
+    path = tmp_path / "junk.img"
+    path.write_bytes(b"\0" * 512)
+    with pytest.raises(ValueError):
+        MappedRepository(str(path))
+
+
+def test_rejects_empty_files(tmp_path):
+    path = tmp_path / "empty.img"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError, match="not a repository image"):
+        MappedRepository(str(path))
+
+
+def test_rejects_images_cut_short_in_the_header(tmp_path):
+    path = tmp_path / "repo.img"
+    write_image(create_repo(), str(path))
+    path.write_bytes(path.read_bytes()[:20])
+    with pytest.raises(ValueError, match="not a repository image"):
+        MappedRepository(str(path))
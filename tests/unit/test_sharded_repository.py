@@ -0,0 +1,190 @@
+# tests/unit/test_sharded_repository.py
+import threading
+
+import pytest
+from app.sharded_repository import ShardedRepository, shard_of
+from app.models import Student, Course, Enrollment
+from app.enrollment import (
+    bulk_enroll,
+    enroll_student_in_course,
+    record_score_for_enrollment,
+    record_scores,
+)
+from app.reporting import ReportCache, generate_student_report
+from app.repository import InMemoryRepository
+from app.utils import BusinessRuleViolationError, DuplicateEntityError, EntityNotFoundError
+
+STUDENTS = [Student(student_id=f"S{i}", name=f"Student {i}", year=1 + i % 4) for i in range(12)]
+
+
+@pytest.fixture
+def sharded():
+    repo = ShardedRepository(shards=3)
+    yield repo
+    repo.close()
+
+
+def populate(repo):
+    repo.add_students(STUDENTS)
+    repo.add_courses([
+        Course(course_code="C1", title="ST", credits=3, max_capacity=5),
+        Course(course_code="C2", title="Algo", credits=4),
+    ])
+
+
+def test_students_are_spread_over_shards(sharded):
+    populate(sharded)
+    assert len({shard_of(s.student_id, 3) for s in STUDENTS}) == 3
+    assert sharded.get_student("S7").name == "Student 7"
+    assert sorted(s.student_id for s in sharded.list_students()) == \
+        sorted(s.student_id for s in STUDENTS)
+    assert sharded.get_course("C2").credits == 4
+    with pytest.raises(DuplicateEntityError):
+        sharded.add_student(STUDENTS[4])
+    with pytest.raises(DuplicateEntityError):
+        sharded.add_course(Course(course_code="C1", title="ST", credits=3))
+    with pytest.raises(EntityNotFoundError):
+        sharded.get_student("S99")
+
+
+def test_capacity_is_enforced_across_shards(sharded):
+    populate(sharded)
+    results = bulk_enroll(sharded, [(s.student_id, "C1") for s in STUDENTS])
+    assert [r.ok for r in results] == [True] * 5 + [False] * 7
+    assert all(isinstance(r.error, BusinessRuleViolationError) for r in results[5:])
+    assert sharded.count_enrollments_for_course("C1") == 5
+    assert sorted(e.student_id for e in sharded.list_enrollments_for_course("C1")) == \
+        ["S0", "S1", "S2", "S3", "S4"]
+    with pytest.raises(EntityNotFoundError):
+        enroll_student_in_course(sharded, "S99", "C2")
+    enroll_student_in_course(sharded, "S0", "C2")
+    with pytest.raises(DuplicateEntityError):
+        sharded.add_enrollment(Enrollment(student_id="S0", course_code="C2"))
+    assert sharded.count_enrollments_for_course("C2") == 1
+
+
+def test_bulk_enroll_offers_seats_freed_by_shard_rejections(sharded):
+    populate(sharded)
+    # C1 has 5 seats; the unknown student and the duplicate only fail on
+    # their shards, after the facade handed them a seat
+    requests = [("S0", "C1"), ("S99", "C1"), ("S0", "C1"), ("S1", "C1"),
+                ("S2", "C1"), ("S3", "C1"), ("S4", "C1"), ("S5", "C1")]
+    single = InMemoryRepository()
+    populate(single)
+    expected = bulk_enroll(single, requests)
+
+    results = bulk_enroll(sharded, requests)
+    assert [type(r.error) for r in results] == [type(r.error) for r in expected]
+    assert [r.ok for r in results] == [True, False, False, True, True, True, True, False]
+    assert sharded.count_enrollments_for_course("C1") == 5
+
+
+def test_add_enrollments_counts_the_shards_that_succeeded(sharded):
+    populate(sharded)
+    enrollments = [Enrollment(student_id=s.student_id, course_code="C2") for s in STUDENTS]
+    enrollments.append(Enrollment(student_id="S99", course_code="C2"))
+    with pytest.raises(EntityNotFoundError):
+        sharded.add_enrollments(enrollments)
+    # each shard's part is all or nothing; the facade counts what landed
+    failed = shard_of("S99", 3)
+    landed = [s for s in STUDENTS if shard_of(s.student_id, 3) != failed]
+    assert sharded.count_enrollments_for_course("C2") == len(landed)
+    assert len(sharded.list_enrollments_for_course("C2")) == len(landed)
+
+
+def test_unpicklable_requests_release_shard_locks(sharded):
+    populate(sharded)
+    unpicklable = threading.Lock()
+    with pytest.raises(TypeError):
+        sharded.add_student(Student(student_id="N0", name=unpicklable, year=1))
+    with pytest.raises(TypeError):
+        sharded.add_students(
+            [Student(student_id=f"N{i}", name="ok", year=1) for i in range(1, 7)]
+            + [Student(student_id="N0", name=unpicklable, year=1)]
+        )
+    with pytest.raises(TypeError):
+        sharded.add_course(Course(course_code="C9", title=unpicklable, credits=3))
+
+    assert not any(shard._lock.locked() for shard in sharded._shards)
+    assert sharded.get_student("S7").name == "Student 7"
+    sharded.add_student(Student(student_id="N0", name="ok", year=1))
+    with pytest.raises(EntityNotFoundError):
+        sharded.get_course("C9")
+    sharded.add_course(Course(course_code="C9", title="ok", credits=3))
+    assert sharded.get_course("C9").title == "ok"
+
+
+def test_add_courses_is_rolled_back_when_a_shard_refuses(sharded):
+    populate(sharded)
+    # a course only shard 1 knows makes shard 1 refuse the whole batch
+    sharded._shards[1].call("add_course", Course(course_code="C9", title="Stray", credits=1))
+    with pytest.raises(DuplicateEntityError):
+        sharded.add_courses([
+            Course(course_code="C8", title="New", credits=2),
+            Course(course_code="C9", title="New", credits=2),
+        ])
+    with pytest.raises(EntityNotFoundError):
+        sharded.get_course("C8")
+    for index in (0, 2):
+        for course_code in ("C8", "C9"):
+            with pytest.raises(EntityNotFoundError):
+                sharded._shards[index].call("get_course", course_code)
+    assert sharded._shards[1].call("get_course", "C9").title == "Stray"
+
+    sharded.add_course(Course(course_code="C8", title="New", credits=2))
+    assert all(shard.call("get_course", "C8").credits == 2 for shard in sharded._shards)
+
+
+def test_record_scores_reports_malformed_rows(sharded):
+    populate(sharded)
+    bulk_enroll(sharded, [("S1", "C1"), ("S2", "C1")])
+    cache = ReportCache(sharded)
+    errors = record_scores(sharded, [("S1", "C1", 95, 0), ("S2", "C1", None, 0)])
+    assert [(e.index, type(e.error)) for e in errors] == [(1, TypeError)]
+    assert cache.get_report("S1")["gpa"] == 10.0
+    skipped = sharded.update_scores_and_grades(
+        [("S1", "C1", 65, "D", True), ("S2", "C1", "x", "A", True)]
+    )
+    assert [(index, type(error)) for index, error in skipped] == [(1, TypeError)]
+    assert cache.get_report("S1")["gpa"] == 4.0
+    assert sharded.get_enrollment("S2", "C1").score is None
+
+
+def test_reports_match_a_single_repository(sharded):
+    single = InMemoryRepository()
+    for repo in (sharded, single):
+        populate(repo)
+        repo.add_enrollments([Enrollment(student_id=s.student_id, course_code="C2")
+                              for s in STUDENTS])
+        enroll_student_in_course(repo, "S3", "C1")
+        record_score_for_enrollment(repo, "S3", "C1", 91)
+        errors = record_scores(repo, [(s.student_id, "C2", 40 + 5 * i, 0)
+                                      for i, s in enumerate(STUDENTS)] + [("S3", "C9", 50, 0)])
+        assert [e.index for e in errors] == [12]
+
+    ids = [s.student_id for s in STUDENTS]
+    expected = [generate_student_report(single, i) for i in ids]
+    assert sharded.generate_student_reports(ids) == expected
+    assert sharded.generate_student_report("S3") == expected[3]
+    assert generate_student_report(sharded, "S3") == expected[3]
+    assert sharded.get_gpa("S3") == single.get_gpa("S3")
+
+
+def test_report_errors_and_cache_invalidation(sharded):
+    populate(sharded)
+    enroll_student_in_course(sharded, "S1", "C1")
+    with pytest.raises(ValueError):
+        sharded.generate_student_reports(["S1"])
+    with pytest.raises(EntityNotFoundError):
+        sharded.generate_student_report("S2")
+
+    cache = ReportCache(sharded)
+    record_score_for_enrollment(sharded, "S1", "C1", 75)
+    assert cache.get_report("S1")["gpa"] == 6.0
+    record_score_for_enrollment(sharded, "S1", "C1", 95)
+    assert cache.get_report("S1")["gpa"] == 10.0
+
+
+def test_sharded_repository_rejects_non_positive_shards():
+    with pytest.raises(ValueError):
+        ShardedRepository(shards=0)
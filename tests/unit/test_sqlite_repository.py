@@ -0,0 +1,138 @@
+# tests/unit/test_sqlite_repository.py
+import sqlite3
+
+import pytest
+from app.sqlite_repository import SQLiteRepository
+from app.models import Student, Course, Enrollment
+from app.enrollment import bulk_enroll, enroll_student_in_course, record_score_for_enrollment
+from app.reporting import ReportCache, generate_student_report
+from app.grading import compute_gpa
+from app.utils import BusinessRuleViolationError, DuplicateEntityError, EntityNotFoundError
+
+
+def create_repo():
+    repo = SQLiteRepository()
+    repo.add_student(Student(student_id="S1", name="Alice", year=3))
+    repo.add_course(Course(course_code="C1", title="ST", credits=3, max_capacity=2))
+    repo.add_course(Course(course_code="C2", title="Algo", credits=4))
+    return repo
+
+
+def test_sqlite_students_and_courses():
+    repo = create_repo()
+    assert repo.get_student("S1") == Student(student_id="S1", name="Alice", year=3)
+    assert repo.get_course("C1").max_capacity == 2
+    assert [c.course_code for c in repo.list_courses()] == ["C1", "C2"]
+    with pytest.raises(DuplicateEntityError):
+        repo.add_student(Student(student_id="S1", name="Alice", year=3))
+    with pytest.raises(DuplicateEntityError):
+        repo.add_course(Course(course_code="C1", title="ST", credits=3))
+    with pytest.raises(EntityNotFoundError):
+        repo.get_student("S9")
+    with pytest.raises(EntityNotFoundError):
+        repo.get_course("C9")
+
+
+def test_sqlite_enrollments():
+    repo = create_repo()
+    repo.add_enrollment(Enrollment(student_id="S1", course_code="C1"))
+    with pytest.raises(DuplicateEntityError):
+        repo.add_enrollment(Enrollment(student_id="S1", course_code="C1"))
+    with pytest.raises(EntityNotFoundError):
+        repo.add_enrollment(Enrollment(student_id="S9", course_code="C1"))
+    with pytest.raises(EntityNotFoundError):
+        repo.get_enrollment("S1", "C2")
+    assert repo.count_enrollments_for_course("C1") == 1
+    assert repo.list_enrollments_for_student("S1") == [Enrollment("S1", "C1")]
+    assert repo.list_enrollments_for_course("C2") == []
+
+
+def test_sqlite_bulk_inserts_are_all_or_nothing():
+    repo = create_repo()
+    repo.add_students([Student(f"B{i}", f"B{i}", 1) for i in range(100)])
+    assert len(repo.list_students()) == 101
+    with pytest.raises(DuplicateEntityError):
+        repo.add_students([Student("X1", "X", 1), Student("S1", "Alice", 3)])
+    with pytest.raises(EntityNotFoundError):
+        repo.get_student("X1")
+
+    repo.add_enrollments([Enrollment(f"B{i}", "C2") for i in range(100)])
+    assert repo.count_enrollments_for_course("C2") == 100
+    with pytest.raises(EntityNotFoundError):
+        repo.add_enrollments([Enrollment("S1", "C2"), Enrollment("S9", "C2")])
+    with pytest.raises(DuplicateEntityError):
+        repo.add_enrollments([Enrollment("S1", "C2"), Enrollment("B0", "C2")])
+    assert repo.count_enrollments_for_course("C2") == 100
+
+
+def test_sqlite_rejects_unknown_grades_before_writing():
+    repo = create_repo()
+    with pytest.raises(ValueError, match="Unknown grade Z"):
+        repo.add_enrollment(Enrollment("S1", "C1", grade="Z"))
+    with pytest.raises(ValueError, match="Unknown grade Z"):
+        repo.add_enrollments([Enrollment("S1", "C2", grade="A"), Enrollment("S1", "C1", grade="Z")])
+    assert repo.list_enrollments_for_student("S1") == []
+    assert repo.get_gpa("S1") == 0.0
+
+
+def test_sqlite_only_key_conflicts_are_duplicates():
+    repo = create_repo()
+    # a NOT NULL failure is not a duplicate; it surfaces as sqlite3's own error
+    with pytest.raises(sqlite3.IntegrityError, match="NOT NULL"):
+        repo.add_students([Student("S2", None, 1)])
+    with pytest.raises(sqlite3.IntegrityError, match="NOT NULL"):
+        repo.add_courses([Course("C3", None, 3)])
+    with pytest.raises(sqlite3.IntegrityError, match="NOT NULL"):
+        repo.add_enrollments([Enrollment("S1", None)])
+    with pytest.raises(DuplicateEntityError):
+        repo.add_courses([Course("C1", "ST", 3)])
+
+
+def test_sqlite_capacity_score_and_gpa_through_app_functions():
+    repo = create_repo()
+    repo.add_student(Student(student_id="S2", name="Bob", year=2))
+    repo.add_student(Student(student_id="S3", name="Carol", year=1))
+    results = bulk_enroll(repo, [("S1", "C1"), ("S2", "C1"), ("S3", "C1")])
+    assert [r.ok for r in results] == [True, True, False]
+    with pytest.raises(BusinessRuleViolationError):
+        enroll_student_in_course(repo, "S3", "C1")
+
+    enroll_student_in_course(repo, "S1", "C2")
+    record_score_for_enrollment(repo, "S1", "C1", 95)
+    record_score_for_enrollment(repo, "S1", "C2", 72)
+    with pytest.raises(ValueError):
+        record_score_for_enrollment(repo, "S1", "C2", 120)
+    assert repo.get_enrollment("S1", "C2").score == 72
+    assert repo.get_gpa("S1") == compute_gpa(["A", "C"], [3, 4])
+    assert repo.get_gpa("S2") == 0.0
+
+    report = generate_student_report(repo, "S1")
+    assert report["gpa"] == repo.get_gpa("S1")
+    assert [c["grade"] for c in report["courses"]] == ["A", "C"]
+
+
+def test_sqlite_change_listeners_drive_report_cache():
+    repo = create_repo()
+    enroll_student_in_course(repo, "S1", "C1")
+    record_score_for_enrollment(repo, "S1", "C1", 85)
+    cache = ReportCache(repo)
+    assert cache.get_report("S1")["gpa"] == 8.0
+    record_score_for_enrollment(repo, "S1", "C1", 95)
+    assert cache.get_report("S1")["gpa"] == 10.0
+
+
+def test_sqlite_file_database_persists_and_uses_wal(tmp_path):
+    path = str(tmp_path / "school.db")
+    repo = SQLiteRepository(path)
+    repo.add_student(Student(student_id="S1", name="Alice", year=3))
+    repo.add_course(Course(course_code="C1", title="ST", credits=3))
+    enroll_student_in_course(repo, "S1", "C1")
+    record_score_for_enrollment(repo, "S1", "C1", 81)
+    repo.close()
+
+    reopened = SQLiteRepository(path)
+    assert reopened.get_enrollment("S1", "C1").grade == "B"
+    assert reopened.get_gpa("S1") == 8.0
+    reopened.close()
+    mode = sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
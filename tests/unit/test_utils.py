@@ -0,0 +1,24 @@
+# tests/unit/test_utils.py
+import gc
+
+import pytest
+from app.utils import gc_paused
+
+
+def test_gc_paused_disables_collector_and_restores_it():
+    assert gc.isenabled()
+    with pytest.raises(RuntimeError):
+        with gc_paused():
+            assert not gc.isenabled()
+            raise RuntimeError("boom")
+    assert gc.isenabled()
+
+
+def test_gc_paused_leaves_a_disabled_collector_disabled():
+    gc.disable()
+    try:
+        with gc_paused():
+            assert not gc.isenabled()
+        assert not gc.isenabled()
+    finally:
+        gc.enable()